@@ -0,0 +1,341 @@
+"""
+Offline benchmark for the registered scrapers.
+
+``record`` saves a snapshot of every target page into ``fixtures/`` (scripts
+are stripped so replaying them needs no network). ``run`` serves those
+fixtures from a local HTTP server and times each scraper function against
+them, every scraper in a fresh process so its peak memory is its own:
+
+- wall time per run (min and median over ``--repeat`` runs),
+- time per stage, as reported through :mod:`metrics` (fetch, parse, driver
+  install and start, navigate, wait, extract, write), and the run's counters,
+- WebDriver calls by command,
+- peak RSS of the scraper process and rows written per second.
+
+Each run gets its own temporary HTTP cache and snapshot archive, so nothing is
+skipped as unchanged and the shared ``.cache`` and ``archive`` folders are
+left alone, and the local fixture host is not rate limited, so throttle waits
+are not timed. Results are written as JSON; pass an earlier result file as
+``--baseline`` to see how the wall times moved.
+
+The fixtures are snapshots of third-party pages and are not committed: the
+first ``record`` needs network access (and Chrome, unless ``--static``);
+after that ``run`` works offline.
+
+Example Usage:
+    python benchmark.py record
+    python benchmark.py run --repeat 5 --output bench.json
+    python benchmark.py run java windows11 --backend browser --baseline bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import lxml.html
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(HERE, "fixtures")
+STAGES = ("fetch", "parse", "driver_install", "driver_start", "navigate", "wait", "extract", "write")
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class CountingDriver:
+    """
+    WebDriver wrapper that counts the commands sent to the browser.
+
+    The browser is only started on first use, so static runs that never fall
+    back to Chrome do not pay for it.
+
+    Parameters
+    ----------
+    factory : callable
+        Function returning a new WebDriver session.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._driver = None
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            self._driver = self._factory()
+        self.calls[name] += 1
+        return getattr(self._driver, name)
+
+    def quit(self):
+        """Quits the browser if one was started."""
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+
+class RunTotals:
+    """:mod:`metrics` sink adding up the stage times and counters of one run."""
+
+    def __init__(self):
+        self.stages = defaultdict(float)
+        self.counters = Counter()
+
+    def emit(self, event: dict):
+        if event["kind"] == "stage":
+            self.stages[event["name"]] += event["value"]
+        else:
+            self.counters[event["name"]] += event["value"]
+
+    def close(self):
+        pass
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _bench_one(name: str, url: str, backend: str, repeat: int) -> dict:
+    """Runs one scraper ``repeat`` times against its fixture (in a worker process)."""
+    import http_cache
+    import metrics
+    import snapshots
+    import throttle
+    from driver_pool import new_driver
+    from registry import SCRAPERS
+
+    scraper = SCRAPERS[name]
+    kwargs = {"backend": backend} if backend != "default" else {}
+    runs = []
+    driver = CountingDriver(new_driver)
+    with tempfile.TemporaryDirectory() as work_dir:
+        snapshots.configure(os.path.join(work_dir, "archive"))
+        throttle.configure(host_rates={throttle.host_of(url): math.inf})
+        try:
+            for i in range(repeat):
+                totals = RunTotals()
+                metrics.set_sink(totals)
+                # A fresh cache and output every run, so nothing is skipped as unchanged
+                http_cache.configure(os.path.join(work_dir, f"cache_{i}"))
+                output_csv = os.path.join(work_dir, f"run_{i}_{scraper.output_csv}")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    rows = scraper.func(url, output_csv, driver=driver, **kwargs)
+                    wall = time.perf_counter() - start
+                runs.append({"wall": wall, "rows": rows or 0, "stages": totals.stages,
+                             "counters": totals.counters})
+        finally:
+            metrics.set_sink(None)
+            driver.quit()
+            http_cache.get_cache().close()
+            snapshots.get_archive().close()
+
+    walls = [r["wall"] for r in runs]
+    median = statistics.median(walls)
+    stage_medians = {s: round(statistics.median(r["stages"].get(s, 0.0) for r in runs), 4) for s in STAGES}
+    stage_medians["other"] = round(max(median - sum(stage_medians.values()), 0.0), 4)
+    rows = runs[-1]["rows"]
+    return {
+        "url": url,
+        "runs": repeat,
+        "wall_seconds": {"min": round(min(walls), 4), "median": round(median, 4)},
+        "stages_seconds": stage_medians,
+        "counters": dict(runs[-1]["counters"]),
+        "webdriver_calls": {k: v // repeat for k, v in sorted(driver.calls.items())},
+        "webdriver_calls_total": sum(driver.calls.values()) // repeat,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rows": rows,
+        "rows_per_second": round(rows / median, 1) if median else None,
+    }
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_fixtures(directory: str = FIXTURES_DIR):
+    """
+    Serves the fixture folder on a free local port for the duration of the block.
+
+    Yields
+    ------
+    str
+        Base URL of the server, e.g. ``http://127.0.0.1:53211/``.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def fixture_path(name: str, directory: str = FIXTURES_DIR) -> str:
+    """Returns the fixture file of a registered scraper."""
+    return os.path.join(directory, f"{name}.html")
+
+
+def _strip_scripts(html: str) -> str:
+    tree = lxml.html.fromstring(html)
+    for element in tree.xpath("//script | //noscript | //iframe"):
+        element.drop_tree()
+    return lxml.html.tostring(tree, encoding="unicode", doctype="<!DOCTYPE html>")
+
+
+def record_fixtures(names, directory: str = FIXTURES_DIR, static: bool = False):
+    """
+    Saves a snapshot of each scraper's page as a local fixture.
+
+    Parameters
+    ----------
+    names : list of str
+        Keys of :data:`registry.SCRAPERS` to record.
+    directory : str
+        Folder the ``<name>.html`` fixtures are written to.
+    static : bool
+        Save the raw HTTP response instead of the DOM rendered by Chrome.
+        Only suitable for pages that do not build their content with JavaScript.
+    """
+    from driver_pool import borrowed_driver
+    from registry import SCRAPERS
+    from static_html import fetch_html
+    from waits import wait_until_ready
+
+    os.makedirs(directory, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        driver = None if static else stack.enter_context(borrowed_driver())
+        for name in names:
+            url = SCRAPERS[name].url
+            if static:
+                html = fetch_html(url)
+            else:
+                driver.get(url)
+                wait_until_ready(driver, "table, ul li", timeout=15)
+                html = driver.page_source
+            with open(fixture_path(name, directory), "w", encoding="utf-8") as f:
+                f.write(_strip_scripts(html))
+            print(f"✅ Recorded '{url}' as {fixture_path(name, directory)}")
+
+
+def run_benchmarks(names, directory: str = FIXTURES_DIR, backend: str = "default",
+                   repeat: int = 3) -> dict:
+    """
+    Times each scraper against its recorded fixture.
+
+    Parameters
+    ----------
+    names : list of str
+        Keys of :data:`registry.SCRAPERS` to benchmark.
+    directory : str
+        Folder holding the fixtures written by :func:`record_fixtures`.
+    backend : str
+        ``"static"``, ``"browser"``, or ``"default"`` to use each scraper's own default.
+    repeat : int
+        Runs per scraper; wall and stage times are medians over them.
+
+    Returns
+    -------
+    dict
+        Run metadata and one result per scraper under ``"results"``.
+    """
+    report = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": backend,
+        "repeat": repeat,
+        "results": {},
+    }
+    ctx = multiprocessing.get_context("spawn")
+    with serve_fixtures(directory) as base_url:
+        for name in names:
+            if not os.path.exists(fixture_path(name, directory)):
+                print(f"⚠️ No fixture for '{name}', run 'python benchmark.py record {name}' first.")
+                continue
+            # One process per scraper so peak RSS is not inherited from earlier ones
+            with ctx.Pool(processes=1) as pool:
+                try:
+                    result = pool.apply(_bench_one, (name, f"{base_url}{name}.html", backend, repeat))
+                except Exception as exc:
+                    print(f"❌ {name} failed: {type(exc).__name__}: {exc}")
+                    report["results"][name] = {"error": f"{type(exc).__name__}: {exc}"}
+                    continue
+            report["results"][name] = result
+            print(f"✅ {name}: {result['wall_seconds']['median']:.3f}s median, "
+                  f"{result['rows']} rows, {result['webdriver_calls_total']} WebDriver calls")
+    return report
+
+
+def print_comparison(report: dict, baseline: dict):
+    """Prints the median wall time of each scraper next to the baseline's."""
+    print(f"\n{'Scraper':<24}{'Baseline':>10}{'Now':>10}{'Change':>9}")
+    for name, result in sorted(report["results"].items()):
+        old = baseline.get("results", {}).get(name, {}).get("wall_seconds")
+        if "wall_seconds" not in result or not old:
+            continue
+        before, now = old["median"], result["wall_seconds"]["median"]
+        change = (now - before) / before * 100 if before else 0.0
+        print(f"{name:<24}{before:>10.3f}{now:>10.3f}{change:>+8.1f}%")
+
+
+def main(argv=None) -> int:
+    from registry import SCRAPERS
+
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against recorded fixtures.")
+    parser.add_argument("command", choices=["record", "run"])
+    parser.add_argument("names", nargs="*",
+                        help=f"scrapers to use (default: all of {', '.join(sorted(SCRAPERS))})")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="fixture folder")
+    parser.add_argument("--static", action="store_true", help="record: save raw HTTP responses")
+    parser.add_argument("--backend", choices=["default", "static", "browser"], default="default",
+                        help="run: page loading backend")
+    parser.add_argument("--repeat", type=int, default=3, help="run: runs per scraper")
+    parser.add_argument("--output", help="run: JSON file for the results (default: stdout)")
+    parser.add_argument("--baseline", help="run: earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.names) - set(SCRAPERS))
+    if unknown:
+        parser.error(f"unknown scrapers: {', '.join(unknown)}")
+    names = args.names or list(SCRAPERS)
+
+    if args.command == "record":
+        record_fixtures(names, args.fixtures, args.static)
+        return 0
+
+    report = run_benchmarks(names, args.fixtures, args.backend, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved as '{args.output}'.")
+    else:
+        print(json.dumps(report, indent=2))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+    return 1 if any("error" in r for r in report["results"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
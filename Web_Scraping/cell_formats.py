@@ -0,0 +1,102 @@
+"""
+Shared rules for reading dates, versions, builds and KB numbers in scraped cells.
+
+:mod:`lifecycle_index`, :mod:`parquet_output` and :mod:`normalize` all decide
+what counts as a date or a version through this module, so a cell reads the
+same way in the lifecycle index, in typed Parquet output and in normalized
+tables.
+
+Dates are read by :func:`parse_date`: ``2024-10-01``, ``01.10.2024``,
+``1 October 2024``, ``October 1, 2024`` and ``October 2024`` (the last day of
+the month). A cell *is* a date (:data:`DATE`) when it holds one of those and
+nothing else besides footnote markers such as ``[12]``.
+
+Versions are dotted numbers (``8.10``, ``1.2.0``), optionally after a product
+prefix (``v2.1``, ``JDK 1.1``, ``Java SE 17``, ``.NET 8.0``) and before a
+pre-release label (``8.0.100-preview.1``). Windows builds (``26100.6725``)
+and KB numbers (``KB5065426``) have their own patterns.
+"""
+
+import calendar
+import re
+from datetime import date
+
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+
+FOOTNOTE = re.compile(r"\[[^\]]*\]")
+
+# Date layouts, searched for in this order by parse_date
+ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+DOTTED_DATE = re.compile(r"(\d{2})\.(\d{2})\.(\d{4})")
+DAY_MONTH_YEAR = re.compile(r"(\d{1,2}) ([A-Za-z]+),? (\d{4})")
+MONTH_DAY_YEAR = re.compile(r"([A-Za-z]+) (\d{1,2}), (\d{4})")
+MONTH_YEAR = re.compile(r"([A-Za-z]+),? (\d{4})")
+
+_MONTH = "(?:" + "|".join(sorted(MONTHS, key=len, reverse=True)) + ")"
+# A whole cell holding one date in any of the layouts above
+DATE = re.compile(rf"^(?:\d{{4}}-\d{{2}}-\d{{2}}|\d{{2}}\.\d{{2}}\.\d{{4}}|\d{{1,2}} {_MONTH},? \d{{4}}"
+                  rf"|{_MONTH} \d{{1,2}}, \d{{4}}|{_MONTH},? \d{{4}})$", re.IGNORECASE)
+
+INTEGER = re.compile(r"^\d+$")
+NUMERIC_VERSION = re.compile(r"^\d+(?:\.\d+)*$")
+VERSION_PREFIX = r"(?:v|JDK\s*|J2SE\s*|Java SE\s*|Java\s+|\.NET(?: Core)?\s*)"
+# Optional product prefix, then up to three numbers and a pre-release label
+VERSION = re.compile(rf"^{VERSION_PREFIX}?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?")
+# A whole cell that is a version: a prefixed number, or a dotted one, then optional remarks
+VERSION_CELL = re.compile(rf"^(?:{VERSION_PREFIX}\d+(?:\.\d+)*|\d+(?:\.\d+)+)(?:-[0-9A-Za-z.-]+)?(?:\s.*)?$")
+BUILD = re.compile(r"^(\d{5})\.(\d+)$")
+KB = re.compile(r"^KB(\d+)$")
+
+
+def clean(text: str) -> str:
+    """Returns a cell without footnote markers and surrounding whitespace."""
+    return FOOTNOTE.sub("", text or "").strip()
+
+
+def parse_date(text: str):
+    """
+    Reads the first date in a cell as ISO ``YYYY-MM-DD``.
+
+    Layouts are tried in the order listed in the module docstring, footnote
+    markers are ignored, and impossible dates (31 February) give None.
+
+    Returns
+    -------
+    str or None
+        The ISO date, or None if the cell holds no recognisable date.
+    """
+    text = FOOTNOTE.sub(" ", text or "")
+    try:
+        m = ISO_DATE.search(text)
+        if m:
+            return date(int(m[1]), int(m[2]), int(m[3])).isoformat()
+        m = DOTTED_DATE.search(text)
+        if m:
+            return date(int(m[3]), int(m[2]), int(m[1])).isoformat()
+        m = DAY_MONTH_YEAR.search(text)
+        if m and m[2].lower() in MONTHS:
+            return date(int(m[3]), MONTHS[m[2].lower()], int(m[1])).isoformat()
+        m = MONTH_DAY_YEAR.search(text)
+        if m and m[1].lower() in MONTHS:
+            return date(int(m[3]), MONTHS[m[1].lower()], int(m[2])).isoformat()
+        for m in MONTH_YEAR.finditer(text):
+            if m[1].lower() in MONTHS:
+                year, month = int(m[2]), MONTHS[m[1].lower()]
+                return date(year, month, calendar.monthrange(year, month)[1]).isoformat()
+    except ValueError:  # e.g. 31 February
+        return None
+    return None
+
+
+def version_number(text: str):
+    """
+    Returns the dotted number of a version cell (``"Java SE 17"`` -> ``"17"``).
+
+    Returns
+    -------
+    str or None
+        Up to three dotted parts, or None if the cell does not start with a version.
+    """
+    m = VERSION.match(clean(text))
+    return ".".join(part for part in m.groups()[:3] if part is not None) if m else None
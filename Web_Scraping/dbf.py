@@ -1,58 +1,23 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-from datetime import datetime
-import re
-import time
+from engine import run_site
 
-def scrape_dbf_news(url: str, output_csv: str):
+def scrape_dbf_news(url: str, output_csv: str, driver=None, backend: str = None,
+                    incremental: bool = False, follow_links: bool = False, link_workers: int = 8):
     """
     Scrapes news from dbf2002.com/news.html and extracts Version, Date, and URL
-    for each news entry in the list.
+    for each news entry in the list. An optional pooled ``driver`` is reused
+    instead of starting a new browser. ``backend`` defaults to the one of the
+    ``[dbf_news]`` entry in sites.toml; ``"static"`` tries a plain HTTP fetch
+    before falling back to Chrome, ``"browser"`` always uses Chrome and
+    ``"archive"`` re-parses the last archived snapshot. With ``incremental=True`` only
+    new, changed or removed entries are written (see :mod:`incremental`); an
+    ``output_csv`` ending in ``.parquet`` writes typed Parquet instead.
+    With ``follow_links=True`` each distinct linked page is fetched over
+    plain HTTP, up to ``link_workers`` at a time (see :mod:`link_crawler`),
+    and its text and size in bytes are added as ``Body`` and ``Size`` columns.
+    Returns the number of rows written, or None if the page is unchanged since
+    the CSV was last written.
     """
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.get(url)
-    time.sleep(3)
-
-    all_rows = []
-
-    # News items are <ul> > <li>
-    news_list = driver.find_element(By.TAG_NAME, "ul")
-    news_items = news_list.find_elements(By.TAG_NAME, "li")
-
-    for item in news_items:
-        try:
-            # Extract link
-            a_tag = item.find_element(By.TAG_NAME, "a")
-            news_url = a_tag.get_attribute("href")
-            version_text = a_tag.text.strip()
-            version_match = re.search(r'v\d+\.\d+(\.\d+)?', version_text)
-            version = version_match.group(0) if version_match else version_text
-
-            # Extract date from text (date is before the link in the li text)
-            full_text = item.text.strip()
-            date_match = re.match(r'(\d{2}\.\d{2}\.\d{4})', full_text)
-            if date_match:
-                date_str = date_match.group(1)
-                formatted_date = datetime.strptime(date_str, "%d.%m.%Y").strftime("%Y-%m-%d")
-            else:
-                formatted_date = ""
-
-            all_rows.append([version, formatted_date, news_url])
-        except Exception:
-            continue
-
-    driver.quit()
-
-    if not all_rows:
-        print("No news data found.")
-        return
-
-    df = pd.DataFrame(all_rows, columns=["Version", "Date", "URL"])
-    df.to_csv(output_csv, index=False, encoding="utf-8")
-    print(f"Scraping complete. Data saved as '{output_csv}'.")
+    return run_site("dbf_news", url, output_csv, driver, backend, incremental, follow_links, link_workers)
 
 if __name__ == "__main__":
     scrape_dbf_news(
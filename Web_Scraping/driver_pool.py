@@ -0,0 +1,385 @@
+from contextlib import contextmanager
+import os
+import queue
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+import metrics
+
+# chromedriver location remembered across runs; delete it to force a fresh lookup
+DRIVER_PATH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "chromedriver_path")
+
+# Resources the scrapers never read. Stylesheets are deliberately not blocked:
+# they decide which elements are hidden, and with them what innerText returns.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav", "*.m3u8",
+]
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def driver_path(refresh: bool = False) -> str:
+    """
+    Returns the chromedriver binary, resolving it over the network only once.
+
+    The path is looked up in this order: the ``CHROMEDRIVER`` environment
+    variable, the path cached in memory, the path saved in
+    :data:`DRIVER_PATH_FILE` by an earlier run, and finally
+    ``ChromeDriverManager().install()``, whose result is saved for next time.
+
+    Parameters
+    ----------
+    refresh : bool
+        Ignore the cached path and ask ChromeDriverManager again, e.g. after a
+        Chrome update made the cached driver incompatible.
+
+    Returns
+    -------
+    str
+        Path to the chromedriver executable.
+    """
+    global _driver_path
+    env_path = os.environ.get("CHROMEDRIVER")
+    if env_path and not refresh:
+        return env_path
+    with _driver_path_lock:
+        if not refresh:
+            if _driver_path and os.path.exists(_driver_path):
+                return _driver_path
+            try:
+                with open(DRIVER_PATH_FILE, encoding="utf-8") as f:
+                    cached = f.read().strip()
+            except OSError:
+                cached = ""
+            if cached and os.path.exists(cached):
+                _driver_path = cached
+                return cached
+        _driver_path = ChromeDriverManager().install()
+        os.makedirs(os.path.dirname(DRIVER_PATH_FILE), exist_ok=True)
+        with open(DRIVER_PATH_FILE, "w", encoding="utf-8") as f:
+            f.write(_driver_path)
+        return _driver_path
+
+
+def lean_options(headless: bool = True) -> webdriver.ChromeOptions:
+    """
+    Builds Chrome options for fast, quiet scraping sessions.
+
+    The browser runs headless with a fixed desktop window size (so responsive
+    pages lay out as they do on screen), images disabled, background services,
+    extensions and first-run screens turned off, and ``eager`` page loading so
+    ``get`` returns once the DOM is parsed; :func:`waits.wait_until_ready`
+    takes it from there.
+
+    Parameters
+    ----------
+    headless : bool
+        Run without a visible window. Turn off to watch a scraper work.
+
+    Returns
+    -------
+    selenium.webdriver.ChromeOptions
+        The options to launch Chrome with.
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    for argument in (
+        "--window-size=1920,1080",
+        "--disable-gpu",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--disable-notifications",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--mute-audio",
+        "--blink-settings=imagesEnabled=false",
+        "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    ):
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    options.page_load_strategy = "eager"
+    return options
+
+
+def new_driver(headless: bool = True):
+    """
+    Starts a fresh Chrome WebDriver session with the lean profile.
+
+    Images, fonts and media are blocked at the network level as well, so they
+    are never downloaded. If Chrome refuses the cached driver (typically after
+    a browser update), the driver is resolved again and the launch retried once.
+
+    Parameters
+    ----------
+    headless : bool
+        Run without a visible window.
+
+    Returns
+    -------
+    selenium.webdriver.Chrome
+        A newly launched browser session.
+    """
+    with metrics.stage("driver_install"):
+        path = driver_path()
+    with metrics.stage("driver_start"):
+        try:
+            driver = webdriver.Chrome(service=Service(path), options=lean_options(headless))
+        except SessionNotCreatedException:
+            driver = webdriver.Chrome(service=Service(driver_path(refresh=True)),
+                                      options=lean_options(headless))
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    except BaseException:
+        # Chrome is already running: do not leave the process behind
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        raise
+    return driver
+
+
+def is_healthy(driver) -> bool:
+    """
+    Checks that a WebDriver session is still alive and responding.
+
+    Parameters
+    ----------
+    driver : selenium.webdriver.Chrome
+        The browser session to check.
+
+    Returns
+    -------
+    bool
+        True if the browser answered a trivial script call, False otherwise.
+    """
+    try:
+        return driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """
+    A thread-safe pool of warm, reusable Chrome WebDriver sessions.
+
+    Sessions are started lazily up to ``size`` and handed out with
+    :meth:`driver`. When a session is returned it is health-checked and
+    reset to ``about:blank``; sessions that fail the check or have served
+    ``max_uses`` pages are quit and replaced on the next request.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of browser sessions alive at the same time.
+    max_uses : int
+        Number of times a session is handed out before it is recycled.
+    factory : callable, optional
+        Function returning a new WebDriver session. Defaults to :func:`new_driver`.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 25, factory=new_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory
+        self._idle = []  # most recently released last, so warm sessions are reused first
+        self._uses = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)  # an idle session or a free slot
+        self._closed = False
+
+    def acquire(self, timeout: float = None):
+        """
+        Takes a healthy session from the pool, starting one if there is room.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait for a session when the pool is exhausted.
+
+        Returns
+        -------
+        selenium.webdriver.Chrome
+            A browser session reserved for the caller until :meth:`release`.
+
+        Raises
+        ------
+        queue.Empty
+            If no session became available within ``timeout``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._available:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is closed")
+                    if self._idle:
+                        driver = self._idle.pop()
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        driver = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Empty
+                    self._available.wait(remaining)
+            if driver is None:
+                try:
+                    driver = self.factory()
+                except Exception:
+                    with self._available:
+                        self._created -= 1
+                        self._available.notify()
+                    raise
+                with self._lock:
+                    self._uses[id(driver)] = 0
+            if is_healthy(driver):
+                with self._lock:
+                    self._uses[id(driver)] += 1
+                return driver
+            self._discard(driver)
+
+    def release(self, driver):
+        """
+        Returns a session to the pool, recycling it if it is worn out or broken.
+
+        Parameters
+        ----------
+        driver : selenium.webdriver.Chrome
+            A session previously obtained from :meth:`acquire`.
+        """
+        with self._lock:
+            worn_out = self._closed or self._uses.get(id(driver), 0) >= self.max_uses
+        if worn_out:
+            self._discard(driver)
+            return
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver)
+            return
+        with self._available:
+            if not self._closed:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+        self._discard(driver)
+
+    @contextmanager
+    def driver(self, timeout: float = None):
+        """Context manager that acquires a session and always releases it."""
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    @contextmanager
+    def lazy_driver(self):
+        """
+        Context manager yielding a :class:`LazyDriver` bound to this pool.
+
+        Jobs that may never need a browser (static pages) can hold one of these
+        without tying up a pooled session; the session taken on first use is
+        released when the block exits.
+        """
+        proxy = LazyDriver(self)
+        try:
+            yield proxy
+        finally:
+            proxy.release()
+
+    def _discard(self, driver):
+        with self._available:
+            self._uses.pop(id(driver), None)
+            self._created -= 1
+            # The slot is free again: wake a caller waiting to start a replacement
+            self._available.notify()
+        try:
+            driver.quit()
+        except (WebDriverException, OSError) as exc:
+            # The browser is being thrown away anyway; note it and move on
+            print(f"⚠️ Could not quit a browser session cleanly: {type(exc).__name__}: {exc}")
+
+    def close(self):
+        """Quits every idle session and refuses further acquisitions."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LazyDriver:
+    """
+    Stand-in for a WebDriver that acquires a pooled session on first use.
+
+    Parameters
+    ----------
+    pool : DriverPool
+        The pool to take the session from.
+    """
+
+    def __init__(self, pool: DriverPool):
+        self._pool = pool
+        self._driver = None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            self._driver = self._pool.acquire()
+        return getattr(self._driver, name)
+
+    def release(self):
+        """Returns the underlying session to the pool if one was taken."""
+        if self._driver is not None:
+            self._pool.release(self._driver)
+            self._driver = None
+
+
+@contextmanager
+def borrowed_driver(driver=None):
+    """
+    Yields the given driver, or a one-off session that is quit afterwards.
+
+    Scrapers use this so they can run either with a pooled driver supplied by
+    the caller or standalone, without owning the pooled session's lifetime.
+
+    Parameters
+    ----------
+    driver : selenium.webdriver.Chrome, optional
+        A session owned by the caller (for example from a :class:`DriverPool`).
+    """
+    if driver is not None:
+        yield driver
+        return
+    driver = new_driver()
+    try:
+        yield driver
+    finally:
+        driver.quit()
@@ -0,0 +1,341 @@
+"""
+Config-driven extraction engine behind every scraper.
+
+Each page is described by a table in ``sites.toml``. The engine compiles a
+spec once into an extraction plan (regular expressions compiled, class sets
+and defaults resolved) and caches it until the file changes, then runs every
+site through the same path: :func:`page_loader.load_page` (static fetch with
+browser fallback, HTTP cache, snapshot archive, rate limits), one of the
+extraction modes below and a :class:`row_writer.StreamingCsvWriter`.
+
+Spec keys:
+
+- ``url``, ``output``: the page and its default output file (required).
+- ``ttl_hours``: how long the output stays fresh for :mod:`refresh_daemon` (24).
+- ``backend``: ``"static"`` or ``"browser"`` (``"browser"``).
+- ``timeout``, ``ready_selector``: browser wait settings (15, ``"table"``).
+- ``mode``: one of :data:`MODES` (``"tables"``).
+- ``key_columns``: row identity columns for incremental mode (none, which
+  compares whole rows).
+
+``tables`` writes every table's data rows behind a source column:
+
+- ``infobox``: write the infobox pairs first as ``infobox, key, value`` (false).
+- ``require_headers``: skip tables without ``th`` cells (false).
+- ``skip_classes``: skip tables with any of these classes (none).
+- ``source``: source column value, ``{index}`` is the table number (``"table_{index}"``).
+- ``leading``, ``prefix``: column naming, see :class:`row_writer.StreamingCsvWriter`
+  (``["Source"]``, ``"Col_"``).
+
+``version_table`` writes the first table with ``table_class`` under its own
+headers. ``news_list`` writes ``Version, Date, URL`` for each linked item of
+the page's first list, taking the version from ``version_pattern`` (or the
+whole link text) and the date from ``date_pattern`` parsed with
+``date_format``; its ``follow_links`` option adds the linked pages' text.
+
+Example Usage:
+    python engine.py java
+    python engine.py windows11 --backend static --output w11.csv
+    python engine.py --check
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urldefrag
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+from page_loader import load_page
+from row_writer import StreamingCsvWriter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SPEC_PATH = os.path.join(HERE, "sites.toml")
+
+MODES = ("tables", "version_table", "news_list")
+DEFAULTS = {
+    "ttl_hours": 24,
+    "backend": "browser",
+    "timeout": 15,
+    "ready_selector": "table",
+    "mode": "tables",
+    "key_columns": [],
+    "infobox": False,
+    "require_headers": False,
+    "skip_classes": [],
+    "source": "table_{index}",
+    "leading": ["Source"],
+    "prefix": "Col_",
+    "table_class": "",
+    "version_pattern": "",
+    "date_pattern": "",
+    "date_format": "%Y-%m-%d",
+}
+REQUIRED = ("url", "output")
+
+Plan = namedtuple("Plan", [
+    "name", "url", "output", "ttl_hours", "backend", "timeout", "ready_selector", "mode", "content",
+    "key_columns", "infobox", "require_headers", "skip_classes", "source", "leading", "prefix",
+    "table_class", "version_pattern", "date_pattern", "date_format",
+])
+
+
+def compile_plan(name: str, spec: dict) -> Plan:
+    """
+    Validates a site spec and resolves it into an extraction plan.
+
+    Raises
+    ------
+    ValueError
+        If a key is unknown or missing, or a value is invalid.
+    """
+    unknown = sorted(set(spec) - set(DEFAULTS) - set(REQUIRED))
+    if unknown:
+        raise ValueError(f"Site '{name}': unknown keys {', '.join(unknown)}")
+    missing = [key for key in REQUIRED if key not in spec]
+    if missing:
+        raise ValueError(f"Site '{name}': missing {', '.join(missing)}")
+    settings = {**DEFAULTS, **spec}
+    if settings["mode"] not in MODES:
+        raise ValueError(f"Site '{name}': unknown mode '{settings['mode']}', expected one of {MODES}")
+    if settings["backend"] not in ("static", "browser"):
+        raise ValueError(f"Site '{name}': backend must be 'static' or 'browser'")
+    if settings["mode"] == "version_table" and not settings["table_class"]:
+        raise ValueError(f"Site '{name}': version_table needs table_class")
+    try:
+        version_pattern = re.compile(settings["version_pattern"]) if settings["version_pattern"] else None
+        date_pattern = re.compile(settings["date_pattern"]) if settings["date_pattern"] else None
+    except re.error as exc:
+        raise ValueError(f"Site '{name}': invalid pattern ({exc})") from None
+    return Plan(
+        name=name,
+        url=settings["url"],
+        output=settings["output"],
+        ttl_hours=settings["ttl_hours"],
+        backend=settings["backend"],
+        timeout=settings["timeout"],
+        ready_selector=settings["ready_selector"],
+        mode=settings["mode"],
+        content="list_items" if settings["mode"] == "news_list" else "tables",
+        key_columns=tuple(settings["key_columns"]),
+        infobox=settings["infobox"],
+        require_headers=settings["require_headers"],
+        skip_classes=frozenset(settings["skip_classes"]),
+        source=settings["source"],
+        leading=tuple(settings["leading"]),
+        prefix=settings["prefix"],
+        table_class=settings["table_class"],
+        version_pattern=version_pattern,
+        date_pattern=date_pattern,
+        date_format=settings["date_format"],
+    )
+
+
+@lru_cache(maxsize=8)
+def _load(path: str, mtime: float) -> dict:
+    with open(path, "rb") as f:
+        specs = tomllib.load(f)
+    return {name: compile_plan(name, spec) for name, spec in specs.items()}
+
+
+def load_plans(path: str = SPEC_PATH) -> dict:
+    """
+    Returns ``{name: Plan}`` for every site in a spec file, in file order.
+
+    Plans are compiled once and reused until the file's modification time changes.
+    """
+    return _load(path, os.path.getmtime(path))
+
+
+def get_plan(name: str, path: str = SPEC_PATH) -> Plan:
+    """Returns the compiled plan of one site; raises KeyError if it has no spec."""
+    plans = load_plans(path)
+    if name not in plans:
+        raise KeyError(f"No site '{name}' in {path}")
+    return plans[name]
+
+
+def _extract_tables(plan: Plan, page: dict):
+    columns, headers = None, {}
+
+    def rows():
+        if plan.infobox:
+            for key, value in page["infobox"]:
+                yield ["infobox", key, value]
+        for table in page["tables"]:
+            if plan.skip_classes and plan.skip_classes.intersection(table["classes"].split()):
+                continue
+            if plan.require_headers and not table["headers"]:
+                continue
+            source = plan.source.format(index=table["index"])
+            headers[source] = table["header_row"]
+            for row in table["rows"][1:]:
+                if row:
+                    yield [source] + row
+    return columns, headers, rows()
+
+
+def _extract_version_table(plan: Plan, page: dict):
+    table = next((t for t in page["tables"] if plan.table_class in t["classes"].split()), None)
+    if table is None:
+        return None, {}, iter(())
+    rows = [row for row in table["rows"][1:] if row]
+    columns = table["headers"][:len(rows[0])] if rows else None
+    return columns, {plan.source.format(index=table["index"]): table["header_row"]}, iter(rows)
+
+
+def _extract_news_list(plan: Plan, page: dict):
+    rows = []
+    for item in page["list_items"]:
+        if item["href"] is None:
+            continue
+        version_match = plan.version_pattern.search(item["link_text"]) if plan.version_pattern else None
+        version = version_match.group(0) if version_match else item["link_text"]
+        date_match = plan.date_pattern.match(item["text"]) if plan.date_pattern else None
+        try:
+            date = (datetime.strptime(date_match.group(1), plan.date_format).strftime("%Y-%m-%d")
+                    if date_match else "")
+        except ValueError:
+            continue
+        rows.append([version, date, item["href"]])
+    return ["Version", "Date", "URL"], {}, iter(rows)
+
+
+EXTRACTORS = {
+    "tables": _extract_tables,
+    "version_table": _extract_version_table,
+    "news_list": _extract_news_list,
+}
+
+
+def _add_link_details(rows, columns: list, skip_url: str, workers: int):
+    # Imported here: only news lists that follow their links need it
+    from link_crawler import fetch_details
+
+    rows = list(rows)
+    url_column = columns.index("URL")
+    details = fetch_details([row[url_column] for row in rows], workers=workers, skip=[skip_url])
+    empty = {"body": "", "size": 0}
+    for row in rows:
+        detail = details.get(urldefrag(row[url_column]).url, empty)
+        row += [detail["body"], detail["size"]]
+    return columns + ["Body", "Size"], iter(rows)
+
+
+def run_site(name: str, url: str = None, output_csv: str = None, driver=None, backend: str = None,
+             incremental: bool = False, follow_links: bool = False, link_workers: int = 8,
+             spec_path: str = SPEC_PATH):
+    """
+    Scrapes one site according to its spec.
+
+    Parameters
+    ----------
+    name : str
+        The site's table name in the spec file.
+    url : str, optional
+        Page to scrape instead of the spec's ``url``.
+    output_csv : str, optional
+        Output file instead of the spec's ``output`` (a ``.parquet`` name
+        writes typed Parquet instead).
+    driver : selenium.webdriver.Chrome, optional
+        A pooled browser session to reuse. When omitted, a one-off session is
+        started if the page needs a browser.
+    backend : str, optional
+        ``"static"``, ``"browser"`` or ``"archive"``; defaults to the spec's.
+    incremental : bool
+        Write only new, changed or removed rows (see :mod:`incremental`).
+    follow_links : bool
+        ``news_list`` only: fetch each linked page and add its text and size
+        as ``Body`` and ``Size`` columns (see :mod:`link_crawler`).
+    link_workers : int
+        Concurrent link fetches with ``follow_links``.
+    spec_path : str
+        The spec file.
+
+    Returns
+    -------
+    int
+        Number of rows written (0 if nothing was found), or in incremental
+        mode the number of delta rows. None if the page is unchanged since the
+        output was last written.
+    """
+    plan = get_plan(name, spec_path)
+    if follow_links and plan.mode != "news_list":
+        raise ValueError(f"Site '{name}': follow_links only applies to news_list sites")
+    url = url or plan.url
+    output_csv = output_csv or plan.output
+    page = load_page(url, backend or plan.backend, driver, ready_selector=plan.ready_selector,
+                     timeout=plan.timeout, content=plan.content, output_csv=output_csv)
+    if page is None:
+        return None  # unchanged since the last run
+
+    columns, headers, rows = EXTRACTORS[plan.mode](plan, page)
+    if follow_links:
+        columns, rows = _add_link_details(rows, columns, url, link_workers)
+    with StreamingCsvWriter(output_csv, columns=columns, leading=plan.leading, prefix=plan.prefix,
+                            incremental=incremental, key_columns=plan.key_columns) as writer:
+        for row in rows:
+            writer.write(row)
+        for source, header_row in headers.items():
+            writer.set_table_header(source, header_row)
+
+    if not writer.rows:
+        print(f"⚠️ No data found on '{url}'.")
+        return 0
+
+    print(f"✅ Scraping complete! Data saved as '{output_csv}'.")
+    return writer.written
+
+
+def site_scraper(name: str):
+    """
+    Returns a scraper function for a site that has no hand-written wrapper.
+
+    The function has the signature the orchestrators expect:
+    ``(url, output_csv, driver=None, backend=None, incremental=False)``.
+    """
+    def scrape(url: str, output_csv: str, driver=None, backend: str = None, incremental: bool = False):
+        return run_site(name, url, output_csv, driver, backend, incremental)
+
+    scrape.__name__ = scrape.__qualname__ = f"scrape_{name}"
+    scrape.__doc__ = f"Scrapes the '{name}' site described in sites.toml (see :func:`engine.run_site`)."
+    return scrape
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scrape sites described in sites.toml.")
+    parser.add_argument("names", nargs="*", help="sites to scrape")
+    parser.add_argument("--spec", default=SPEC_PATH, help="site spec file")
+    parser.add_argument("--backend", choices=["static", "browser", "archive"], help="override the spec's backend")
+    parser.add_argument("--output", help="output file (only with a single site)")
+    parser.add_argument("--check", action="store_true", help="validate the spec file and list its sites")
+    args = parser.parse_args(argv)
+    try:
+        plans = load_plans(args.spec)
+    except (OSError, ValueError) as exc:  # tomllib.TOMLDecodeError is a ValueError
+        print(f"❌ {args.spec}: {exc}")
+        return 1
+    if args.check:
+        for plan in plans.values():
+            print(f"{plan.name:<24}{plan.mode:<15}{plan.backend:<9}{plan.url}")
+        print(f"✅ {len(plans)} sites OK.")
+        return 0
+    unknown = sorted(set(args.names) - set(plans))
+    if unknown:
+        parser.error(f"unknown sites: {', '.join(unknown)}")
+    if args.output and len(args.names) != 1:
+        parser.error("--output needs exactly one site")
+    for name in args.names or plans:
+        run_site(name, output_csv=args.output, backend=args.backend, spec_path=args.spec)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
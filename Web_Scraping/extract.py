@@ -0,0 +1,77 @@
+"""
+Bulk page extraction for the Web_Scraping scrapers.
+
+Reading tables through ``find_elements`` and ``.text`` costs one WebDriver
+round trip per row and per cell. :func:`extract_page` instead runs a single
+script inside the browser that collects every table, the infobox and the
+first list on the page, and returns them as plain Python structures.
+"""
+
+EXTRACT_PAGE_JS = """
+const hidden = (el) => el.checkVisibility && !el.checkVisibility();
+const text = (el) => hidden(el) ? "" : (el.innerText || "").replace(/\\u00a0/g, " ").trim();
+const cell = (el) => text(el).replace(/\\n/g, " ");
+
+const tables = Array.from(document.querySelectorAll("table"), (table, i) => ({
+    index: i + 1,
+    classes: table.getAttribute("class") || "",
+    headers: Array.from(table.querySelectorAll("th"), text),
+    header_row: Array.from(table.querySelector("tr")?.querySelectorAll("th, td") || [], cell),
+    rows: Array.from(table.querySelectorAll("tr"),
+                     (tr) => Array.from(tr.querySelectorAll("td"), cell)),
+}));
+
+const infobox = [];
+const box = document.querySelector("table.infobox");
+if (box) {
+    for (const tr of box.querySelectorAll("tr")) {
+        const th = tr.querySelector("th");
+        const td = tr.querySelector("td");
+        if (th && td) {
+            infobox.push([text(th), cell(td)]);
+        }
+    }
+}
+
+const list_items = [];
+const ul = document.querySelector("ul");
+if (ul) {
+    for (const li of ul.querySelectorAll("li")) {
+        const a = li.querySelector("a");
+        list_items.push({
+            text: text(li),
+            href: a ? a.href : null,
+            link_text: a ? text(a) : null,
+        });
+    }
+}
+
+return {tables: tables, infobox: infobox, list_items: list_items};
+"""
+
+
+def extract_page(driver) -> dict:
+    """
+    Extracts all tables, the infobox and the first list from the loaded page
+    in one WebDriver call.
+
+    Cell text follows the conventions of the original scrapers: stripped, with
+    newlines inside ``td`` cells replaced by spaces.
+
+    Parameters
+    ----------
+    driver : selenium.webdriver.Chrome
+        A browser session that has already loaded the target page.
+
+    Returns
+    -------
+    dict
+        ``tables``: list of dicts with ``index`` (1-based, document order),
+        ``classes``, ``headers`` (text of every ``th``), ``header_row`` (the
+        ``th``/``td`` texts of the first ``tr``) and ``rows`` (the ``td``
+        texts of every ``tr``, including the first row).
+        ``infobox``: list of ``[key, value]`` pairs from ``table.infobox``.
+        ``list_items``: dicts with ``text``, ``href`` and ``link_text`` for
+        each ``li`` of the first ``ul``.
+    """
+    return driver.execute_script(EXTRACT_PAGE_JS)
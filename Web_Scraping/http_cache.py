@@ -0,0 +1,246 @@
+"""
+On-disk HTTP cache for scraped pages.
+
+Response bodies are stored as files keyed by URL, with an SQLite index holding
+their ETag/Last-Modified validators, content hash and access times. Cached
+pages are revalidated with conditional requests, so an unchanged page costs a
+304 instead of a full download, and callers can tell from ``changed_at``
+whether the content is newer than their last output. The cache is bounded by
+total size (least recently used entries are evicted first) and by entry age.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+class HttpCache:
+    """
+    A size- and age-bounded page cache with conditional revalidation.
+
+    Parameters
+    ----------
+    directory : str
+        Folder holding the index database and the cached bodies.
+    max_bytes : int
+        Total size of cached bodies before LRU eviction kicks in.
+    max_age : float
+        Seconds after which an entry is dropped instead of revalidated.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, max_bytes: int = 200 * 1024 * 1024,
+                 max_age: float = 30 * 24 * 3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".html")
+
+    def _lookup(self, url: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, sha256, fetched_at, changed_at FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[3] > self.max_age or not os.path.exists(self._body_path(url)):
+            self._delete(url)
+            return None
+        return {"etag": row[0], "last_modified": row[1], "sha256": row[2], "changed_at": row[4]}
+
+    def _delete(self, url: str):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+        try:
+            os.remove(self._body_path(url))
+        except FileNotFoundError:
+            pass
+
+    def _read_body(self, url: str):
+        # None if the body file is gone or unreadable, e.g. evicted by another thread
+        try:
+            with open(self._body_path(url), encoding="utf-8") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def fetch(self, session, url: str, timeout: float = 15):
+        """
+        Fetches ``url`` through the cache, revalidating any stored copy.
+
+        Parameters
+        ----------
+        session : requests.Session
+            HTTP session used for the (conditional) request.
+        url : str
+            The page to fetch.
+        timeout : float
+            Seconds to wait for the server.
+
+        Returns
+        -------
+        tuple of (str, float)
+            The page body and the time its content last changed.
+        """
+        entry = self._lookup(url)
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            body = self._read_body(url) if entry is not None else None
+            if body is not None:
+                self.hits += 1
+                now = time.time()
+                with self._lock:
+                    self._db.execute(
+                        "UPDATE entries SET fetched_at = ?, last_used = ? WHERE url = ?", (now, now, url)
+                    )
+                    self._db.commit()
+                return body, entry["changed_at"]
+            # The stored copy vanished (evicted or unreadable) after the lookup:
+            # treat it as a miss and ask for the full page without validators
+            self._delete(url)
+            entry = None
+            response = session.get(url, timeout=timeout)
+            if response.status_code == 304:
+                raise requests.HTTPError(f"{url} answered 304 to an unconditional request", response=response)
+
+        response.raise_for_status()
+        if response.encoding is None or "charset" not in response.headers.get("Content-Type", ""):
+            response.encoding = response.apparent_encoding
+        self.misses += 1
+        body = response.text
+        changed_at = self.store(url, body, response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"), previous=entry)
+        return body, changed_at
+
+    def store(self, url: str, body: str, etag: str = None, last_modified: str = None,
+              previous: dict = None) -> float:
+        """
+        Stores a page body and returns the time its content last changed.
+
+        Used directly for pages rendered in the browser, which have no HTTP
+        validators but still benefit from the content-hash comparison.
+
+        Parameters
+        ----------
+        url : str
+            The page URL.
+        body : str
+            The page HTML.
+        etag, last_modified : str, optional
+            Validators from the response headers.
+        previous : dict, optional
+            The existing entry, if the caller already looked it up.
+
+        Returns
+        -------
+        float
+            ``changed_at`` of the stored entry: unchanged if the body hashes
+            the same as before, otherwise the current time.
+        """
+        if previous is None:
+            previous = self._lookup(url)
+        data = body.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        changed_at = previous["changed_at"] if previous and previous["sha256"] == sha else now
+
+        tmp_path = self._body_path(url) + f".{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._body_path(url))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, sha, len(data), now, changed_at, now),
+            )
+            self._db.commit()
+        self.evict()
+        return changed_at
+
+    def evict(self):
+        """Drops expired entries, then least recently used ones until under ``max_bytes``."""
+        with self._lock:
+            expired = [r[0] for r in self._db.execute(
+                "SELECT url FROM entries WHERE fetched_at < ?", (time.time() - self.max_age,))]
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            victims = []
+            if total > self.max_bytes:
+                for url, size in self._db.execute("SELECT url, size FROM entries ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append(url)
+                    total -= size
+        for url in set(expired + victims):
+            self._delete(url)
+
+    def close(self):
+        """Closes the index database."""
+        with self._lock:
+            self._db.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> HttpCache:
+    """Returns the shared cache, creating it with default limits on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+
+def configure(directory: str = DEFAULT_DIR, max_bytes: int = 200 * 1024 * 1024,
+              max_age: float = 30 * 24 * 3600) -> HttpCache:
+    """
+    Replaces the shared cache with one using the given location and limits.
+
+    Returns
+    -------
+    HttpCache
+        The new shared cache.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = HttpCache(directory, max_bytes, max_age)
+        return _cache
@@ -0,0 +1,156 @@
+"""
+Incremental CSV output for scrapers whose pages change a few rows at a time.
+
+Rows are identified by a SHA-1 hash of their cell values. Comparing the hashes
+of a fresh scrape with those of the previous CSV gives the rows that were
+added and removed; an added and a removed row sharing the same key columns
+are reported as one changed row. Only the delta is written:
+
+- ``<name>.delta.csv``: the rows of this run's delta with a leading ``Change``
+  column (``added``, ``changed`` or ``removed``).
+- ``<name>.changes.log``: one JSON line per run with the delta counts.
+
+The main CSV keeps the page's row order. It is appended to when the previous
+rows are still the first rows of the page, in the same order, so the new ones
+all come after them. Otherwise it is replaced: rows changed or disappeared, the
+column layout changed, or new rows appeared above old ones (newest-first pages
+such as the Windows release tables). Both files are read as streams; only
+row hashes and keys are held in memory.
+"""
+
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+from collections import Counter
+
+
+def row_hash(row) -> str:
+    """Returns a stable hash of a row's cell values."""
+    return hashlib.sha1("\x1f".join(row).encode("utf-8")).hexdigest()
+
+
+def _read_header(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), None)
+
+
+def _iter_rows(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        yield from reader
+
+
+def _starts_with(snapshot_csv: str, path: str) -> bool:
+    """True if the rows of ``path`` are the first rows of ``snapshot_csv``, in order."""
+    fresh = _iter_rows(snapshot_csv)
+    try:
+        return all(next(fresh, None) == row for row in _iter_rows(path))
+    finally:
+        fresh.close()
+
+
+def _summarize(path: str, key_columns):
+    hashes = Counter()
+    keys = {}
+    for row in _iter_rows(path):
+        h = row_hash(row)
+        hashes[h] += 1
+        keys[h] = tuple(row[i] for i in key_columns)
+    return hashes, keys
+
+
+def write_incremental(output_csv: str, snapshot_csv: str, key_columns=()) -> dict:
+    """
+    Updates ``output_csv`` from a fresh full scrape, writing only what changed.
+
+    Parameters
+    ----------
+    output_csv : str
+        The CSV written by the previous run (created if missing).
+    snapshot_csv : str
+        A complete CSV of the fresh scrape. It is moved over ``output_csv``
+        or deleted once the delta has been applied.
+    key_columns : tuple of int
+        Indexes of the columns that identify a row across runs (e.g. the
+        version column), used to pair removed and added rows into changes.
+
+    Returns
+    -------
+    dict
+        Counts of ``added``, ``changed`` and ``removed`` rows.
+    """
+    header = _read_header(snapshot_csv)
+    same_layout = _read_header(output_csv) == header
+    new_hashes, new_keys = _summarize(snapshot_csv, key_columns)
+    if same_layout:
+        old_hashes, old_keys = _summarize(output_csv, key_columns)
+    else:
+        # First run or a new column layout: everything counts as added
+        old_hashes, old_keys = Counter(), {}
+    added = new_hashes - old_hashes
+    removed = old_hashes - new_hashes
+
+    # An added and a removed row with the same key are one changed row
+    removable = Counter()
+    for h, n in removed.items():
+        removable[old_keys[h]] += n
+    changed = Counter()
+    if key_columns:
+        for h, n in added.items():
+            key = new_keys[h]
+            changed[key] += min(n, removable[key] - changed[key])
+    counts = {"added": 0, "changed": 0, "removed": 0}
+    append_only = same_layout and not removed and _starts_with(snapshot_csv, output_csv)
+
+    stem = os.path.splitext(output_csv)[0]
+    with open(stem + ".delta.csv", "w", newline="", encoding="utf-8") as f:
+        delta = csv.writer(f, lineterminator=os.linesep)
+        delta.writerow(["Change"] + header)
+        unmatched, to_pair = added.copy(), changed.copy()
+        for row in _iter_rows(snapshot_csv):
+            h = row_hash(row)
+            if unmatched[h] <= 0:
+                continue
+            unmatched[h] -= 1
+            if to_pair[new_keys[h]] > 0:
+                to_pair[new_keys[h]] -= 1
+                change = "changed"
+            else:
+                change = "added"
+            counts[change] += 1
+            delta.writerow([change] + row)
+
+        unmatched, to_pair = removed.copy(), changed.copy()
+        for row in _iter_rows(output_csv) if removed else ():
+            h = row_hash(row)
+            if unmatched[h] <= 0:
+                continue
+            unmatched[h] -= 1
+            if to_pair[old_keys[h]] > 0:
+                to_pair[old_keys[h]] -= 1  # already reported as changed
+                continue
+            counts["removed"] += 1
+            delta.writerow(["removed"] + row)
+
+    if append_only:
+        # Only additions after the existing rows: extend the file instead of replacing it
+        kept = sum(old_hashes.values())
+        with open(output_csv, "a", newline="", encoding="utf-8") as f:
+            rows = itertools.islice(_iter_rows(snapshot_csv), kept, None)
+            csv.writer(f, lineterminator=os.linesep).writerows(rows)
+        os.remove(snapshot_csv)
+    else:
+        os.replace(snapshot_csv, output_csv)
+
+    with open(stem + ".changes.log", "a", encoding="utf-8") as f:
+        total = sum(new_hashes.values())
+        f.write(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "total": total, **counts}) + "\n")
+    print(f"Incremental update of '{output_csv}': {counts['added']} added, "
+          f"{counts['changed']} changed, {counts['removed']} removed.")
+    return counts
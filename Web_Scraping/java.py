@@ -1,14 +1,9 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-import time
+from engine import run_site
 
 
-def scrape_java_version_history(url: str, output_csv: str):
+def scrape_java_version_history(url: str, output_csv: str, driver=None, backend: str = None):
     """
-    Scrapes the Java version history table from a given Wikipedia page using Selenium
+    Scrapes the Java version history table from a given Wikipedia page
     and saves the extracted data as a CSV file in the same folder.
 
     Parameters
@@ -16,32 +11,24 @@ def scrape_java_version_history(url: str, output_csv: str):
     url : str
         The URL of the Wikipedia page containing the Java version history table.
     output_csv : str
-        The name of the CSV file to save the scraped data.
+        The name of the CSV file to save the scraped data (a ``.parquet`` name
+        writes typed Parquet instead).
+    driver : selenium.webdriver.Chrome, optional
+        A pooled browser session to reuse. When omitted, a one-off session is
+        started and quit after scraping.
+    backend : str, optional
+        ``"static"`` fetches the server-rendered HTML without a browser and
+        only falls back to Chrome when the tables are missing; ``"browser"``
+        always uses Chrome; ``"archive"`` re-parses the last archived snapshot.
+        Defaults to the ``backend`` of the ``[java]`` entry in sites.toml.
 
     Returns
     -------
-    None
-        Creates a CSV file in the same folder as the script containing the scraped table data.
+    int
+        Number of rows written to the CSV file (0 if nothing was found).
+        None if the page is unchanged since the CSV was last written.
     """
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.get(url)
-    time.sleep(2)
-#extraction starts here
-    table = driver.find_element(By.CSS_SELECTOR, "table.wikitable")
-    headers = [th.text.strip() for th in table.find_elements(By.TAG_NAME, "th")]
-
-    rows = []
-    for tr in table.find_elements(By.TAG_NAME, "tr")[1:]:
-        cells = tr.find_elements(By.TAG_NAME, "td")
-        row = [cell.text.strip().replace("\n", " ") for cell in cells]
-        if row:
-            rows.append(row)
-
-    df = pd.DataFrame(rows, columns=headers[:len(rows[0])])
-    df.to_csv(output_csv, index=False, encoding="utf-8")
-
-    driver.quit()
-    print(f"✅ Scraping complete! Data saved as '{output_csv}' in the same folder.")
+    return run_site("java", url, output_csv, driver, backend)
 
 
 if __name__ == "__main__":
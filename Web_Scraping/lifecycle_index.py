@@ -0,0 +1,402 @@
+"""
+Version-lifecycle index over the scraped product CSVs.
+
+Each scraper's CSV has its own loose layout, so a small extractor per file
+maps its rows onto two SQLite tables:
+
+- ``versions``: one row per product version and servicing channel with its
+  release date, end of (mainstream) support, end of extended support and
+  latest known build.
+- ``builds``: individual builds or updates with their release date and KB.
+
+All dates are stored as ISO ``YYYY-MM-DD`` text; a month without a day (as in
+"September 2028") counts as its last day. The tables are indexed for the
+lookups below, which run in well under a millisecond once the index is built.
+
+:meth:`LifecycleIndex.refresh` only re-reads CSVs whose content changed since
+the last refresh, replacing just the rows that came from them.
+
+Example Usage:
+    python lifecycle_index.py refresh
+    python lifecycle_index.py latest "Windows 11" --on 2025-06-30
+    python lifecycle_index.py ending --from 2025-10-01 --to 2025-12-31
+"""
+
+import argparse
+import calendar
+import csv
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+from datetime import date
+
+from cell_formats import BUILD, KB, NUMERIC_VERSION, clean, parse_date, version_number
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(HERE, ".cache", "lifecycle.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    product TEXT NOT NULL,
+    version TEXT NOT NULL,
+    channel TEXT NOT NULL DEFAULT '',
+    released TEXT,
+    end_of_support TEXT,
+    end_of_extended_support TEXT,
+    latest_build TEXT,
+    source TEXT NOT NULL,
+    PRIMARY KEY (product, version, channel)
+);
+CREATE INDEX IF NOT EXISTS versions_released ON versions (product, released);
+CREATE INDEX IF NOT EXISTS versions_end ON versions (end_of_support);
+CREATE INDEX IF NOT EXISTS versions_extended_end ON versions (end_of_extended_support);
+CREATE INDEX IF NOT EXISTS versions_source ON versions (source);
+CREATE TABLE IF NOT EXISTS builds (
+    product TEXT NOT NULL,
+    build TEXT NOT NULL,
+    version TEXT,
+    kb TEXT,
+    released TEXT,
+    build_major INTEGER,
+    build_minor INTEGER,
+    source TEXT NOT NULL,
+    PRIMARY KEY (product, build)
+);
+CREATE INDEX IF NOT EXISTS builds_released ON builds (product, released);
+CREATE INDEX IF NOT EXISTS builds_source ON builds (source);
+"""
+
+WINDOWS_VERSION = re.compile(r"^(\d{2}H\d)")
+
+
+def _cell(row: list, i: int) -> str:
+    return clean(row[i]) if i < len(row) else ""
+
+
+def _version(product, version, source, channel="", released=None, end=None, extended=None, build=None):
+    return ("version", {"product": product, "version": version, "channel": channel, "released": released,
+                        "end_of_support": end, "end_of_extended_support": extended,
+                        "latest_build": build, "source": source})
+
+
+def _build_rows(product: str, rows, source: str):
+    # Any row holding a Windows build number and a date is one build/update
+    for row in rows:
+        cells = [_cell(row, i) for i in range(len(row))]
+        at = next((i for i, c in enumerate(cells) if BUILD.match(c)), None)
+        if at is None:
+            continue
+        # The build's own date is the last one before it (earlier ones are the version's)
+        dates = [d for d in map(parse_date, cells[:at]) if d]
+        if dates:
+            kb = next((c for c in cells if KB.match(c)), None)
+            yield ("build", {"product": product, "build": cells[at], "kb": kb, "released": dates[-1],
+                             "source": source})
+
+
+def _windows_11(rows, source):
+    for row in rows:
+        if row[0] in ("table_1", "table_2"):
+            m = WINDOWS_VERSION.match(_cell(row, 1))
+            if m:
+                yield _version("Windows 11", m[1], source, _cell(row, 2), parse_date(_cell(row, 3)),
+                               parse_date(_cell(row, 4)), parse_date(_cell(row, 5)), _cell(row, 8) or None)
+    yield from _build_rows("Windows 11", rows, source)
+
+
+def _windows_server(rows, source):
+    for row in rows:
+        if row[0] == "Table_1" and _cell(row, 1).startswith("Windows Server"):
+            # "End of servicing" instead of a date: mainstream support is over
+            yield _version("Windows Server", _cell(row, 1), source, _cell(row, 2), parse_date(_cell(row, 4)),
+                           parse_date(_cell(row, 5)), parse_date(_cell(row, 6)), _cell(row, 9) or None)
+    yield from _build_rows("Windows Server", rows, source)
+
+
+def _java(rows, source):
+    for row in rows:
+        version = version_number(_cell(row, 0))
+        released = parse_date(_cell(row, 3))
+        if version and released:
+            yield _version("Java SE", version, source, _cell(row, 1), released,
+                           parse_date(_cell(row, 4)), parse_date(_cell(row, 5)))
+
+
+def _oracle_linux(rows, source):
+    for row in rows:
+        if row[0] == "table_3":
+            # Release history; merged cells shift the version into the next column
+            for i in (1, 2):
+                if NUMERIC_VERSION.match(_cell(row, i)):
+                    yield _version("Oracle Linux", _cell(row, i), source, released=parse_date(_cell(row, i + 1)))
+                    break
+        elif row[0] == "table_4" and NUMERIC_VERSION.match(_cell(row, 1)):
+            yield _version("Oracle Linux", _cell(row, 1), source, end=parse_date(_cell(row, 2)),
+                           extended=parse_date(_cell(row, 3)))
+
+
+def _suse(rows, source):
+    for row in rows:
+        if row[0] == "table_2" and NUMERIC_VERSION.match(_cell(row, 1)):
+            dates = [d for d in (parse_date(_cell(row, i)) for i in range(2, len(row))) if d]
+            dates += [None] * (3 - len(dates))
+            yield _version("SUSE Linux Enterprise", _cell(row, 1), source, released=dates[0],
+                           end=dates[1], extended=dates[2])
+
+
+def _dbf_news(rows, source):
+    for row in rows:
+        released = parse_date(_cell(row, 1))
+        if released and _cell(row, 0).startswith("v"):
+            yield _version("DBF Viewer 2000", _cell(row, 0)[1:], source, released=released)
+
+
+# CSV file name -> extractor yielding ("version" | "build", fields) records
+EXTRACTORS = {
+    "windows11_release_info.csv": _windows_11,
+    "windows_server_release_info.csv": _windows_server,
+    "java_version_history.csv": _java,
+    "oracle_linux_data.csv": _oracle_linux,
+    "suse_linux_enterprise_data.csv": _suse,
+    "dbf_news.csv": _dbf_news,
+}
+
+VERSION_COLUMNS = ("product", "version", "channel", "released", "end_of_support",
+                   "end_of_extended_support", "latest_build", "source")
+
+
+class LifecycleIndex:
+    """
+    SQLite index of product versions, builds and support dates.
+
+    Parameters
+    ----------
+    db_path : str
+        The index database; created on first use.
+    csv_dir : str
+        Folder holding the scraped CSV files.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB, csv_dir: str = HERE):
+        self.csv_dir = csv_dir
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+
+    def refresh(self) -> dict:
+        """
+        Re-indexes the CSVs that changed since the last refresh.
+
+        A file is re-read only if its size or modification time differ from
+        the last refresh and its content hash changed too; the rows it
+        contributed are then replaced in one transaction. The rows of a file
+        that no longer exists are deleted, so queries stop returning them.
+
+        Returns
+        -------
+        dict
+            ``"indexed"``, ``"unchanged"`` or ``"missing"`` per CSV file name.
+        """
+        status = {}
+        for name, extractor in EXTRACTORS.items():
+            path = os.path.join(self.csv_dir, name)
+            if not os.path.exists(path):
+                with self._db:
+                    if self._db.execute("DELETE FROM sources WHERE path = ?", (name,)).rowcount:
+                        self._forget(name)
+                        self._link_builds()
+                status[name] = "missing"
+                continue
+            stat = os.stat(path)
+            known = self._db.execute("SELECT mtime, size, sha256 FROM sources WHERE path = ?", (name,)).fetchone()
+            if known and known["mtime"] == stat.st_mtime and known["size"] == stat.st_size:
+                status[name] = "unchanged"
+                continue
+            with open(path, "rb") as f:
+                sha = hashlib.sha256(f.read()).hexdigest()
+            with self._db:
+                if not (known and known["sha256"] == sha):
+                    self._reindex(name, path, extractor)
+                self._db.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                                 (name, stat.st_mtime, stat.st_size, sha))
+            status[name] = "unchanged" if known and known["sha256"] == sha else "indexed"
+        return status
+
+    def _forget(self, name: str):
+        self._db.execute("DELETE FROM versions WHERE source = ?", (name,))
+        self._db.execute("DELETE FROM builds WHERE source = ?", (name,))
+
+    def _link_builds(self, name: str = None):
+        # A build belongs to the version whose latest build has the same major number
+        self._db.execute(
+            "UPDATE builds SET version = (SELECT v.version FROM versions v WHERE v.product = builds.product "
+            "AND v.latest_build LIKE builds.build_major || '.%' ORDER BY v.released DESC LIMIT 1) "
+            "WHERE ? IS NULL OR source = ?", (name, name))
+
+    def _reindex(self, name: str, path: str, extractor):
+        self._forget(name)
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for kind, fields in extractor(list(reader), name):
+                if kind == "version":
+                    # Several tables may describe the same version: keep every known date
+                    self._db.execute(
+                        f"INSERT INTO versions ({', '.join(VERSION_COLUMNS)}) VALUES ({', '.join('?' * 8)}) "
+                        "ON CONFLICT (product, version, channel) DO UPDATE SET "
+                        "released = COALESCE(released, excluded.released), "
+                        "end_of_support = COALESCE(end_of_support, excluded.end_of_support), "
+                        "end_of_extended_support = COALESCE(end_of_extended_support, "
+                        "excluded.end_of_extended_support), "
+                        "latest_build = COALESCE(latest_build, excluded.latest_build)",
+                        tuple(fields[c] for c in VERSION_COLUMNS))
+                else:
+                    major, minor = BUILD.match(fields["build"]).groups()
+                    self._db.execute(
+                        "INSERT INTO builds VALUES (?, ?, NULL, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (product, build) DO UPDATE SET kb = COALESCE(kb, excluded.kb)",
+                        (fields["product"], fields["build"], fields["kb"], fields["released"],
+                         int(major), int(minor), name))
+        # Point releases (8.10) without support dates inherit those of their major version (8)
+        for column in ("end_of_support", "end_of_extended_support"):
+            self._db.execute(
+                f"UPDATE versions SET {column} = (SELECT major.{column} FROM versions major "
+                f"WHERE major.product = versions.product AND major.channel = versions.channel "
+                f"AND versions.version LIKE major.version || '.%') WHERE {column} IS NULL AND source = ?",
+                (name,))
+        self._link_builds(name)
+
+    def products(self) -> list:
+        """Returns the indexed product names."""
+        return [r[0] for r in self._db.execute("SELECT DISTINCT product FROM versions ORDER BY product")]
+
+    def versions(self, product: str) -> list:
+        """Returns every indexed version of ``product`` as dicts, oldest release first."""
+        return [dict(r) for r in self._db.execute(
+            "SELECT * FROM versions WHERE product = ? ORDER BY released", (product,))]
+
+    def latest_supported(self, product: str, on: str = None, extended: bool = True):
+        """
+        Finds the newest build (or version) of a product that was supported on a date.
+
+        Parameters
+        ----------
+        product : str
+            E.g. ``"Windows 11"`` or ``"Java SE"``.
+        on : str, optional
+            ISO date; defaults to today.
+        extended : bool
+            Count extended (paid / LTSC) support, not just mainstream support.
+
+        Returns
+        -------
+        dict or None
+            If a build of a supported version was released by ``on``:
+            ``build``, ``version``, ``kb`` and ``released`` of the latest one.
+            Otherwise (products without build history, or no build out yet):
+            ``product``, ``version``, ``channel``, ``released``,
+            ``end_of_support`` and ``end_of_extended_support`` of the newest
+            supported version. That has no ``latest_build``, since the
+            version's latest build may have come out after ``on``.
+        """
+        on = on or date.today().isoformat()
+        support_end = ("COALESCE(MAX(IFNULL(v.end_of_extended_support, ''), IFNULL(v.end_of_support, '')), '')"
+                       if extended else "IFNULL(v.end_of_support, '')")
+        supported = f"(v.released IS NULL OR v.released <= :on) AND ({support_end} = '' OR {support_end} >= :on)"
+        row = self._db.execute(
+            f"SELECT b.build, b.version, b.kb, b.released FROM builds b JOIN versions v "
+            f"ON v.product = b.product AND v.version = b.version "
+            f"WHERE b.product = :product AND b.released <= :on AND {supported} "
+            f"ORDER BY b.released DESC, b.build_major DESC, b.build_minor DESC LIMIT 1",
+            {"product": product, "on": on}).fetchone()
+        if row is None:
+            row = self._db.execute(
+                f"SELECT v.product, v.version, v.channel, v.released, v.end_of_support, "
+                f"v.end_of_extended_support FROM versions v WHERE v.product = :product AND v.released <= :on AND {supported} "
+                f"ORDER BY v.released DESC LIMIT 1", {"product": product, "on": on}).fetchone()
+        return dict(row) if row is not None else None
+
+    def ending_between(self, start: str, end: str, product: str = None) -> list:
+        """
+        Lists versions whose mainstream or extended support ends in ``[start, end]``.
+
+        Returns
+        -------
+        list of dict
+            ``product``, ``version``, ``channel``, ``support`` (``"mainstream"``
+            or ``"extended"``) and ``ends``, soonest first.
+        """
+        query = ("SELECT product, version, channel, 'mainstream' AS support, end_of_support AS ends "
+                 "FROM versions WHERE end_of_support BETWEEN :start AND :end {filter} "
+                 "UNION ALL "
+                 "SELECT product, version, channel, 'extended', end_of_extended_support "
+                 "FROM versions WHERE end_of_extended_support BETWEEN :start AND :end {filter} "
+                 "ORDER BY ends, product, version")
+        query = query.format(filter="AND product = :product" if product else "")
+        return [dict(r) for r in self._db.execute(query, {"start": start, "end": end, "product": product})]
+
+    def close(self):
+        """Closes the index database."""
+        self._db.close()
+
+
+def quarter_bounds(day: date = None) -> tuple:
+    """Returns the first and last ISO dates of the quarter containing ``day`` (default today)."""
+    day = day or date.today()
+    first_month = 3 * ((day.month - 1) // 3) + 1
+    last_month = first_month + 2
+    return (date(day.year, first_month, 1).isoformat(),
+            date(day.year, last_month, calendar.monthrange(day.year, last_month)[1]).isoformat())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query product versions and support dates.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="index database")
+    parser.add_argument("--csv-dir", default=HERE, help="folder with the scraped CSV files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("refresh", help="re-index changed CSV files")
+    commands.add_parser("products", help="list indexed products")
+    latest = commands.add_parser("latest", help="latest supported build or version on a date")
+    latest.add_argument("product")
+    latest.add_argument("--on", help="ISO date (default: today)")
+    latest.add_argument("--mainstream", action="store_true", help="ignore extended support")
+    ending = commands.add_parser("ending", help="versions reaching end of support in a period")
+    ending.add_argument("--from", dest="start", help="ISO date (default: start of this quarter)")
+    ending.add_argument("--to", dest="end", help="ISO date (default: end of this quarter)")
+    ending.add_argument("--product")
+    args = parser.parse_args(argv)
+
+    index = LifecycleIndex(args.db, args.csv_dir)
+    try:
+        status = index.refresh()
+        if args.command == "refresh":
+            for name, state in status.items():
+                print(f"{state:<10} {name}")
+        elif args.command == "products":
+            print("\n".join(index.products()))
+        elif args.command == "latest":
+            result = index.latest_supported(args.product, args.on, extended=not args.mainstream)
+            if result is None:
+                print(f"No supported version of '{args.product}' found.")
+                return 1
+            print(", ".join(f"{k}: {v}" for k, v in result.items() if v))
+        else:
+            start, end = quarter_bounds()
+            for r in index.ending_between(args.start or start, args.end or end, args.product):
+                print(f"{r['ends']}  {r['product']} {r['version']} {r['channel']} ({r['support']})")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
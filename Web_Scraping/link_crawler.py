@@ -0,0 +1,97 @@
+"""
+Follow-links stage: fetch the detail pages a list page points at.
+
+Detail pages are plain server-rendered HTML, so they are fetched with a
+keep-alive ``requests`` session whose connection pool is sized to the number
+of workers, on a bounded thread pool, within the per-host limits of
+:mod:`throttle`. Each distinct URL (ignoring
+``#fragments``) is fetched once however many rows link to it, and the text
+of its main content is extracted the same way as table cells are.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urldefrag
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from static_html import USER_AGENT, inner_text
+from throttle import get_scheduler
+
+CONTENT_XPATH = "//main | //article | //*[@id='content'] | //*[@id='main']"
+
+
+def new_session(pool_size: int) -> requests.Session:
+    """Returns a keep-alive session holding up to ``pool_size`` connections per host."""
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def page_text(html: str) -> str:
+    """Returns the visible text of a page's main content (or of its body)."""
+    tree = lxml.html.fromstring(html)
+    content = tree.xpath(CONTENT_XPATH)
+    root = content[0] if content else (tree.find("body") if tree.find("body") is not None else tree)
+    lines = (line.strip() for line in inner_text(root).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _fetch(session: requests.Session, url: str, timeout: float) -> dict:
+    with metrics.stage("follow_link"):
+        response = get_scheduler().request(session, "GET", url, timeout=timeout)
+        response.raise_for_status()
+        if response.encoding is None or "charset" not in response.headers.get("Content-Type", ""):
+            response.encoding = response.apparent_encoding
+        metrics.count("bytes_fetched", len(response.content))
+        return {"body": page_text(response.text), "size": len(response.content)}
+
+
+def _with_labels(labels: dict, func, *args):
+    # Worker threads do not inherit the caller's metric labels
+    with metrics.labels(**labels):
+        return func(*args)
+
+
+def fetch_details(urls, workers: int = 8, timeout: float = 15, skip=()) -> dict:
+    """
+    Fetches and parses each distinct detail page concurrently.
+
+    Parameters
+    ----------
+    urls : iterable of str
+        Links to follow; duplicates and ``#fragment`` variants are fetched once.
+    workers : int
+        Maximum concurrent requests, which is also the connection pool size.
+    timeout : float
+        Seconds to wait for each server response.
+    skip : iterable of str
+        URLs not to follow, such as the list page itself.
+
+    Returns
+    -------
+    dict
+        ``{url: {"body": str, "size": int}}`` keyed by the URL without its
+        fragment. Pages that failed to load map to an empty body and size 0.
+    """
+    skipped = {urldefrag(u).url for u in skip}
+    unique = [u for u in dict.fromkeys(urldefrag(u).url for u in urls) if u not in skipped]
+    details = {}
+    if not unique:
+        return details
+    labels = metrics.current_labels()
+    with new_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_with_labels, labels, _fetch, session, url, timeout): url for url in unique}
+        for future, url in futures.items():
+            try:
+                details[url] = future.result()
+            except (requests.RequestException, ValueError, lxml.etree.ParserError) as exc:
+                print(f"⚠️ Could not fetch '{url}' ({exc}), leaving its body empty.")
+                details[url] = {"body": "", "size": 0}
+    print(f"Followed {len(unique)} links with {workers} workers.")
+    return details
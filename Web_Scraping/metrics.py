@@ -0,0 +1,224 @@
+"""
+Timing and counter hooks for the scraping pipeline.
+
+The pipeline reports each stage (``driver_install``, ``driver_start``,
+``fetch``, ``parse``, ``navigate``, ``wait``, ``extract``, ``write``,
+``scrape``) through :func:`stage` and counts things such as elements queried,
+rows extracted and bytes written with :func:`count`. Events go to the sink
+installed with :func:`set_sink`:
+
+- :class:`JsonLinesSink` writes one JSON object per event,
+- :class:`PrometheusSink` aggregates them into a Prometheus text file,
+- any object with ``emit(event)`` and ``close()`` methods can be plugged in.
+
+With no sink installed (the default), :func:`stage` returns a shared no-op
+context manager and :func:`count` returns at once, so the hooks cost one
+function call each.
+
+Labels set with :func:`labels`, such as the scraper name, are attached to
+every event emitted inside the block on the same thread.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+_sink = None
+_labels = contextvars.ContextVar("metric_labels", default={})
+_NULL = contextlib.nullcontext()
+
+
+def set_sink(sink):
+    """
+    Installs the sink that receives every event, or disables metrics with ``None``.
+
+    Returns
+    -------
+    object
+        The previously installed sink.
+    """
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def enabled() -> bool:
+    """Returns True if a sink is installed."""
+    return _sink is not None
+
+
+def _emit(kind: str, name: str, value, extra: dict):
+    event = {"time": time.time(), "kind": kind, "name": name, "value": value,
+             "labels": {**_labels.get(), **extra}}
+    _sink.emit(event)
+
+
+@contextlib.contextmanager
+def labels(**values):
+    """Attaches ``values`` as labels to the events emitted inside the block."""
+    token = _labels.set({**_labels.get(), **values})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+def current_labels() -> dict:
+    """Returns the labels in effect, e.g. to re-apply them in a worker thread."""
+    return dict(_labels.get())
+
+
+@contextlib.contextmanager
+def _timed(name: str, extra: dict):
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as exc:
+        _emit("stage", name, time.perf_counter() - start, {**extra, "error": type(exc).__name__})
+        raise
+    _emit("stage", name, time.perf_counter() - start, extra)
+
+
+def stage(name: str, **extra):
+    """
+    Context manager that times a pipeline stage.
+
+    Parameters
+    ----------
+    name : str
+        The stage, e.g. ``"fetch"`` or ``"write"``.
+    **extra
+        Labels for this event only.
+    """
+    if _sink is None:
+        return _NULL
+    return _timed(name, extra)
+
+
+def count(name: str, value: float = 1, **extra):
+    """
+    Adds ``value`` to a counter such as ``rows_extracted`` or ``bytes_written``.
+
+    Parameters
+    ----------
+    name : str
+        The counter.
+    value : float
+        Amount to add.
+    **extra
+        Labels for this event only.
+    """
+    if _sink is None:
+        return
+    _emit("counter", name, value, extra)
+
+
+class JsonLinesSink:
+    """
+    Writes each event as one JSON line.
+
+    Parameters
+    ----------
+    path : str
+        File the events are appended to.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def emit(self, event: dict):
+        line = json.dumps(event) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusSink:
+    """
+    Aggregates events into metrics in the Prometheus text format.
+
+    Stages become the summary ``scraper_stage_seconds`` (sum and count per
+    stage and label set) and counters become ``scraper_<name>_total``. The
+    file is rewritten on :meth:`flush` and :meth:`close`, which suits the
+    node_exporter textfile collector.
+
+    Parameters
+    ----------
+    path : str
+        The ``.prom`` file to write.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stages = defaultdict(lambda: [0.0, 0])
+        self._counters = defaultdict(float)
+
+    def emit(self, event: dict):
+        key = tuple(sorted(event["labels"].items()))
+        with self._lock:
+            if event["kind"] == "stage":
+                totals = self._stages[(event["name"], key)]
+                totals[0] += event["value"]
+                totals[1] += 1
+            else:
+                self._counters[(event["name"], key)] += event["value"]
+
+    @staticmethod
+    def _format_labels(pairs) -> str:
+        if not pairs:
+            return ""
+        def escape(value) -> str:
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in pairs) + "}"
+
+    def render(self) -> str:
+        """Returns the aggregated metrics as Prometheus exposition text."""
+        lines = []
+        with self._lock:
+            if self._stages:
+                lines.append("# HELP scraper_stage_seconds Time spent in each scraping stage.")
+                lines.append("# TYPE scraper_stage_seconds summary")
+                for (name, key), (total, n) in sorted(self._stages.items()):
+                    label_text = self._format_labels((("stage", name),) + key)
+                    lines.append(f"scraper_stage_seconds_sum{label_text} {total:.6f}")
+                    lines.append(f"scraper_stage_seconds_count{label_text} {n}")
+            for name in sorted({name for name, _ in self._counters}):
+                lines.append(f"# TYPE scraper_{name}_total counter")
+                for (counter, key), value in sorted(self._counters.items()):
+                    if counter == name:
+                        lines.append(f"scraper_{name}_total{self._format_labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        """Writes the current metrics to :attr:`path`."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        self.flush()
+
+
+class MultiSink:
+    """Forwards every event to several sinks."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def emit(self, event: dict):
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
@@ -1,14 +1,10 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-import time
+from engine import run_site
 
 
-def scrape_windows_server_release_info(url: str, output_csv: str):
+def scrape_windows_server_release_info(url: str, output_csv: str, driver=None, backend: str = None,
+                                       incremental: bool = False):
     """
-    Scrapes tables from the Windows Server release info page using Selenium
+    Scrapes tables from the Windows Server release info page
     and combines the extracted data into a single CSV file.
 
     Parameters
@@ -16,44 +12,28 @@ def scrape_windows_server_release_info(url: str, output_csv: str):
     url : str
         The URL of the Windows Server release information page.
     output_csv : str
-        The filename for the combined CSV output.
+        The filename for the combined CSV output (a ``.parquet`` name writes
+        typed Parquet instead).
+    driver : selenium.webdriver.Chrome, optional
+        A pooled browser session to reuse. When omitted, a one-off session is
+        started and quit after scraping.
+    backend : str, optional
+        ``"static"`` fetches the server-rendered HTML without a browser and
+        only falls back to Chrome when the tables are missing; ``"browser"``
+        always uses Chrome; ``"archive"`` re-parses the last archived snapshot.
+        Defaults to the ``backend`` of the ``[windows_server]`` entry in sites.toml.
+    incremental : bool
+        Compare with the existing CSV and write only new, changed or removed
+        rows (see :mod:`incremental`) instead of rewriting the whole file.
 
     Returns
     -------
-    None
-        Writes a CSV file in the same folder containing all scraped table rows.
+    int
+        Number of rows written to the CSV file (0 if nothing was found), or
+        in incremental mode the number of delta rows.
+        None if the page is unchanged since the CSV was last written.
     """
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.get(url)
-    time.sleep(5)  # allow page to load fully
-
-    tables = driver.find_elements(By.TAG_NAME, "table")
-
-    combined_rows = []
-    for idx, table in enumerate(tables, start=1):
-        header_elems = table.find_elements(By.TAG_NAME, "th")
-        headers = [th.text.strip() for th in header_elems]
-        for tr in table.find_elements(By.TAG_NAME, "tr")[1:]:
-            td_elems = tr.find_elements(By.TAG_NAME, "td")
-            row = [td.text.strip().replace("\n", " ") for td in td_elems]
-            if row:
-                combined_rows.append([f"Table_{idx}"] + row)
-
-    driver.quit()
-
-    if not combined_rows:
-        print("No table data found to write.")
-        return
-
-    max_len = max(len(r) for r in combined_rows)
-    for r in combined_rows:
-        while len(r) < max_len:
-            r.append("")
-
-    col_names = ["Table_Source"] + [f"Col_{i}" for i in range(1, max_len)]
-    df = pd.DataFrame(combined_rows, columns=col_names)
-    df.to_csv(output_csv, index=False, encoding="utf-8")
-    print(f"Scraping done. Data saved in '{output_csv}'.")
+    return run_site("windows_server", url, output_csv, driver, backend, incremental)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,303 @@
+"""
+Typed normalization of scraped columns, run over whole columns at once.
+
+The scrapers write every cell as text, so ``2025-09-30`` and ``26100.6725``
+sort as strings (``26100.999`` after ``26100.6725``, ``10.0`` before
+``9.0``). This post-processing stage reads a scraped CSV into pandas, works
+out which columns hold dates, versions, Windows builds or KB numbers, and
+adds typed columns next to them using vectorized string operations with
+precompiled patterns, never a Python loop per cell:
+
+- dates (``2025-09-30``, ``01.10.2024``, ``1 October 2024``, ``October
+  2024``): ``<column>_date`` (``datetime64``).
+- versions (``8.0.100``, ``v2.1``, ``1.2.0-beta.1``, ``JDK 1.1``,
+  ``Java SE 17``, ``.NET 8.0``): ``<column>_major``, ``_minor``, ``_patch``
+  (nullable integers), ``_pre`` (pre-release label) and ``_key``.
+- builds (``26100.6725``): ``<column>_build``, ``_revision`` and ``_key``.
+- KB numbers (``KB5065426``): ``<column>_kb``.
+
+A ``_key`` is a single integer that orders versions correctly, with a
+pre-release before its release. Footnote markers such as ``[8]`` are ignored.
+Cells that do not parse get a missing value rather than an error. The date
+and version rules are those of :mod:`cell_formats`, shared with the
+lifecycle index and Parquet output. Kinds are detected per source table, and
+a column holding different kinds in different tables stays text.
+
+Requires the optional ``pandas`` package (and ``pyarrow`` for Parquet output).
+
+Example Usage:
+    python normalize.py windows11_release_info.csv
+    python normalize.py java_version_history.csv -o java_typed.parquet
+"""
+
+import argparse
+import os
+import sys
+
+try:
+    import pandas as pd
+except ImportError:  # optional dependency
+    pd = None
+
+from cell_formats import BUILD, DATE, DOTTED_DATE, FOOTNOTE, ISO_DATE, KB, VERSION, VERSION_CELL, parse_date
+
+# Whole-cell checks used to detect a column's kind
+KIND_PATTERNS = {
+    "date": DATE,
+    "build": BUILD,
+    "kb": KB,
+    "version": VERSION_CELL,
+}
+KINDS = tuple(KIND_PATTERNS)
+# First columns naming the source table of each row, as written by the scrapers
+SOURCE_COLUMNS = ("Source", "Table_Source")
+
+KEY_BASE = 100_000  # each version part must stay below this to fit the sort key
+
+
+def _require_pandas():
+    if pd is None:
+        raise ImportError("Normalization requires pandas: pip install pandas")
+
+
+def _clean(values):
+    return pd.Series(values, dtype="string").str.replace(FOOTNOTE, "", regex=True).str.strip()
+
+
+def _integers(column):
+    return pd.to_numeric(column, errors="coerce").astype("Int64")
+
+
+def _sort_key(major, minor, patch, release):
+    minor, patch = minor.fillna(0), patch.fillna(0)
+    key = ((major * KEY_BASE + minor) * KEY_BASE + patch) * 2 + release.astype("Int64")
+    fits = (major < KEY_BASE) & (minor < KEY_BASE) & (patch < KEY_BASE)
+    return key.where(fits)
+
+
+def parse_dates(values):
+    """
+    Parses dates the way :func:`cell_formats.parse_date` does.
+
+    ISO and ``dd.mm.yyyy`` dates are extracted over the whole column at once;
+    the remaining cells (month names, as in ``1 October 2024``) are parsed
+    once per distinct value.
+
+    Parameters
+    ----------
+    values : pandas.Series or list of str
+        The cells; the first date found in each is used.
+
+    Returns
+    -------
+    pandas.Series
+        ``datetime64`` values, NaT where a cell holds no valid date.
+    """
+    _require_pandas()
+    text = _clean(values)
+    iso = text.str.extract(ISO_DATE)
+    dotted = text.str.extract(DOTTED_DATE)
+    found = (iso[0] + "-" + iso[1] + "-" + iso[2]).fillna(dotted[2] + "-" + dotted[1] + "-" + dotted[0])
+    rest = found.isna() & text.fillna("").ne("")
+    if rest.any():
+        distinct = text[rest].unique()
+        found = found.mask(rest, text[rest].map(dict(zip(distinct, map(parse_date, distinct)))))
+    return pd.to_datetime(found, format="%Y-%m-%d", errors="coerce")
+
+
+def parse_versions(values):
+    """
+    Splits semantic, Java and .NET version strings into numeric parts.
+
+    Parameters
+    ----------
+    values : pandas.Series or list of str
+        The cells, e.g. ``8.0.100-preview.1``, ``JDK 1.1`` or ``Java SE 17``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``major``, ``minor``, ``patch`` (nullable integers), ``pre`` (the
+        pre-release label or missing) and ``key`` (sort key, missing if the
+        cell is not a version).
+    """
+    _require_pandas()
+    parts = _clean(values).str.extract(VERSION)
+    result = pd.DataFrame({"major": _integers(parts[0]), "minor": _integers(parts[1]),
+                           "patch": _integers(parts[2]), "pre": parts[3].astype("string")})
+    result["key"] = _sort_key(result["major"], result["minor"], result["patch"], result["pre"].isna())
+    return result
+
+
+def parse_builds(values):
+    """
+    Splits Windows build numbers such as ``26100.6725``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``build``, ``revision`` and ``key`` as nullable integers.
+    """
+    _require_pandas()
+    parts = _clean(values).str.extract(BUILD)
+    result = pd.DataFrame({"build": _integers(parts[0]), "revision": _integers(parts[1])})
+    zero = pd.Series(0, index=result.index, dtype="Int64")
+    result["key"] = _sort_key(result["build"], result["revision"], zero, result["build"].notna())
+    return result
+
+
+def parse_kbs(values):
+    """Returns the number of each ``KB1234567`` cell as a nullable integer."""
+    _require_pandas()
+    return _integers(_clean(values).str.extract(KB)[0])
+
+
+def _column_kind(values, threshold: float):
+    text = _clean(values)
+    text = text[text.fillna("") != ""]
+    if text.empty:
+        return None
+    for kind, pattern in KIND_PATTERNS.items():
+        if text.str.match(pattern).mean() >= threshold:
+            return kind
+    return None
+
+
+def detect_kinds(frame, threshold: float = 0.5, table_column: str = None) -> dict:
+    """
+    Finds the columns whose cells are mostly of one kind.
+
+    Scraped CSVs stack several source tables, and a generic column such as
+    ``Col_4`` may hold builds in one table and dates in another. Kinds are
+    therefore detected per source table, and a column whose tables disagree
+    is left as text rather than typed after one of them (which would turn
+    the other tables' values into missing ones).
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+        Scraped text columns.
+    threshold : float
+        Share of a table's non-empty cells that must match.
+    table_column : str, optional
+        Column naming each row's source table. Defaults to the first column
+        if it is one of :data:`SOURCE_COLUMNS`; without one the whole frame
+        is a single table.
+
+    Returns
+    -------
+    dict
+        ``{column: kind}``, kind being one of :data:`KINDS`.
+    """
+    _require_pandas()
+    if table_column is None and len(frame.columns) and frame.columns[0] in SOURCE_COLUMNS:
+        table_column = frame.columns[0]
+    tables = [frame] if table_column is None else [table for _, table in frame.groupby(table_column, sort=False)]
+    kinds = {}
+    for column in frame.columns:
+        if column == table_column:
+            continue
+        found = {_column_kind(table[column], threshold) for table in tables} - {None}
+        if len(found) == 1:
+            kinds[column] = found.pop()
+    return kinds
+
+
+def normalize(frame, kinds: dict = None):
+    """
+    Adds typed columns after every date, version, build and KB column.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+        Scraped text columns.
+    kinds : dict, optional
+        ``{column: kind}``; detected with :func:`detect_kinds` if omitted.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A new frame with the original columns and the typed ones.
+    """
+    _require_pandas()
+    kinds = detect_kinds(frame) if kinds is None else kinds
+    unknown = {kind for kind in kinds.values() if kind not in KINDS}
+    if unknown:
+        raise ValueError(f"Unknown kinds {sorted(unknown)}, expected some of {KINDS}")
+    pieces = []
+    for column in frame.columns:
+        pieces.append(frame[[column]])
+        kind = kinds.get(column)
+        if kind == "date":
+            typed = parse_dates(frame[column]).to_frame("date")
+        elif kind == "version":
+            typed = parse_versions(frame[column])
+        elif kind == "build":
+            typed = parse_builds(frame[column])
+        elif kind == "kb":
+            typed = parse_kbs(frame[column]).to_frame("kb")
+        else:
+            continue
+        pieces.append(typed.add_prefix(f"{column}_").set_axis(frame.index))
+    return pd.concat(pieces, axis=1)
+
+
+def normalize_csv(path: str, output: str = None, kinds: dict = None):
+    """
+    Normalizes a scraped CSV and optionally saves the result.
+
+    Parameters
+    ----------
+    path : str
+        The scraped CSV.
+    output : str, optional
+        ``.parquet`` keeps the types (requires pyarrow); ``.csv`` writes the
+        typed values as text.
+    kinds : dict, optional
+        ``{column: kind}``; detected if omitted.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The normalized frame.
+    """
+    _require_pandas()
+    frame = normalize(pd.read_csv(path, dtype="string", keep_default_na=False), kinds)
+    if output:
+        if output.lower().endswith(".parquet"):
+            frame.to_parquet(output, index=False)
+        else:
+            frame.to_csv(output, index=False)
+    return frame
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Add typed date, version and build columns to a scraped CSV.")
+    parser.add_argument("csv", help="scraped CSV file")
+    parser.add_argument("-o", "--output", help="write the result (.parquet or .csv)")
+    parser.add_argument("--kind", action="append", default=[], metavar="COLUMN=KIND",
+                        help=f"set a column's kind instead of detecting it ({', '.join(KINDS)}; repeatable)")
+    args = parser.parse_args(argv)
+    kinds = None
+    if args.kind:
+        kinds = {}
+        for item in args.kind:
+            column, _, kind = item.partition("=")
+            if kind not in KINDS:
+                parser.error(f"--kind expects COLUMN=KIND with KIND in {', '.join(KINDS)}, got '{item}'")
+            kinds[column] = kind
+    if not os.path.exists(args.csv):
+        parser.error(f"no such file: {args.csv}")
+
+    frame = normalize_csv(args.csv, args.output, kinds)
+    typed = [column for column in frame.columns if frame[column].dtype != "string"]
+    print(f"✅ {len(frame)} rows, typed columns: {', '.join(typed) or 'none'}")
+    if args.output:
+        print(f"Saved to '{args.output}'.")
+    else:
+        print(frame[typed].head(10).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import os
+
+import requests
+
+import metrics
+from driver_pool import borrowed_driver
+from extract import extract_page
+from http_cache import get_cache
+from snapshots import get_archive
+from static_html import get_session, parse_html
+from throttle import ThrottledSession, get_scheduler
+from waits import wait_until_ready
+
+BACKENDS = ("static", "browser", "archive")
+
+
+def _count_page(page: dict):
+    rows = sum(len(table["rows"]) for table in page["tables"])
+    cells = sum(len(row) for table in page["tables"] for row in table["rows"])
+    metrics.count("tables_found", len(page["tables"]))
+    metrics.count("rows_extracted", rows + len(page["list_items"]))
+    metrics.count("elements_queried", cells + 2 * len(page["infobox"]) + len(page["list_items"]))
+
+
+def _is_current(output_csv: str, changed_at: float) -> bool:
+    return bool(output_csv) and os.path.exists(output_csv) and os.path.getmtime(output_csv) >= changed_at
+
+
+def _load_archived(url: str, content: str) -> dict:
+    # Newest snapshot that has the wanted content; a static snapshot of a
+    # page built by JavaScript is skipped in favour of the rendered one
+    for _, _, sha in get_archive().history(url):
+        with metrics.stage("parse"):
+            page = parse_html(get_archive().read(sha), url)
+        if page[content]:
+            _count_page(page)
+            page["wait_seconds"] = 0.0
+            return page
+    raise LookupError(f"No archived snapshot of '{url}' contains {content}")
+
+
+def load_page(url: str, backend: str = "browser", driver=None,
+              ready_selector: str = "table", timeout: float = 10,
+              content: str = "tables", output_csv: str = None) -> dict:
+    """
+    Loads a page and extracts its tables, infobox and first list.
+
+    With the ``static`` backend the page is fetched over plain HTTP and parsed
+    with lxml. If the request fails or the HTML does not contain the wanted
+    ``content`` (because the page builds it with JavaScript), the page is
+    loaded in Chrome instead.
+
+    Requests and navigations are rate limited per host, and static fetches
+    retried on 429/5xx, by the shared :mod:`throttle` scheduler. Every
+    fetched page goes through the shared :mod:`http_cache`. If
+    ``output_csv`` already exists and the page content has not changed since
+    it was written, ``None`` is returned. A static fetch only counts as
+    unchanged if its HTML holds the wanted ``content``; a page built by
+    JavaScript is rendered again and its rendered DOM compared. Every fetched
+    page is also kept in the :mod:`snapshots` archive; the ``archive`` backend
+    parses the newest archived copy instead, with no network or browser.
+
+    Parameters
+    ----------
+    url : str
+        The page to load.
+    backend : str
+        ``"static"`` to try plain HTTP first, ``"browser"`` to go straight to
+        Chrome, ``"archive"`` to re-parse the last archived snapshot.
+    driver : selenium.webdriver.Chrome, optional
+        A pooled browser session for the browser backend or fallback.
+    ready_selector : str
+        CSS selector that must match before the browser page is extracted.
+    timeout : float
+        Maximum seconds to wait for the browser page to become ready.
+    content : str
+        Key of the extracted structure (``"tables"``, ``"infobox"`` or
+        ``"list_items"``) that must be non-empty for the static result to count.
+
+    Returns
+    -------
+    dict
+        The structure documented in :func:`extract.extract_page`, plus
+        ``wait_seconds``: the time spent waiting for the browser page (0 for
+        static pages). ``None`` if the page is unchanged since ``output_csv``
+        was written.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+    if backend == "archive":
+        return _load_archived(url, content)
+
+    if backend == "static":
+        try:
+            with metrics.stage("fetch"):
+                html, changed_at = get_cache().fetch(ThrottledSession(get_session()), url)
+            metrics.count("bytes_fetched", len(html))
+            get_archive().add(url, html, "static")
+        except requests.RequestException as exc:
+            print(f"Static fetch of '{url}' failed ({exc}), falling back to the browser.")
+        else:
+            with metrics.stage("parse"):
+                page = parse_html(html, url)
+            # An unchanged static shell only proves the output current if the
+            # content comes from it; otherwise the browser render decides
+            if page[content] and _is_current(output_csv, changed_at):
+                print(f"'{url}' is unchanged since '{output_csv}' was written, skipping.")
+                return None
+            if page[content]:
+                _count_page(page)
+                page["wait_seconds"] = 0.0
+                return page
+            print(f"No {content} in the static HTML of '{url}', falling back to the browser.")
+
+    with borrowed_driver(driver) as driver:
+        get_scheduler().wait_turn(url)
+        with metrics.stage("navigate"):
+            try:
+                driver.get(url)
+            except Exception:
+                get_scheduler().record(url, ok=False)
+                raise
+        get_scheduler().record(url, ok=True)
+        with metrics.stage("wait"):
+            waited = wait_until_ready(driver, ready_selector, timeout)
+        print(f"Page '{url}' ready after {waited:.2f}s.")
+        # Rendered DOMs are cached under their own key so they do not
+        # overwrite the validators of the static response for the same URL.
+        html = driver.page_source
+        get_archive().add(url, html, "browser")
+        changed_at = get_cache().store(f"browser:{url}", html)
+        if _is_current(output_csv, changed_at):
+            print(f"'{url}' is unchanged since '{output_csv}' was written, skipping.")
+            return None
+        with metrics.stage("extract"):
+            page = extract_page(driver)
+    _count_page(page)
+    page["wait_seconds"] = waited
+    return page
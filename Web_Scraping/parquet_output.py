@@ -0,0 +1,146 @@
+"""
+Typed Parquet output for scraped tables.
+
+Converts the spooled rows of a :class:`row_writer.StreamingCsvWriter` into a
+Parquet file instead of a CSV:
+
+- The first (source / table id) column is dictionary-encoded.
+- Columns whose non-empty values are all dates become ``date32``, all
+  integers become ``int64``, and dotted version or build numbers
+  (``26100.6725``) keep their text and gain a ``<column>_parts`` list of
+  integers that sorts and compares numerically. Values are checked by
+  converting them, so a column holding an impossible date or an integer
+  beyond the ``int64`` range stays text. What counts as a date or a version
+  is decided by :mod:`cell_formats`, as in the lifecycle index and
+  :mod:`normalize`; footnote markers such as ``[8]`` are ignored.
+- Per-table metadata, such as the original header row of each table, is
+  stored as JSON in the file's schema metadata under ``table_headers``.
+
+Requires the optional ``pyarrow`` package.
+"""
+
+import csv
+import json
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+from cell_formats import DATE, INTEGER, NUMERIC_VERSION, clean, parse_date
+
+BATCH_ROWS = 10_000
+
+
+INT64_MAX = 2 ** 63 - 1
+
+
+def _kind(value: str) -> str:
+    # A pattern match is not enough: the value must also convert, or the
+    # whole write would fail on one bad cell (2024-02-30, a 20-digit number)
+    text = clean(value)
+    if DATE.match(text):
+        return "date" if parse_date(text) else "string"
+    if INTEGER.match(text):
+        return "integer" if int(text) <= INT64_MAX else "string"
+    if NUMERIC_VERSION.match(text):
+        return "version" if all(int(part) <= INT64_MAX for part in text.split(".")) else "string"
+    return "string"
+
+
+def _detect_types(spool_path: str, width: int) -> list:
+    kinds = [None] * width  # None = no values yet
+    with open(spool_path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            for i, value in enumerate(row):
+                if not value or kinds[i] == "string":
+                    continue
+                kind = _kind(value)
+                if kinds[i] is None:
+                    kinds[i] = kind
+                elif kinds[i] != kind:
+                    # integers mixed with dotted versions are still versions
+                    kinds[i] = "version" if {kinds[i], kind} == {"integer", "version"} else "string"
+    return [kind or "string" for kind in kinds]
+
+
+def _schema(header: list, kinds: list, metadata: dict):
+    fields = []
+    names = set(header)
+    for i, (name, kind) in enumerate(zip(header, kinds)):
+        if i == 0:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        elif kind == "date":
+            fields.append(pa.field(name, pa.date32()))
+        elif kind == "integer":
+            fields.append(pa.field(name, pa.int64()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+            if kind == "version":
+                parts_name = f"{name}_parts"
+                while parts_name in names:  # a scraped column may already be called that
+                    parts_name += "_"
+                names.add(parts_name)
+                fields.append(pa.field(parts_name, pa.list_(pa.int64())))
+    return pa.schema(fields, metadata={k: json.dumps(v) for k, v in metadata.items()})
+
+
+def _batch(columns: list, kinds: list, schema):
+    arrays = []
+    for i, (values, kind) in enumerate(zip(columns, kinds)):
+        if i == 0:
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        elif kind == "date":
+            arrays.append(pa.array([date.fromisoformat(parse_date(v)) if v else None for v in values], pa.date32()))
+        elif kind == "integer":
+            arrays.append(pa.array([int(clean(v)) if v else None for v in values], pa.int64()))
+        else:
+            arrays.append(pa.array([v if v else None for v in values], pa.string()))
+            if kind == "version":
+                parts = [[int(p) for p in clean(v).split(".")] if v else None for v in values]
+                arrays.append(pa.array(parts, pa.list_(pa.int64())))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def spool_to_parquet(spool_path: str, parquet_path: str, header: list, metadata: dict = None) -> int:
+    """
+    Writes spooled CSV rows to a typed Parquet file in fixed-size batches.
+
+    Parameters
+    ----------
+    spool_path : str
+        Headerless CSV of rows, possibly shorter than ``header``.
+    parquet_path : str
+        The Parquet file to create.
+    header : list of str
+        Column names; the first column is dictionary-encoded.
+    metadata : dict, optional
+        JSON-serialisable values stored in the schema metadata.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    if pa is None:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+
+    width = len(header)
+    kinds = _detect_types(spool_path, width)
+    schema = _schema(header, kinds, metadata or {})
+    rows = 0
+    with open(spool_path, newline="", encoding="utf-8") as f, pq.ParquetWriter(parquet_path, schema) as writer:
+        columns = [[] for _ in range(width)]
+        for row in csv.reader(f):
+            row += [""] * (width - len(row))
+            for i in range(width):
+                columns[i].append(row[i])
+            rows += 1
+            if len(columns[0]) >= BATCH_ROWS:
+                writer.write_table(_batch(columns, kinds, schema))
+                columns = [[] for _ in range(width)]
+        if columns[0]:
+            writer.write_table(_batch(columns, kinds, schema))
+    return rows
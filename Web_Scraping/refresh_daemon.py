@@ -0,0 +1,260 @@
+"""
+Long-running scheduler that keeps every registered scraper's output fresh.
+
+Each source in :data:`registry.SCRAPERS` has a ``ttl``: hourly for fast-moving
+release pages such as Windows 11, daily for slow ones such as the Java version
+history. A source is due once its last run is older than its ttl (failed runs
+are retried sooner), and due sources wait in a priority queue ordered by how
+long they have been due, so the stalest output is always refreshed first. At
+most ``--workers`` scrapers run at a time.
+
+Pages whose content has not changed since their CSV was written are detected
+by the HTTP cache and skipped without parsing or writing anything.
+
+The last run of every source (time, status, rows, duration, error and next
+due time) is kept in a JSON state file, which also lets a restarted daemon
+carry on where it stopped. ``--status`` prints it, and ``--status-port``
+serves it as JSON over HTTP while the daemon runs.
+
+Example Usage:
+    python refresh_daemon.py
+    python refresh_daemon.py --once
+    python refresh_daemon.py --workers 2 --status-port 8765
+    python refresh_daemon.py --status
+"""
+
+import argparse
+import heapq
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from driver_pool import DriverPool
+from registry import SCRAPERS, host_of
+from run_all import HERE, run_job
+
+DEFAULT_STATE = os.path.join(HERE, ".cache", "refresh_state.json")
+
+
+def load_state(path: str) -> dict:
+    """Returns the saved per-source state, or an empty dict if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _format_time(timestamp) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) if timestamp else "-"
+
+
+def print_status(state: dict):
+    """Prints one line per source with its last run and next due time."""
+    print(f"{'Source':<24}{'Status':<11}{'Rows':>6}{'Seconds':>9}  {'Last run':<19}  {'Next due':<19}  Error")
+    for name in sorted(set(SCRAPERS) | set(state)):
+        s = state.get(name, {})
+        print(f"{name:<24}{s.get('status', 'never'):<11}{s.get('rows', 0):>6}{s.get('seconds', 0):>9.2f}  "
+              f"{_format_time(s.get('last_run')):<19}  {_format_time(s.get('next_due')):<19}  {s.get('error', '')}")
+
+
+class RefreshDaemon:
+    """
+    Runs due scrapers from a staleness-ordered priority queue.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        Keys of :data:`registry.SCRAPERS` to keep fresh. Defaults to all of them.
+    workers : int
+        Maximum scrapers running at the same time.
+    per_host : int
+        Maximum concurrent scrapers per host.
+    browsers : int
+        Maximum Chrome sessions.
+    output_dir : str
+        Folder the CSV files are written to.
+    state_path : str
+        JSON file holding the last-run state.
+    retry_after : float
+        Seconds before a failed source is tried again (capped at its ttl).
+    """
+
+    def __init__(self, names=None, workers: int = 2, per_host: int = 2, browsers: int = 2,
+                 output_dir: str = HERE, state_path: str = DEFAULT_STATE, retry_after: float = 15 * 60):
+        self.names = list(names or SCRAPERS)
+        self.workers = workers
+        self.browsers = browsers
+        self.output_dir = output_dir
+        self.state_path = state_path
+        self.retry_after = retry_after
+        self.state = load_state(state_path)
+        self._host_limits = {}
+        for name in self.names:
+            self._host_limits.setdefault(host_of(SCRAPERS[name].url), threading.Semaphore(per_host))
+        self._queue = []  # (due time, name), earliest due = stalest first
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._running = 0
+        for name in self.names:
+            heapq.heappush(self._queue, (self.due_at(name), name))
+
+    def due_at(self, name: str) -> float:
+        """Returns when ``name`` next needs refreshing (0 if it never ran)."""
+        entry = self.state.get(name)
+        if not entry or not entry.get("last_run"):
+            return 0.0
+        ttl = SCRAPERS[name].ttl
+        if entry.get("status") == "failed":
+            ttl = min(ttl, self.retry_after)
+        return entry["last_run"] + ttl
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _refresh(self, name: str, pool: DriverPool):
+        started = time.time()
+        queued = False
+        try:
+            result = run_job(name, pool, self._host_limits[host_of(SCRAPERS[name].url)], self.output_dir)
+            with self._lock:
+                previous = self.state.get(name, {})
+                self.state[name] = {
+                    "last_run": started,
+                    "status": result["status"],
+                    "rows": result["rows"],
+                    "seconds": round(result["seconds"], 3),
+                    "error": result["error"],
+                    "runs": previous.get("runs", 0) + 1,
+                    "unchanged_runs": previous.get("unchanged_runs", 0) + (result["status"] == "unchanged"),
+                }
+                due = self.due_at(name)
+                self.state[name]["next_due"] = due
+                heapq.heappush(self._queue, (due, name))
+                queued = True
+                try:
+                    self._save_state()
+                except OSError as exc:
+                    # The state in memory is still right; the next save may succeed
+                    print(f"⚠️ Could not save the refresh state to '{self.state_path}': {exc}")
+            status = "❌" if result["status"] == "failed" else "✅"
+            print(f"{status} {name}: {result['status']}, {result['rows']} rows in {result['seconds']:.2f}s, "
+                  f"next run {_format_time(due)}")
+        except Exception as exc:
+            print(f"❌ {name}: refresh bookkeeping failed: {type(exc).__name__}: {exc}")
+            if not queued:
+                with self._lock:
+                    heapq.heappush(self._queue, (time.time() + self.retry_after, name))
+        finally:
+            # Always free the worker slot, or the daemon runs one short (and --once never returns)
+            with self._lock:
+                self._running -= 1
+            self._wake.set()
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the last-run state of every source."""
+        with self._lock:
+            return json.loads(json.dumps(self.state))
+
+    def stop(self):
+        """Asks :meth:`run` to stop dispatching and return once running jobs finish."""
+        self._stopping.set()
+        self._wake.set()
+
+    def run(self, once: bool = False):
+        """
+        Dispatches due sources until :meth:`stop` is called.
+
+        Parameters
+        ----------
+        once : bool
+            Return as soon as every source that was due has been refreshed,
+            instead of waiting for the next one.
+        """
+        with DriverPool(size=self.browsers) as pool, ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stopping.is_set():
+                self._wake.clear()
+                with self._lock:
+                    now = time.time()
+                    due, name = self._queue[0] if self._queue else (float("inf"), None)
+                    if once and self._running == 0 and due > now:
+                        break
+                    dispatch = due <= now and self._running < self.workers
+                    if dispatch:
+                        heapq.heappop(self._queue)
+                        self._running += 1
+                if dispatch:
+                    print(f"Refreshing {name} ({'never ran' if not due else f'due since {_format_time(due)}'})")
+                    executor.submit(self._refresh, name, pool)
+                else:
+                    # Sleep until the next source is due or a job finishes
+                    self._wake.wait(timeout=min(max(due - now, 0.1), 60))
+
+
+def _serve_status(daemon: RefreshDaemon, port: int) -> ThreadingHTTPServer:
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(daemon.snapshot(), indent=2).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving refresh state on http://127.0.0.1:{server.server_address[1]}/")
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Keep the scraped CSVs fresh according to each source's ttl.")
+    parser.add_argument("names", nargs="*",
+                        help=f"sources to refresh (default: all of {', '.join(sorted(SCRAPERS))})")
+    parser.add_argument("--workers", type=int, default=2, help="concurrent scrapers")
+    parser.add_argument("--per-host", type=int, default=2, help="concurrent scrapers per host")
+    parser.add_argument("--browsers", type=int, default=2, help="maximum Chrome sessions")
+    parser.add_argument("--output-dir", default=HERE, help="folder for the CSV files")
+    parser.add_argument("--state", default=DEFAULT_STATE, help="last-run state file")
+    parser.add_argument("--retry-after", type=float, default=15, help="minutes before retrying a failed source")
+    parser.add_argument("--once", action="store_true", help="refresh what is due, then exit")
+    parser.add_argument("--status", action="store_true", help="print the last-run state and exit")
+    parser.add_argument("--status-port", type=int, help="serve the last-run state as JSON on this port")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.names) - set(SCRAPERS))
+    if unknown:
+        parser.error(f"unknown scrapers: {', '.join(unknown)}")
+
+    if args.status:
+        print_status(load_state(args.state))
+        return 0
+
+    daemon = RefreshDaemon(args.names, args.workers, args.per_host, args.browsers,
+                           args.output_dir, args.state, args.retry_after * 60)
+    signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    server = _serve_status(daemon, args.status_port) if args.status_port is not None else None
+    try:
+        daemon.run(once=args.once)
+    finally:
+        if server is not None:
+            server.shutdown()
+    print_status(daemon.snapshot())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
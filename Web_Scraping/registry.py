@@ -0,0 +1,37 @@
+from collections import namedtuple
+
+from Oracle import scrape_oracle_linux
+from SUSE import scrape_suse_linux_enterprise
+from core import scrape_dotnet_core
+from dbf import scrape_dbf_news
+from dotnet import scrape_dotnet_download_data
+from engine import load_plans, site_scraper
+from health import scrape_windows11_release_info
+from java import scrape_java_version_history
+from microsoft import scrape_windows_server_release_info
+from throttle import host_of
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# ttl: how long a scraped CSV stays fresh before refresh_daemon.py runs it again
+Scraper = namedtuple("Scraper", ["func", "url", "output_csv", "ttl"], defaults=[DAY])
+
+# Hand-written entry points kept for the sites that had their own script
+WRAPPERS = {
+    "oracle_linux": scrape_oracle_linux,
+    "suse_linux_enterprise": scrape_suse_linux_enterprise,
+    "java": scrape_java_version_history,
+    "dotnet_core": scrape_dotnet_core,
+    "dotnet_downloads": scrape_dotnet_download_data,
+    "windows11": scrape_windows11_release_info,
+    "windows_server": scrape_windows_server_release_info,
+    "dbf_news": scrape_dbf_news,
+}
+
+# Every scraper the orchestrator knows about, keyed by a short name: one per
+# site in sites.toml, so a new site needs no code of its own.
+SCRAPERS = {
+    name: Scraper(WRAPPERS.get(name) or site_scraper(name), plan.url, plan.output, plan.ttl_hours * HOUR)
+    for name, plan in load_plans().items()
+}
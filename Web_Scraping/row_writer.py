@@ -0,0 +1,140 @@
+"""
+Streaming CSV output for the scrapers.
+
+Rows are written to a spool file beside the output as soon as they are
+produced, so nothing accumulates in memory. The column count is only known
+once every row has been seen; :meth:`StreamingCsvWriter.close` then writes the
+header and copies the spooled rows into the final file, padding short rows
+with empty cells, one row at a time. An output name ending in ``.parquet``
+produces a typed Parquet file instead (see :mod:`parquet_output`).
+"""
+
+import csv
+import os
+
+import metrics
+from incremental import write_incremental
+from parquet_output import spool_to_parquet
+
+
+class StreamingCsvWriter:
+    """
+    Writes scraped rows straight to disk and resolves the header at the end.
+
+    Use it as a context manager. If the block raises, the spool is discarded
+    and the existing output is left untouched; if no rows were written, no
+    output file is created.
+
+    Parameters
+    ----------
+    output_csv : str
+        The CSV file to produce, or a ``.parquet`` file for Parquet output.
+    columns : list of str, optional
+        Fixed column names. Rows are padded to this width.
+    leading : list of str
+        Names of the first columns when ``columns`` is not given. The
+        remaining columns are named ``<prefix>1``, ``<prefix>2``, ...
+    prefix : str
+        Prefix for the generated column names.
+    incremental : bool
+        Merge the result into the existing CSV with
+        :func:`incremental.write_incremental` instead of replacing it.
+    key_columns : tuple of int
+        Row identity columns for incremental mode.
+    """
+
+    def __init__(self, output_csv: str, columns=None, leading=("Source",), prefix: str = "Col_",
+                 incremental: bool = False, key_columns=()):
+        self.output_csv = output_csv
+        self.columns = list(columns) if columns is not None else None
+        self.leading = list(leading)
+        self.prefix = prefix
+        self.parquet = output_csv.lower().endswith(".parquet")
+        if self.parquet and incremental:
+            raise ValueError("Incremental mode only supports CSV output")
+        self.incremental = incremental
+        self.key_columns = key_columns
+        self.table_headers = {}
+        self.rows = 0
+        self.width = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.counts = None
+        self._spool_path = output_csv + ".spool"
+        self._spool = open(self._spool_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._spool)
+
+    def write(self, row):
+        """Appends one row to the spool."""
+        if self.columns is not None and len(row) > len(self.columns):
+            raise ValueError(f"{len(self.columns)} columns passed, row has {len(row)} cells")
+        self._writer.writerow(row)
+        self.rows += 1
+        self.width = max(self.width, len(row))
+
+    def set_table_header(self, source: str, header_row: list):
+        """Records the original header row of a table, kept as Parquet metadata."""
+        self.table_headers[source] = header_row
+
+    def header(self) -> list:
+        """Returns the column names for the rows written so far."""
+        if self.columns is not None:
+            return self.columns
+        width = max(self.width, len(self.leading))
+        return self.leading + [f"{self.prefix}{i}" for i in range(1, width - len(self.leading) + 1)]
+
+    def close(self):
+        """Writes the header and the padded rows to the output file."""
+        self._spool.close()
+        if not self.rows:
+            os.remove(self._spool_path)
+            return
+        with metrics.stage("write"):
+            self._write_output()
+        metrics.count("rows_written", self.written)
+        metrics.count("bytes_written", self.bytes_written)
+
+    def _write_output(self):
+        header = self.header()
+        if self.parquet:
+            target = self.output_csv + ".tmp"
+            spool_to_parquet(self._spool_path, target, header, {"table_headers": self.table_headers})
+            self.bytes_written = os.path.getsize(target)
+            os.remove(self._spool_path)
+            os.replace(target, self.output_csv)
+            self.written = self.rows
+            return
+
+        target = self.output_csv + ".new" if self.incremental else self.output_csv + ".tmp"
+        with open(self._spool_path, newline="", encoding="utf-8") as src, \
+                open(target, "w", newline="", encoding="utf-8") as dst:
+            # Same line endings as the pandas to_csv output of the original scrapers
+            writer = csv.writer(dst, lineterminator=os.linesep)
+            writer.writerow(header)
+            for row in csv.reader(src):
+                if len(row) < len(header):
+                    row += [""] * (len(header) - len(row))
+                writer.writerow(row)
+        self.bytes_written = os.path.getsize(target)
+        os.remove(self._spool_path)
+
+        if self.incremental:
+            self.counts = write_incremental(self.output_csv, target, self.key_columns)
+            self.written = sum(self.counts.values())
+        else:
+            os.replace(target, self.output_csv)
+            self.written = self.rows
+
+    def abort(self):
+        """Discards the spool without touching the output file."""
+        self._spool.close()
+        os.remove(self._spool_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
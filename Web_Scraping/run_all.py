@@ -0,0 +1,202 @@
+"""
+Runs the registered Web_Scraping scrapers concurrently from one command.
+
+Jobs run on a bounded thread pool, with at most ``--per-host`` jobs talking to
+the same host at once. Browser sessions come from a shared DriverPool and are
+only started for jobs that actually need Chrome. Each scraper writes its CSV
+as soon as it finishes, and a failure in one job does not stop the others.
+Pages that have not changed since their CSV was written are skipped.
+Requests are rate limited and retried per host by :mod:`throttle`.
+Per-stage timings and counters can be written with ``--metrics-jsonl`` and
+``--metrics-prom`` (see :mod:`metrics`).
+
+Example Usage:
+    python run_all.py
+    python run_all.py java windows11 --workers 2
+    python run_all.py --metrics-jsonl metrics.jsonl --metrics-prom scrapers.prom
+"""
+
+import argparse
+import inspect
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import http_cache
+import metrics
+import snapshots
+import throttle
+from driver_pool import DriverPool
+from registry import SCRAPERS, host_of
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_job(name: str, pool: DriverPool, host_limit: threading.Semaphore, output_dir: str,
+            incremental: bool = False, output_format: str = "csv") -> dict:
+    """
+    Runs one registered scraper and reports its outcome instead of raising.
+
+    Parameters
+    ----------
+    name : str
+        Key of :data:`registry.SCRAPERS`.
+    pool : DriverPool
+        Pool the job borrows a browser from, only if it needs one.
+    host_limit : threading.Semaphore
+        Held while the job runs, to cap concurrent jobs per host.
+    output_dir : str
+        Folder the output file is written to.
+    incremental : bool
+        Use incremental mode if the scraper supports it.
+    output_format : str
+        ``"csv"`` or ``"parquet"``.
+
+    Returns
+    -------
+    dict
+        ``name``, ``status`` (``"ok"``, ``"unchanged"`` or ``"failed"``),
+        ``rows``, ``seconds`` and ``error``.
+    """
+    scraper = SCRAPERS[name]
+    output_csv = os.path.join(output_dir, scraper.output_csv)
+    if output_format == "parquet":
+        output_csv = os.path.splitext(output_csv)[0] + ".parquet"
+    kwargs = {}
+    if incremental and "incremental" in inspect.signature(scraper.func).parameters:
+        kwargs["incremental"] = True
+    with host_limit:
+        start = time.monotonic()
+        try:
+            with metrics.labels(scraper=name), metrics.stage("scrape"), pool.lazy_driver() as driver:
+                rows = scraper.func(scraper.url, output_csv, driver=driver, **kwargs)
+        except Exception as exc:
+            return {"name": name, "status": "failed", "rows": 0,
+                    "seconds": time.monotonic() - start, "error": f"{type(exc).__name__}: {exc}"}
+    return {"name": name, "status": "ok" if rows is not None else "unchanged", "rows": rows or 0,
+            "seconds": time.monotonic() - start, "error": ""}
+
+
+def run_scrapers(names=None, workers: int = 4, per_host: int = 2,
+                 browsers: int = 2, output_dir: str = HERE, incremental: bool = False,
+                 output_format: str = "csv") -> list:
+    """
+    Runs the selected scrapers concurrently and collects their outcomes.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        Keys of :data:`registry.SCRAPERS` to run. Defaults to all of them.
+    workers : int
+        Maximum number of scrapers running at the same time.
+    per_host : int
+        Maximum number of concurrent scrapers per host.
+    browsers : int
+        Maximum number of Chrome sessions in the shared pool.
+    output_dir : str
+        Folder the CSV files are written to.
+    incremental : bool
+        Run scrapers that support it in incremental (delta-only) mode.
+    output_format : str
+        ``"csv"`` or ``"parquet"`` (typed columns, requires pyarrow).
+
+    Returns
+    -------
+    list of dict
+        One entry per scraper, in completion order, with ``name``, ``status``
+        (``"ok"``, ``"unchanged"`` or ``"failed"``), ``rows``, ``seconds`` and
+        ``error``.
+    """
+    # Round-robin over hosts so the workers spread across as many hosts as possible
+    names = throttle.interleave_by_host(names or SCRAPERS, lambda name: SCRAPERS[name].url)
+    host_limits = {}
+    for name in names:
+        host_limits.setdefault(host_of(SCRAPERS[name].url), threading.Semaphore(per_host))
+
+    results = []
+    with DriverPool(size=browsers) as pool, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_job, name, pool, host_limits[host_of(SCRAPERS[name].url)],
+                            output_dir, incremental, output_format)
+            for name in names
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            status = "❌" if result["status"] == "failed" else "✅"
+            print(f"{status} {result['name']} finished in {result['seconds']:.2f}s")
+            results.append(result)
+    return results
+
+
+def print_summary(results: list):
+    """Prints one line per scraper with its status, row count and timing."""
+    print(f"\n{'Scraper':<24}{'Status':<8}{'Rows':>8}{'Seconds':>10}  Error")
+    for r in sorted(results, key=lambda r: r["name"]):
+        print(f"{r['name']:<24}{r['status']:<8}{r['rows']:>8}{r['seconds']:>10.2f}  {r['error']}")
+    failed = sum(r["status"] == "failed" for r in results)
+    unchanged = sum(r["status"] == "unchanged" for r in results)
+    print(f"\n{len(results) - failed - unchanged} updated, {unchanged} unchanged, {failed} failed.")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Web_Scraping scrapers concurrently.")
+    parser.add_argument("names", nargs="*",
+                        help=f"scrapers to run (default: all of {', '.join(sorted(SCRAPERS))})")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent scrapers")
+    parser.add_argument("--per-host", type=int, default=2, help="concurrent scrapers per host")
+    parser.add_argument("--browsers", type=int, default=2, help="maximum Chrome sessions")
+    parser.add_argument("--output-dir", default=HERE, help="folder for the CSV files")
+    parser.add_argument("--incremental", action="store_true",
+                        help="write only new, changed or removed rows where supported")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="output file format")
+    parser.add_argument("--rate", type=float, default=2, help="requests per second per host")
+    parser.add_argument("--host-rate", action="append", default=[], metavar="HOST=RATE",
+                        help="requests per second for one host (repeatable)")
+    parser.add_argument("--max-attempts", type=int, default=4, help="attempts per request, including retries")
+    parser.add_argument("--metrics-jsonl", help="append stage timings and counters to this JSON lines file")
+    parser.add_argument("--metrics-prom", help="write aggregated metrics to this Prometheus text file")
+    parser.add_argument("--cache-dir", default=http_cache.DEFAULT_DIR, help="HTTP cache folder")
+    parser.add_argument("--cache-max-mb", type=float, default=200, help="HTTP cache size limit")
+    parser.add_argument("--cache-max-age-days", type=float, default=30, help="HTTP cache entry age limit")
+    parser.add_argument("--archive-dir", default=snapshots.DEFAULT_DIR, help="page snapshot archive folder")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.names) - set(SCRAPERS))
+    if unknown:
+        parser.error(f"unknown scrapers: {', '.join(unknown)}")
+    if args.incremental and args.format != "csv":
+        parser.error("--incremental only supports --format csv")
+    host_rates = {}
+    for item in args.host_rate:
+        host, _, rate = item.partition("=")
+        try:
+            host_rates[host] = float(rate)
+        except ValueError:
+            parser.error(f"--host-rate expects HOST=RATE, got '{item}'")
+    if not all(rate > 0 for rate in (args.rate, *host_rates.values())):
+        parser.error("request rates must be positive")
+    throttle.configure(rate=args.rate, host_rates=host_rates, max_attempts=args.max_attempts)
+    http_cache.configure(args.cache_dir, int(args.cache_max_mb * 1024 * 1024),
+                         args.cache_max_age_days * 24 * 3600)
+    snapshots.configure(args.archive_dir)
+
+    sinks = []
+    if args.metrics_jsonl:
+        sinks.append(metrics.JsonLinesSink(args.metrics_jsonl))
+    if args.metrics_prom:
+        sinks.append(metrics.PrometheusSink(args.metrics_prom))
+    if sinks:
+        metrics.set_sink(metrics.MultiSink(*sinks))
+    try:
+        results = run_scrapers(args.names, args.workers, args.per_host, args.browsers,
+                               args.output_dir, args.incremental, args.format)
+    finally:
+        if sinks:
+            metrics.set_sink(None).close()
+    print_summary(results)
+    return 1 if any(r["status"] == "failed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
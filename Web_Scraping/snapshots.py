@@ -0,0 +1,297 @@
+"""
+Content-addressed archive of every page the scrapers fetch.
+
+Each page body is compressed with zlib and appended once to a pack file,
+keyed by the SHA-256 of its HTML; an SQLite index maps ``(url, backend,
+fetched_at)`` to those hashes. A page that has not changed since its last
+snapshot is not stored again. Reads go through a memory map of the pack, so
+re-parsing thousands of snapshots costs no per-file opens or copies.
+
+The ``archive`` backend of :func:`page_loader.load_page` parses the newest
+snapshot instead of fetching the page, which lets any scraper rebuild its CSV
+without a browser or network:
+
+Example Usage:
+    python snapshots.py list
+    python snapshots.py reparse java oracle_linux --output-dir rebuilt
+    python snapshots.py reparse windows11 --as-of 2025-01-31T00:00:00
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES blobs (sha256)
+);
+CREATE INDEX IF NOT EXISTS snapshots_url_time ON snapshots (url, fetched_at);
+"""
+
+
+class SnapshotArchive:
+    """
+    An append-only, deduplicated store of compressed page snapshots.
+
+    Safe to share between threads, and between processes writing to the same
+    directory: appends to the pack happen inside an exclusive SQLite transaction.
+
+    Parameters
+    ----------
+    directory : str
+        Folder holding ``pack.bin`` and ``index.sqlite``.
+    as_of : float, optional
+        Only snapshots taken at or before this Unix time are returned by
+        :meth:`history`, for rebuilding outputs as they were at that moment.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, as_of: float = None):
+        self.directory = directory
+        self.as_of = as_of
+        os.makedirs(directory, exist_ok=True)
+        self._pack_path = os.path.join(directory, "pack.bin")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite"),
+                                   check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.executescript(SCHEMA)
+        self._pack = open(self._pack_path, "a+b")
+        self._map = None
+
+    def add(self, url: str, html: str, backend: str = "static") -> str:
+        """
+        Archives one fetched page.
+
+        Parameters
+        ----------
+        url : str
+            The page URL.
+        html : str
+            The page body (raw response or rendered DOM).
+        backend : str
+            How the page was obtained, ``"static"`` or ``"browser"``.
+
+        Returns
+        -------
+        str
+            The SHA-256 the body is stored under.
+        """
+        data = html.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                latest = self._db.execute(
+                    "SELECT sha256 FROM snapshots WHERE url = ? AND backend = ? "
+                    "ORDER BY fetched_at DESC LIMIT 1", (url, backend)).fetchone()
+                if latest and latest[0] == sha:
+                    self._db.execute("COMMIT")
+                    return sha  # unchanged since the last snapshot
+                if self._db.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha,)).fetchone() is None:
+                    compressed = zlib.compress(data, 6)
+                    self._pack.seek(0, os.SEEK_END)
+                    offset = self._pack.tell()
+                    self._pack.write(compressed)
+                    self._pack.flush()
+                    os.fsync(self._pack.fileno())
+                    self._db.execute("INSERT INTO blobs VALUES (?, ?, ?, ?)",
+                                     (sha, offset, len(compressed), len(data)))
+                self._db.execute("INSERT INTO snapshots (url, backend, fetched_at, sha256) VALUES (?, ?, ?, ?)",
+                                 (url, backend, time.time(), sha))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return sha
+
+    def _view(self, end: int):
+        # Map the pack again only when it has grown past the current mapping
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._pack.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def read(self, sha: str) -> str:
+        """
+        Returns the HTML stored under a content hash.
+
+        Raises
+        ------
+        KeyError
+            If no blob has that hash.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT offset, length FROM blobs WHERE sha256 = ?", (sha,)).fetchone()
+            if row is None:
+                raise KeyError(sha)
+            offset, length = row
+            compressed = self._view(offset + length)[offset:offset + length]
+        return zlib.decompress(compressed).decode("utf-8")
+
+    def history(self, url: str) -> list:
+        """
+        Lists the snapshots of a URL, newest first.
+
+        Returns
+        -------
+        list of tuple
+            ``(fetched_at, backend, sha256)`` per snapshot, limited to
+            :attr:`as_of` when it is set.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT fetched_at, backend, sha256 FROM snapshots WHERE url = ? AND fetched_at <= ? "
+                "ORDER BY fetched_at DESC", (url, self.as_of or float("inf"))).fetchall()
+
+    def iter_snapshots(self, url: str = None):
+        """
+        Yields ``(url, fetched_at, backend, html)`` for every snapshot.
+
+        Snapshots are visited in pack order, so a bulk pass over the archive
+        reads the memory-mapped pack front to back.
+
+        Parameters
+        ----------
+        url : str, optional
+            Restrict the pass to one URL.
+        """
+        query = ("SELECT s.url, s.fetched_at, s.backend, s.sha256 FROM snapshots s "
+                 "JOIN blobs b ON b.sha256 = s.sha256")
+        params = ()
+        if url is not None:
+            query += " WHERE s.url = ?"
+            params = (url,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY b.offset, s.fetched_at", params).fetchall()
+        for snapshot_url, fetched_at, backend, sha in rows:
+            yield snapshot_url, fetched_at, backend, self.read(sha)
+
+    def urls(self) -> list:
+        """Returns ``(url, snapshot count, last fetched_at)`` for every archived URL."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT url, COUNT(*), MAX(fetched_at) FROM snapshots GROUP BY url ORDER BY url").fetchall()
+
+    def close(self):
+        """Closes the pack and the index."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+            self._pack.close()
+            self._db.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> SnapshotArchive:
+    """Returns the shared archive, opening the default one on first use."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = SnapshotArchive()
+        return _archive
+
+
+def configure(directory: str = DEFAULT_DIR, as_of: float = None) -> SnapshotArchive:
+    """
+    Replaces the shared archive with one at ``directory``.
+
+    Returns
+    -------
+    SnapshotArchive
+        The new shared archive.
+    """
+    global _archive
+    with _archive_lock:
+        if _archive is not None:
+            _archive.close()
+        _archive = SnapshotArchive(directory, as_of)
+        return _archive
+
+
+def reparse(names, output_dir: str) -> dict:
+    """
+    Rebuilds scraper outputs from archived snapshots only.
+
+    Parameters
+    ----------
+    names : list of str
+        Keys of :data:`registry.SCRAPERS` to rebuild.
+    output_dir : str
+        Folder the rebuilt CSV files are written to.
+
+    Returns
+    -------
+    dict
+        Rows written per scraper, or the error message if it failed.
+    """
+    from registry import SCRAPERS
+
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+    for name in names:
+        scraper = SCRAPERS[name]
+        try:
+            results[name] = scraper.func(scraper.url, os.path.join(output_dir, scraper.output_csv),
+                                         backend="archive")
+        except Exception as exc:
+            print(f"❌ {name}: {type(exc).__name__}: {exc}")
+            results[name] = f"{type(exc).__name__}: {exc}"
+    return results
+
+
+def main(argv=None) -> int:
+    from registry import SCRAPERS
+
+    parser = argparse.ArgumentParser(description="Inspect the page archive or rebuild CSVs from it.")
+    parser.add_argument("command", choices=["list", "reparse"])
+    parser.add_argument("names", nargs="*",
+                        help=f"reparse: scrapers to rebuild (default: all of {', '.join(sorted(SCRAPERS))})")
+    parser.add_argument("--archive-dir", default=DEFAULT_DIR, help="archive folder")
+    parser.add_argument("--as-of", help="reparse: use the snapshots as they were at this ISO time")
+    parser.add_argument("--output-dir", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="reparse: folder for the rebuilt files")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.names) - set(SCRAPERS))
+    if unknown:
+        parser.error(f"unknown scrapers: {', '.join(unknown)}")
+    as_of = None
+    if args.as_of:
+        try:
+            as_of = time.mktime(time.strptime(args.as_of, "%Y-%m-%dT%H:%M:%S"))
+        except ValueError:
+            parser.error("--as-of must look like 2025-01-31T00:00:00")
+    archive = configure(args.archive_dir, as_of)
+
+    if args.command == "list":
+        print(f"{'Snapshots':>9}  {'Last fetched':<19}  URL")
+        for url, n, last in archive.urls():
+            print(f"{n:>9}  {time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(last))}  {url}")
+        return 0
+
+    results = reparse(args.names or list(SCRAPERS), args.output_dir)
+    return 1 if any(isinstance(r, str) for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Browser-free fetch-and-parse backend for server-rendered pages.
+
+:func:`parse_html` reads raw HTML with lxml and returns the same structure as
+:func:`extract.extract_page`, so a scraper can switch between Chrome and a
+plain HTTP request without changing its row logic. Text is flattened the way
+a browser's ``innerText`` would: scripts and styles are dropped, ``<br>`` and
+block elements start new lines, and other whitespace collapses to one space.
+"""
+
+import re
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+
+USER_AGENT = "Mozilla/5.0 (compatible; ApexaiQ-Web-Scraping/1.0)"
+
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "caption", "dd", "div", "dl",
+    "dt", "figcaption", "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tbody", "tfoot", "thead", "tr", "ul",
+}
+SKIP_TAGS = {"head", "noscript", "script", "style", "template", "title"}
+
+_WHITESPACE = re.compile(r"\s+")
+_SPACES = re.compile(r" {2,}")
+_HIDDEN = re.compile(r"display\s*:\s*none")
+
+_session = None
+
+
+def get_session() -> requests.Session:
+    """Returns the module's shared keep-alive HTTP session."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers["User-Agent"] = USER_AGENT
+    return _session
+
+
+def fetch_html(url: str, timeout: float = 15) -> str:
+    """
+    Downloads a page over plain HTTP.
+
+    Parameters
+    ----------
+    url : str
+        The page to fetch.
+    timeout : float
+        Seconds to wait for the server before giving up.
+
+    Returns
+    -------
+    str
+        The decoded HTML body.
+    """
+    response = get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    if response.encoding is None or "charset" not in response.headers.get("Content-Type", ""):
+        response.encoding = response.apparent_encoding
+    return response.text
+
+
+def _is_rendered(element) -> bool:
+    if not isinstance(element.tag, str) or element.tag in SKIP_TAGS:
+        return False
+    if element.get("hidden") is not None:
+        return False
+    return not _HIDDEN.search(element.get("style", ""))
+
+
+def _collect(element, parts):
+    if element.text:
+        parts.append(_WHITESPACE.sub(" ", element.text))
+    for child in element:
+        if _is_rendered(child):
+            if child.tag == "br":
+                parts.append("\n")
+            else:
+                block = child.tag in BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                _collect(child, parts)
+                if block:
+                    parts.append("\n")
+        if child.tail:
+            parts.append(_WHITESPACE.sub(" ", child.tail))
+
+
+def inner_text(element) -> str:
+    """
+    Approximates the browser's ``innerText`` for an lxml element.
+
+    Parameters
+    ----------
+    element : lxml.html.HtmlElement
+        The element to flatten.
+
+    Returns
+    -------
+    str
+        Visible text, one line per block, with surrounding whitespace stripped.
+    """
+    if not _is_rendered(element):
+        return ""
+    parts = []
+    _collect(element, parts)
+    lines = (_SPACES.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _cell(element) -> str:
+    return inner_text(element).replace("\n", " ")
+
+
+def parse_html(html: str, base_url: str = "") -> dict:
+    """
+    Parses a page into the structure returned by :func:`extract.extract_page`.
+
+    Parameters
+    ----------
+    html : str
+        Raw HTML of the page.
+    base_url : str
+        URL the page was fetched from, used to resolve relative links.
+
+    Returns
+    -------
+    dict
+        ``tables``, ``infobox`` and ``list_items`` exactly as documented in
+        :func:`extract.extract_page`.
+    """
+    try:
+        doc = lxml.html.fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        doc = lxml.html.fromstring(html.encode("utf-8"))
+
+    tables = []
+    infobox = None
+    for index, table in enumerate(doc.iter("table"), start=1):
+        classes = table.get("class", "")
+        first_tr = next(table.iter("tr"), None)
+        tables.append({
+            "index": index,
+            "classes": classes,
+            "headers": [inner_text(th) for th in table.iter("th")],
+            "header_row": [_cell(c) for c in first_tr.iter("th", "td")] if first_tr is not None else [],
+            "rows": [[_cell(td) for td in tr.iter("td")] for tr in table.iter("tr")],
+        })
+        if infobox is None and "infobox" in classes.split():
+            infobox = []
+            for tr in table.iter("tr"):
+                th = next(tr.iter("th"), None)
+                td = next(tr.iter("td"), None)
+                if th is not None and td is not None:
+                    infobox.append([inner_text(th), _cell(td)])
+
+    list_items = []
+    ul = next(doc.iter("ul"), None)
+    if ul is not None:
+        for li in ul.iter("li"):
+            a = next(li.iter("a"), None)
+            href = link_text = None
+            if a is not None:
+                href = urljoin(base_url, a.get("href")) if a.get("href") is not None else ""
+                link_text = inner_text(a)
+            list_items.append({"text": inner_text(li), "href": href, "link_text": link_text})
+
+    return {"tables": tables, "infobox": infobox or [], "list_items": list_items}
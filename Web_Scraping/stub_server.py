@@ -0,0 +1,128 @@
+"""
+Local HTTP server that fails on purpose, for exercising :mod:`throttle`.
+
+Every path returns a small HTML page with a table, except that requests fail
+according to a script of status codes: ``--script 429,503,200`` answers the
+first request to each path with 429 (with ``Retry-After``), the second with
+503 and every later one with 200. ``--fail-rate`` adds random 500/502/503
+responses on top. The server also counts requests per path and reports the
+highest request rate it saw in any one second, to check rate limits.
+
+Example Usage:
+    python stub_server.py --port 8000 --script 429,503,200
+    python stub_server.py --port 8000 --fail-rate 0.3
+"""
+
+import argparse
+import contextlib
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE = (b"<html><body><table><tr><th>Version</th><th>Date</th></tr>"
+        b"<tr><td>1.0</td><td>2024-01-01</td></tr></table></body></html>")
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    The server with its failure settings and request statistics.
+
+    Parameters
+    ----------
+    address : tuple
+        ``(host, port)``; port 0 picks a free port.
+    script : list of int
+        Status codes for the first requests to each path; 200 afterwards.
+    fail_rate : float
+        Probability of a random 5xx response once the script is used up.
+    retry_after : float
+        Value of the ``Retry-After`` header sent with 429 responses.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), script=(), fail_rate: float = 0.0, retry_after: float = 1):
+        super().__init__(address, _Handler)
+        self.script = list(script)
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.per_second = defaultdict(int)
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def next_status(self, path: str) -> int:
+        with self.lock:
+            n = self.requests[path]
+            self.requests[path] += 1
+            self.per_second[int(time.time())] += 1
+        if n < len(self.script):
+            return self.script[n]
+        if random.random() < self.fail_rate:
+            return random.choice((500, 502, 503))
+        return 200
+
+    def peak_rate(self) -> int:
+        """Returns the most requests received within one wall-clock second."""
+        with self.lock:
+            return max(self.per_second.values(), default=0)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status = self.server.next_status(self.path)
+        with self.server.lock:
+            self.server.statuses[status] += 1
+        body = PAGE if status == 200 else f"status {status}".encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", str(self.server.retry_after))
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def running(script=(), fail_rate: float = 0.0, retry_after: float = 1):
+    """Runs a :class:`StubServer` on a free port for the duration of the block."""
+    server = StubServer(script=script, fail_rate=fail_rate, retry_after=retry_after)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve pages that fail on purpose.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--script", default="", help="comma-separated status codes for the first requests")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="probability of a random 5xx")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After seconds for 429")
+    args = parser.parse_args(argv)
+    script = [int(code) for code in args.script.split(",") if code]
+    server = StubServer(("127.0.0.1", args.port), script, args.fail_rate, args.retry_after)
+    print(f"Serving on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Statuses sent: {dict(server.statuses)}, peak {server.peak_rate()} requests/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import math
+import os
+import sys
+
+import pytest
+
+# The scrapers are flat scripts that import each other by module name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+import http_cache
+import snapshots
+import throttle
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture
+def isolated(tmp_path):
+    # Keep fetched fixtures out of the real cache and archive, and do not throttle the local host
+    http_cache.configure(str(tmp_path / "http"))
+    snapshots.configure(str(tmp_path / "archive"))
+    throttle.configure(rate=math.inf)
+    yield
+    http_cache.get_cache().close()
+    snapshots.get_archive().close()
+    http_cache._cache = snapshots._archive = throttle._scheduler = None
+
+
+@pytest.fixture
+def site():
+    """Base URL of a local server for the committed fixture pages."""
+    with benchmark.serve_fixtures(FIXTURES) as base_url:
+        yield base_url
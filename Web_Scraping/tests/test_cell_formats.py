@@ -0,0 +1,42 @@
+import pytest
+
+from cell_formats import DATE, VERSION_CELL, parse_date, version_number
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2024-10-01", "2024-10-01"),
+    ("01.10.2024", "2024-10-01"),
+    ("1 October 2024", "2024-10-01"),
+    ("October 1, 2024", "2024-10-01"),
+    ("October 2024", "2024-10-31"),
+    ("September 2028 for Oracle[4]", "2028-09-30"),
+    ("2024-02-30", None),
+    ("End of servicing", None),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+def test_whole_cell_dates_are_the_layouts_parse_date_reads():
+    for cell in ("2024-10-01", "01.10.2024", "1 October 2024", "October 1, 2024", "Oct 2024"):
+        assert DATE.match(cell) and parse_date(cell)
+    for cell in ("Version 2024", "2025-09 B", "26100.6725"):
+        assert not DATE.match(cell)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Java SE 17", "17"),
+    ("J2SE 1.2", "1.2"),
+    ("JDK 1.1", "1.1"),
+    ("v2.1", "2.1"),
+    ("8.0.100-preview.1", "8.0.100"),
+    ("Legend", None),
+])
+def test_version_number(text, expected):
+    assert version_number(text) == expected
+
+
+def test_version_cells():
+    assert VERSION_CELL.match("J2SE 5.0 (1.5)")
+    assert VERSION_CELL.match("15.6")
+    assert not VERSION_CELL.match("2025")
@@ -0,0 +1,87 @@
+import queue
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import driver_pool
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_waiter_is_woken_when_a_worn_out_session_is_discarded():
+    pool = DriverPool(size=1, max_uses=1, factory=FakeDriver)
+    first = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.1)
+    pool.release(first)  # worn out after one use: quit, not returned to the pool
+    waiter.join(5)
+    assert first.quit_called
+    assert len(got) == 1 and got[0] is not first
+
+
+def test_idle_session_is_reused_and_timeout_raises_empty():
+    pool = DriverPool(size=1, max_uses=5, factory=FakeDriver)
+    first = pool.acquire()
+    with pytest.raises(queue.Empty):
+        pool.acquire(timeout=0.05)
+    pool.release(first)
+    assert pool.acquire(timeout=0.05) is first
+
+
+def test_close_wakes_waiters_and_refuses_acquisitions():
+    pool = DriverPool(size=1, factory=FakeDriver)
+    pool.acquire()
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.1)
+    pool.close()
+    waiter.join(5)
+    assert len(errors) == 1
+
+
+class BrokenCdpDriver(FakeDriver):
+    started = []
+
+    def __init__(self, service=None, options=None):
+        super().__init__()
+        BrokenCdpDriver.started.append(self)
+
+    def execute_cdp_cmd(self, command, params):
+        raise WebDriverException("CDP is not available")
+
+
+def test_browser_is_quit_when_setup_fails_after_launch(monkeypatch):
+    monkeypatch.setattr(driver_pool, "driver_path", lambda refresh=False: "chromedriver")
+    monkeypatch.setattr(driver_pool, "Service", lambda path: path)
+    monkeypatch.setattr(driver_pool.webdriver, "Chrome", BrokenCdpDriver)
+    with pytest.raises(WebDriverException, match="CDP is not available"):
+        driver_pool.new_driver()
+    assert len(BrokenCdpDriver.started) == 1 and BrokenCdpDriver.started[0].quit_called
@@ -0,0 +1,144 @@
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import engine
+from engine import compile_plan
+from static_html import parse_html
+
+import Oracle
+import SUSE
+import core
+import dbf
+import dotnet
+import health
+import java
+import microsoft
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SPEC = """
+[releases]
+url = "{site}releases.html"
+output = "releases.csv"
+backend = "static"
+infobox = true
+require_headers = true
+skip_classes = ["infobox"]
+leading = ["Source", "Key"]
+
+[release_table]
+url = "{site}releases.html"
+output = "release_table.csv"
+backend = "static"
+mode = "version_table"
+table_class = "wikitable"
+
+[news]
+url = "{site}news.html"
+output = "news.csv"
+backend = "static"
+mode = "news_list"
+version_pattern = 'v\\d+\\.\\d+(\\.\\d+)?'
+date_pattern = '(\\d{{2}}\\.\\d{{2}}\\.\\d{{4}})'
+date_format = "%d.%m.%Y"
+"""
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"url": "u", "output": "o", "colour": "red"}, "unknown keys colour"),
+    ({"url": "u"}, "missing output"),
+    ({"url": "u", "output": "o", "mode": "rows"}, "unknown mode 'rows'"),
+    ({"url": "u", "output": "o", "backend": "archive"}, "backend must be"),
+    ({"url": "u", "output": "o", "mode": "version_table"}, "needs table_class"),
+    ({"url": "u", "output": "o", "mode": "news_list", "version_pattern": "v("}, "invalid pattern"),
+])
+def test_invalid_specs_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        compile_plan("site", spec)
+
+
+def test_defaults_are_resolved():
+    plan = compile_plan("site", {"url": "u", "output": "o", "mode": "news_list", "date_pattern": r"(\d+)"})
+    assert plan.backend == "browser" and plan.ttl_hours == 24 and plan.content == "list_items"
+    assert plan.leading == ("Source",) and plan.skip_classes == frozenset()
+    assert plan.date_pattern.pattern == r"(\d+)" and plan.version_pattern is None
+
+
+@pytest.mark.parametrize("scraper, name", [
+    (Oracle.scrape_oracle_linux, "oracle_linux"),
+    (SUSE.scrape_suse_linux_enterprise, "suse_linux_enterprise"),
+    (java.scrape_java_version_history, "java"),
+    (core.scrape_dotnet_core, "dotnet_core"),
+    (dotnet.scrape_dotnet_download_data, "dotnet_downloads"),
+    (health.scrape_windows11_release_info, "windows11"),
+    (microsoft.scrape_windows_server_release_info, "windows_server"),
+    (dbf.scrape_dbf_news, "dbf_news"),
+])
+def test_wrappers_use_the_backend_of_the_spec(scraper, name, monkeypatch):
+    backends = []
+    monkeypatch.setattr(engine, "load_page", lambda url, backend, *args, **kwargs: backends.append(backend))
+    assert scraper("http://example.test/", "out.csv") is None
+    assert backends == [engine.get_plan(name).backend]
+
+
+# The row logic of the original Selenium scrapers, applied to the same extracted page
+
+
+def _legacy_infobox_and_tables(page):
+    all_rows = [["infobox", key, value] for key, value in page["infobox"]]
+    for table in page["tables"]:
+        if "infobox" in table["classes"] or not table["headers"]:
+            continue
+        for row in table["rows"][1:]:
+            if row:
+                all_rows.append([f"table_{table['index']}"] + row)
+    max_len = max(len(r) for r in all_rows)
+    for r in all_rows:
+        r += [""] * (max_len - len(r))
+    return pd.DataFrame(all_rows, columns=["Source", "Key"] + [f"Col_{i}" for i in range(1, max_len - 1)])
+
+
+def _legacy_version_table(page):
+    table = next(t for t in page["tables"] if "wikitable" in t["classes"])
+    rows = [row for row in table["rows"][1:] if row]
+    return pd.DataFrame(rows, columns=table["headers"][:len(rows[0])])
+
+
+def _legacy_news(page):
+    all_rows = []
+    for item in page["list_items"]:
+        try:
+            if item["href"] is None:
+                raise LookupError("no link")
+            version_match = re.search(r"v\d+\.\d+(\.\d+)?", item["link_text"])
+            version = version_match.group(0) if version_match else item["link_text"]
+            date_match = re.match(r"(\d{2}\.\d{2}\.\d{4})", item["text"])
+            formatted_date = (datetime.strptime(date_match.group(1), "%d.%m.%Y").strftime("%Y-%m-%d")
+                              if date_match else "")
+            all_rows.append([version, formatted_date, item["href"]])
+        except Exception:
+            continue
+    return pd.DataFrame(all_rows, columns=["Version", "Date", "URL"])
+
+
+@pytest.mark.usefixtures("isolated")
+@pytest.mark.parametrize("name, fixture, legacy, count", [
+    ("releases", "releases.html", _legacy_infobox_and_tables, 5),
+    ("release_table", "releases.html", _legacy_version_table, 3),
+    ("news", "news.html", _legacy_news, 3),
+])
+def test_output_matches_the_original_scrapers(name, fixture, legacy, count, site, tmp_path):
+    spec_path = tmp_path / "sites.toml"
+    spec_path.write_text(SPEC.format(site=site), encoding="utf-8")
+    output = tmp_path / f"{name}.csv"
+    assert engine.run_site(name, output_csv=str(output), spec_path=str(spec_path)) == count
+
+    url = site + fixture
+    with open(os.path.join(FIXTURES, fixture), encoding="utf-8") as f:
+        page = parse_html(f.read(), url)
+    expected = tmp_path / "expected.csv"
+    legacy(page).to_csv(expected, index=False, encoding="utf-8")
+    assert output.read_bytes() == expected.read_bytes()
@@ -0,0 +1,58 @@
+import os
+
+from http_cache import HttpCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AssertionError(f"unexpected status {self.status_code}")
+
+
+class FakeSession:
+    """Answers 304 to any conditional request, else the page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if headers:
+            return FakeResponse(304)
+        return FakeResponse(200, self.page, {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"})
+
+
+def test_revalidated_page_is_served_from_cache(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    session = FakeSession("<p>page</p>")
+    cache.fetch(session, "http://example.test/")
+    body, _ = cache.fetch(session, "http://example.test/")
+    assert body == "<p>page</p>"
+    assert cache.hits == 1
+    assert session.requests[1] == {"If-None-Match": '"v1"'}
+
+
+def test_304_for_a_vanished_body_refetches_without_validators(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    session = FakeSession("<p>page</p>")
+    cache.fetch(session, "http://example.test/")
+    real_lookup = cache._lookup
+
+    def lookup_then_evict(url):
+        cache._lookup = real_lookup
+        entry = real_lookup(url)
+        os.remove(cache._body_path(url))  # evicted between the lookup and the 304
+        return entry
+
+    cache._lookup = lookup_then_evict
+    body, _ = cache.fetch(session, "http://example.test/")
+    assert body == "<p>page</p>"
+    assert session.requests[-1] == {}
+    assert cache.fetch(session, "http://example.test/")[0] == "<p>page</p>"
@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+
+from incremental import write_incremental
+
+HEADER = ["Source", "Key", "Col_1"]
+
+
+def _write(path, rows, header=HEADER):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([header] + rows)
+    return str(path)
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def _update(tmp_path, rows, key_columns=(0, 1)):
+    output = tmp_path / "builds.csv"
+    counts = write_incremental(str(output), _write(tmp_path / "builds.csv.new", rows), key_columns)
+    return counts, _read(output), _read(tmp_path / "builds.delta.csv")
+
+
+OLD = [["t1", "24H2", "26100.1"], ["t1", "23H2", "22631.1"]]
+
+
+def test_first_run_adds_every_row(tmp_path):
+    counts, output, delta = _update(tmp_path, OLD)
+    assert counts == {"added": 2, "changed": 0, "removed": 0}
+    assert output == [HEADER] + OLD
+    assert delta == [["Change"] + HEADER] + [["added"] + row for row in OLD]
+    assert not (tmp_path / "builds.csv.new").exists()
+
+
+def test_added_changed_and_removed_rows_are_told_apart(tmp_path):
+    _update(tmp_path, OLD + [["t1", "22H2", "22621.1"]])
+    fresh = [["t1", "24H2", "26100.2"], ["t1", "23H2", "22631.1"], ["t2", "25H2", "26200.1"]]
+    counts, output, delta = _update(tmp_path, fresh)
+    assert counts == {"added": 1, "changed": 1, "removed": 1}
+    assert output == [HEADER] + fresh
+    assert delta[1:] == [["changed", "t1", "24H2", "26100.2"], ["added", "t2", "25H2", "26200.1"],
+                         ["removed", "t1", "22H2", "22621.1"]]
+
+
+def test_rows_added_at_the_end_are_appended(tmp_path):
+    _update(tmp_path, OLD)
+    inode = os.stat(tmp_path / "builds.csv").st_ino
+    fresh = OLD + [["t1", "22H2", "22621.1"]]
+    counts, output, delta = _update(tmp_path, fresh)
+    assert os.stat(tmp_path / "builds.csv").st_ino == inode  # extended in place
+    assert counts == {"added": 1, "changed": 0, "removed": 0}
+    assert output == [HEADER] + fresh
+    assert delta[1:] == [["added", "t1", "22H2", "22621.1"]]
+
+
+def test_rows_added_at_the_top_keep_page_order(tmp_path):
+    _update(tmp_path, OLD)
+    fresh = [["t1", "25H2", "26200.1"]] + OLD  # newest first
+    counts, output, _ = _update(tmp_path, fresh)
+    assert counts == {"added": 1, "changed": 0, "removed": 0}
+    assert output == [HEADER] + fresh
+
+
+def test_new_column_layout_replaces_the_file(tmp_path):
+    _update(tmp_path, OLD)
+    header = HEADER + ["Col_2"]
+    rows = [row + ["x"] for row in OLD]
+    counts = write_incremental(str(tmp_path / "builds.csv"), _write(tmp_path / "new.csv", rows, header), (0, 1))
+    assert counts == {"added": 2, "changed": 0, "removed": 0}
+    assert _read(tmp_path / "builds.csv") == [header] + rows
+
+
+def test_each_run_logs_its_counts(tmp_path):
+    _update(tmp_path, OLD)
+    _update(tmp_path, OLD[:1])
+    with open(tmp_path / "builds.changes.log", encoding="utf-8") as f:
+        runs = [json.loads(line) for line in f]
+    assert [{k: run[k] for k in ("total", "added", "changed", "removed")} for run in runs] == [
+        {"total": 2, "added": 2, "changed": 0, "removed": 0},
+        {"total": 1, "added": 0, "changed": 0, "removed": 1},
+    ]
+    assert all("time" in run for run in runs)
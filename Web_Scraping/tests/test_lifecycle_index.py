@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import pytest
+
+from lifecycle_index import HERE, LifecycleIndex
+
+SOURCES = ("java_version_history.csv", "windows11_release_info.csv", "windows_server_release_info.csv")
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    directory = tmp_path / "csv"
+    directory.mkdir()
+    for name in SOURCES:
+        shutil.copy(os.path.join(HERE, name), directory / name)
+    return directory
+
+
+@pytest.fixture
+def index(tmp_path, csv_dir):
+    idx = LifecycleIndex(str(tmp_path / "index.sqlite"), str(csv_dir))
+    yield idx
+    idx.close()
+
+
+def _count(index, table, source):
+    return index._db.execute(f"SELECT COUNT(*) FROM {table} WHERE source = ?", (source,)).fetchone()[0]
+
+
+def test_unchanged_files_are_not_reread(index):
+    first, second = index.refresh(), index.refresh()
+    assert [first[name] for name in SOURCES] == ["indexed"] * 3
+    assert [second[name] for name in SOURCES] == ["unchanged"] * 3
+
+
+def test_rows_of_a_deleted_csv_are_dropped(index, csv_dir):
+    index.refresh()
+    assert _count(index, "versions", "windows11_release_info.csv") > 0
+    assert _count(index, "builds", "windows11_release_info.csv") > 0
+    products = index.products()
+
+    os.remove(csv_dir / "windows11_release_info.csv")
+    assert index.refresh()["windows11_release_info.csv"] == "missing"
+    assert _count(index, "versions", "windows11_release_info.csv") == 0
+    assert _count(index, "builds", "windows11_release_info.csv") == 0
+    assert index._db.execute("SELECT COUNT(*) FROM sources WHERE path = 'windows11_release_info.csv'"
+                             ).fetchone()[0] == 0
+    assert "Windows 11" in products and "Windows 11" not in index.products()
+    assert _count(index, "versions", "java_version_history.csv") > 0
+
+    shutil.copy(os.path.join(HERE, "windows11_release_info.csv"), csv_dir)
+    assert index.refresh()["windows11_release_info.csv"] == "indexed"
+    assert index.products() == products
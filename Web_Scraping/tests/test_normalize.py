@@ -0,0 +1,29 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from normalize import detect_kinds, normalize, parse_dates
+
+
+def test_dates_in_every_shared_layout_are_parsed():
+    parsed = parse_dates(["2025-09-30", "01.10.2024", "23 January 1996[9]", "May 1996", "n/a"])
+    assert [d.date().isoformat() if not pd.isna(d) else None for d in parsed] == [
+        "2025-09-30", "2024-10-01", "1996-01-23", "1996-05-31", None]
+
+
+def test_column_with_different_kinds_per_table_stays_text():
+    frame = pd.DataFrame({
+        "Table_Source": ["Table_1", "Table_1", "Table_2", "Table_2"],
+        "Col_4": ["2024-11-01", "2021-08-18", "26100.6584", "20348.4171"],
+        "Col_9": ["26100.6584", "20348.4171", "", ""],
+    }, dtype="string")
+    assert detect_kinds(frame) == {"Col_9": "build"}
+    typed = normalize(frame)
+    assert "Col_4_date" not in typed and "Col_4_build" not in typed
+    assert typed["Col_9_build"].tolist() == [26100, 20348, pd.NA, pd.NA]
+
+
+def test_frame_without_a_source_column_is_one_table():
+    frame = pd.DataFrame({"Version": ["Java SE 17", "Java SE 21"], "Released": ["14 September 2021", "2023-09-19"]},
+                         dtype="string")
+    assert detect_kinds(frame) == {"Version": "version", "Released": "date"}
@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+import driver_pool
+import page_loader
+import snapshots
+from static_html import parse_html
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+RELEASE_ROWS = [
+    ["3.2", "1 October 2024[1]", "October 2027"],
+    ["3.1", "2023-04-15", "30.04.2026"],
+    ["3.0 LTS", "March 3, 2022", "2028-03-31"],
+]
+
+pytestmark = pytest.mark.usefixtures("isolated")
+
+
+class FakeDriver:
+    """Records navigations and serves the given HTML as the rendered page."""
+
+    def __init__(self, html=""):
+        self.html = html
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    @property
+    def page_source(self):
+        return self.html
+
+
+def _release_table(page):
+    return next(table for table in page["tables"] if "wikitable" in table["classes"].split())
+
+
+def test_static_backend_extracts_rows(site):
+    driver = FakeDriver()
+    page = page_loader.load_page(site + "releases.html", backend="static", driver=driver)
+    assert driver.visited == []
+    table = _release_table(page)
+    assert table["headers"] == ["Version", "Release date", "End of support"]
+    assert table["rows"][1:] == RELEASE_ROWS
+    assert page["infobox"] == [["Developer", "Example Corp"], ["Latest release", "3.2.1 (1 October 2024)"]]
+    assert [item["href"] for item in page["list_items"]] == [site + "releases.html", "https://example.test/support"]
+    assert page["wait_seconds"] == 0.0
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """The JavaScript page as Chrome would render it, extracted without a browser."""
+    monkeypatch.setattr(page_loader, "wait_until_ready", lambda driver, selector, timeout: 0.25)
+    monkeypatch.setattr(page_loader, "extract_page", lambda driver: parse_html(driver.page_source))
+    with open(os.path.join(FIXTURES, "releases.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_page_built_by_javascript_falls_back_to_browser(site, rendered):
+    url = site + "releases_js.html"
+    driver = FakeDriver(rendered)
+    page = page_loader.load_page(url, backend="static", driver=driver)
+    assert driver.visited == [url]
+    assert _release_table(page)["rows"][1:] == RELEASE_ROWS
+    assert page["wait_seconds"] == 0.25
+    assert sorted(kind for _, kind, _ in snapshots.get_archive().history(url)) == ["browser", "static"]
+
+
+
+def test_unchanged_static_page_is_skipped(site, tmp_path):
+    url, output = site + "releases.html", tmp_path / "releases.csv"
+    assert page_loader.load_page(url, backend="static", output_csv=str(output)) is not None
+    output.write_text("rows", encoding="utf-8")
+    driver = FakeDriver()
+    assert page_loader.load_page(url, backend="static", driver=driver, output_csv=str(output)) is None
+    assert driver.visited == []
+
+
+def test_unchanged_shell_of_javascript_page_is_still_rendered(site, rendered, tmp_path):
+    url, output = site + "releases_js.html", tmp_path / "releases.csv"
+    driver = FakeDriver(rendered)
+    assert page_loader.load_page(url, backend="static", driver=driver, output_csv=str(output)) is not None
+    output.write_text("rows", encoding="utf-8")
+    # The static shell is unchanged, but the rendered table is not
+    driver.html = rendered.replace("October 2027", "October 2028")
+    page = page_loader.load_page(url, backend="static", driver=driver, output_csv=str(output))
+    assert driver.visited == [url, url]
+    assert _release_table(page)["rows"][1][2] == "October 2028"
+    output.write_text("rows", encoding="utf-8")
+    assert page_loader.load_page(url, backend="static", driver=driver, output_csv=str(output)) is None
+
+
+@pytest.fixture
+def chrome():
+    try:
+        driver = driver_pool.new_driver()
+    except Exception as exc:  # no Chrome, or no network to resolve its driver
+        pytest.skip(f"Chrome is not available: {exc}")
+    yield driver
+    driver.quit()
+
+
+def test_static_and_browser_paths_agree(site, chrome):
+    url = site + "releases.html"
+    static = page_loader.load_page(url, backend="static")
+    browser = page_loader.load_page(url, backend="browser", driver=chrome)
+    for key in ("tables", "infobox", "list_items"):
+        assert browser[key] == static[key]
+    rendered = page_loader.load_page(site + "releases_js.html", backend="static", driver=chrome)
+    assert _release_table(rendered)["rows"][1:] == RELEASE_ROWS
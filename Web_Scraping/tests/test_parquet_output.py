@@ -0,0 +1,37 @@
+import csv
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from parquet_output import spool_to_parquet
+
+
+def _write_spool(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def test_values_that_do_not_convert_keep_the_column_as_text(tmp_path):
+    spool = tmp_path / "rows.csv"
+    _write_spool(spool, [
+        ["t1", "2024-02-30", "99999999999999999999", "2024-02-29", "7"],
+        ["t1", "2024-01-01", "5", "2024-03-01", "8"],
+    ])
+    target = tmp_path / "out.parquet"
+    assert spool_to_parquet(str(spool), str(target), ["Table", "Bad date", "Huge", "Date", "Count"]) == 2
+    schema = pq.read_schema(target)
+    assert str(schema.field("Bad date").type) == "string"
+    assert str(schema.field("Huge").type) == "string"
+    assert str(schema.field("Date").type) == "date32[day]"
+    assert str(schema.field("Count").type) == "int64"
+
+
+def test_parts_column_does_not_collide_with_a_scraped_column(tmp_path):
+    spool = tmp_path / "rows.csv"
+    _write_spool(spool, [["t1", "26100.6725", "kept"]])
+    target = tmp_path / "out.parquet"
+    spool_to_parquet(str(spool), str(target), ["Table", "Build", "Build_parts"])
+    table = pq.read_table(target)
+    assert table.column("Build_parts").to_pylist() == ["kept"]
+    assert table.column("Build_parts_").to_pylist() == [[26100, 6725]]
@@ -0,0 +1,45 @@
+import threading
+
+import refresh_daemon
+from registry import SCRAPERS
+
+
+def _run_once(daemon):
+    thread = threading.Thread(target=daemon.run, kwargs={"once": True}, daemon=True)
+    thread.start()
+    thread.join(10)
+    return not thread.is_alive()
+
+
+def _result(name, **extra):
+    return {"name": name, "status": "ok", "rows": 1, "seconds": 0.01, "error": "", **extra}
+
+
+def test_once_returns_when_the_state_file_cannot_be_saved(tmp_path, monkeypatch):
+    names = sorted(SCRAPERS)[:2]
+    monkeypatch.setattr(refresh_daemon, "run_job", lambda name, *args: _result(name))
+    daemon = refresh_daemon.RefreshDaemon(names, workers=1, state_path=str(tmp_path / "state.json"))
+
+    def fail_to_save():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(daemon, "_save_state", fail_to_save)
+    assert _run_once(daemon)
+    assert all(daemon.snapshot()[name]["status"] == "ok" for name in names)
+
+
+def test_a_broken_result_does_not_leak_a_worker_slot(tmp_path, monkeypatch):
+    names = sorted(SCRAPERS)[:3]
+    broken = names[0]
+
+    def run_job(name, *args):
+        result = _result(name)
+        if name == broken:
+            del result["seconds"]
+        return result
+
+    monkeypatch.setattr(refresh_daemon, "run_job", run_job)
+    daemon = refresh_daemon.RefreshDaemon(names, workers=1, state_path=str(tmp_path / "state.json"))
+    assert _run_once(daemon)
+    assert daemon._running == 0
+    assert {name for _, name in daemon._queue} == set(names)  # the broken source is retried later
@@ -0,0 +1,63 @@
+import csv
+import os
+
+import pytest
+
+from row_writer import StreamingCsvWriter
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_short_rows_are_padded_to_the_widest(tmp_path):
+    output = str(tmp_path / "out.csv")
+    with StreamingCsvWriter(output, leading=["Source", "Key"]) as writer:
+        writer.write(["infobox", "Developer", "Example Corp"])
+        writer.write(["table_2", "3.2", "2024-10-01", "2027-10-31"])
+        writer.write(["table_2"])
+    assert _read(output) == [
+        ["Source", "Key", "Col_1", "Col_2"],
+        ["infobox", "Developer", "Example Corp", ""],
+        ["table_2", "3.2", "2024-10-01", "2027-10-31"],
+        ["table_2", "", "", ""],
+    ]
+    assert writer.written == 3
+    assert os.listdir(tmp_path) == ["out.csv"]  # no spool left behind
+
+
+def test_rows_are_padded_to_fixed_columns(tmp_path):
+    output = str(tmp_path / "out.csv")
+    with StreamingCsvWriter(output, columns=["Version", "Date", "URL"]) as writer:
+        writer.write(["v8.45"])
+    assert _read(output) == [["Version", "Date", "URL"], ["v8.45", "", ""]]
+
+
+def test_row_wider_than_columns_is_rejected_and_output_kept(tmp_path):
+    output = tmp_path / "out.csv"
+    output.write_text("previous run\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="3 columns passed, row has 4 cells"):
+        with StreamingCsvWriter(str(output), columns=["Version", "Date", "URL"]) as writer:
+            writer.write(["v8.45", "2024-03-12", "http://example.test/"])
+            writer.write(["v8.40", "2023-11-05", "http://example.test/", "extra"])
+    assert output.read_text(encoding="utf-8") == "previous run\n"
+    assert os.listdir(tmp_path) == ["out.csv"]
+
+
+def test_abort_leaves_the_existing_output_untouched(tmp_path):
+    output = tmp_path / "out.csv"
+    output.write_text("previous run\n", encoding="utf-8")
+    writer = StreamingCsvWriter(str(output))
+    writer.write(["table_1", "new"])
+    writer.abort()
+    assert output.read_text(encoding="utf-8") == "previous run\n"
+    assert os.listdir(tmp_path) == ["out.csv"]
+
+
+def test_no_output_file_without_rows(tmp_path):
+    output = tmp_path / "out.csv"
+    with StreamingCsvWriter(str(output)) as writer:
+        pass
+    assert writer.rows == writer.written == 0
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,117 @@
+import math
+import time
+
+import pytest
+import requests
+
+import stub_server
+from throttle import CircuitOpenError, HostScheduler, TokenBucket
+
+
+def _scheduler(**settings):
+    settings = {"rate": math.inf, "backoff_base": 0.01, "backoff_cap": 0.05, **settings}
+    return HostScheduler(**settings)
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as s:
+        yield s
+
+
+def test_transient_failures_are_retried_until_success(session):
+    with stub_server.running(script=[503, 502, 200]) as server:
+        response = _scheduler().request(session, "GET", server.url + "page")
+    assert response.status_code == 200
+    assert server.requests["/page"] == 3
+
+
+def test_gives_up_after_max_attempts(session):
+    with stub_server.running(script=[503] * 10) as server:
+        response = _scheduler(max_attempts=3).request(session, "GET", server.url + "page")
+    assert response.status_code == 503
+    assert server.requests["/page"] == 3
+
+
+def test_retry_budget_runs_out(session):
+    scheduler = _scheduler(max_attempts=10, retry_ratio=0, breaker_threshold=100)
+    with stub_server.running(script=[503] * 10) as server:
+        assert scheduler.request(session, "GET", server.url + "a").status_code == 503
+        # The budget's floor of three retries is spent on the first URL
+        assert server.requests["/a"] == 4
+        assert scheduler.request(session, "GET", server.url + "b").status_code == 503
+        assert server.requests["/b"] == 1
+
+
+def test_circuit_opens_then_recovers_through_a_half_open_trial(session):
+    scheduler = _scheduler(max_attempts=1, breaker_threshold=2, breaker_reset=0.3)
+    with stub_server.running(script=[503, 503]) as server:
+        url = server.url + "page"
+        assert scheduler.request(session, "GET", url).status_code == 503
+        assert scheduler.request(session, "GET", url).status_code == 503
+        with pytest.raises(CircuitOpenError):
+            scheduler.request(session, "GET", url)
+        assert server.requests["/page"] == 2  # rejected without reaching the server
+
+        time.sleep(0.35)
+        _, breaker, _ = scheduler._state("127.0.0.1")
+        assert breaker.state == "half-open"
+        assert scheduler.request(session, "GET", url).status_code == 200
+        assert breaker.state == "closed"
+
+
+def test_failed_half_open_trial_reopens_the_circuit(session):
+    scheduler = _scheduler(max_attempts=1, breaker_threshold=1, breaker_reset=0.2)
+    with stub_server.running(script=[503, 503]) as server:
+        url = server.url + "page"
+        scheduler.request(session, "GET", url)
+        time.sleep(0.25)
+        assert scheduler.request(session, "GET", url).status_code == 503  # the trial
+        with pytest.raises(CircuitOpenError):
+            scheduler.request(session, "GET", url)
+
+
+def test_retry_after_is_honoured(session):
+    with stub_server.running(script=[429, 200], retry_after=0.5) as server:
+        start = time.monotonic()
+        response = _scheduler().request(session, "GET", server.url + "page")
+        elapsed = time.monotonic() - start
+    assert response.status_code == 200
+    assert elapsed >= 0.5
+
+
+def test_requests_are_rate_limited_per_host(session):
+    scheduler = _scheduler(rate=20, burst=1)
+    with stub_server.running() as server:
+        start = time.monotonic()
+        for _ in range(21):
+            scheduler.request(session, "GET", server.url + "page")
+        elapsed = time.monotonic() - start
+        peak = server.peak_rate()
+    assert elapsed >= 1.0 - 0.05  # one token up front, then 20 at 20 per second
+    assert peak <= 21
+
+
+def test_bucket_rejects_a_rate_that_never_refills():
+    for rate in (0, -1):
+        with pytest.raises(ValueError):
+            TokenBucket(rate)
+
+
+class BrokenSession:
+    def request(self, method, url, **kwargs):
+        raise RuntimeError("not a network error")
+
+
+def test_unexpected_error_during_trial_does_not_wedge_the_circuit(session):
+    scheduler = _scheduler(max_attempts=1, breaker_threshold=1, breaker_reset=0.2)
+    with stub_server.running(script=[503]) as server:
+        url = server.url + "page"
+        scheduler.request(session, "GET", url)
+        time.sleep(0.25)
+        with pytest.raises(RuntimeError):
+            scheduler.request(BrokenSession(), "GET", url)  # the trial
+        time.sleep(0.25)
+        assert scheduler.request(session, "GET", url).status_code == 200
+        _, breaker, _ = scheduler._state("127.0.0.1")
+        assert breaker.state == "closed"
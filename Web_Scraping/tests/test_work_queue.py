@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from work_queue import WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = WorkQueue(str(tmp_path / "queue"), shards=2)
+    yield q
+    q.close()
+
+
+def _staged(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_result_is_committed_once(queue, tmp_path):
+    output = tmp_path / "out.csv"
+    queue.enqueue("java", "http://example.test/java", str(output))
+    lease = queue.lease("worker-a")
+    staged = _staged(tmp_path, "out.part.csv", "rows")
+    assert queue.complete(lease, staged, rows=1, worker="worker-a")
+    assert output.read_text(encoding="utf-8") == "rows"
+    assert not queue.complete(lease, None)
+    assert queue.counts() == {"done": 1}
+    assert queue.lease("worker-b") is None
+
+
+def test_expired_lease_is_requeued_and_released_to_another_worker(queue):
+    queue.enqueue("java", "http://example.test/java", "out.csv")
+    first = queue.lease("worker-a", seconds=0.1)
+    assert queue.lease("worker-b") is None  # still leased
+    time.sleep(0.15)
+    second = queue.lease("worker-b")
+    assert second.job_id == first.job_id and second.token != first.token
+    assert second.attempt == 2
+
+
+def test_lease_expires_into_failure_once_out_of_attempts(queue):
+    queue.enqueue("java", "http://example.test/java", "out.csv", max_attempts=1)
+    queue.lease("worker-a", seconds=0.05)
+    time.sleep(0.1)
+    assert queue.lease("worker-b") is None
+    assert queue.counts() == {"failed": 1}
+    assert queue.jobs()[0]["error"] == "lease expired"
+
+
+def test_heartbeat_reports_a_lost_lease(queue):
+    queue.enqueue("java", "http://example.test/java", "out.csv")
+    first = queue.lease("worker-a", seconds=0.1)
+    assert queue.heartbeat(first, seconds=0.1)
+    time.sleep(0.15)
+    second = queue.lease("worker-b")
+    assert not queue.heartbeat(first)
+    assert queue.heartbeat(second)
+
+
+def test_stale_lease_cannot_complete_or_fail(queue, tmp_path):
+    output = tmp_path / "out.csv"
+    queue.enqueue("java", "http://example.test/java", str(output))
+    stale = queue.lease("worker-a", seconds=0.1)
+    time.sleep(0.15)
+    current = queue.lease("worker-b")
+
+    staged = _staged(tmp_path, "stale.part.csv", "old rows")
+    assert not queue.complete(stale, staged)
+    assert not output.exists()
+    assert not (tmp_path / "stale.part.csv").exists()  # discarded
+    assert not queue.fail(stale, "boom")
+    assert queue.counts() == {"leased": 1}
+
+    assert queue.complete(current, _staged(tmp_path, "current.part.csv", "new rows"))
+    assert output.read_text(encoding="utf-8") == "new rows"
+
+
+def test_failed_job_is_requeued_until_out_of_attempts(queue):
+    queue.enqueue("java", "http://example.test/java", "out.csv", max_attempts=2)
+    assert queue.fail(queue.lease("worker-a"), "boom")
+    assert queue.counts() == {"queued": 1}
+    assert queue.fail(queue.lease("worker-a"), "boom")
+    assert queue.counts() == {"failed": 1}
+
+
+def test_demo_runs_offline_on_the_committed_pages(tmp_path):
+    from registry import SCRAPERS
+    from work_queue import demo
+
+    queue = demo(processes=2, directory=str(tmp_path))
+    try:
+        assert queue.counts() == {"done": 3 * len(SCRAPERS)}
+    finally:
+        queue.close()
+    assert len(list((tmp_path / "output").iterdir())) == 3 * len(SCRAPERS)
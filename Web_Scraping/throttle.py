@@ -0,0 +1,413 @@
+"""
+Per-host rate limiting, retries and circuit breaking for scraper requests.
+
+Every request to a host first takes a token from that host's token bucket,
+so each host sees at most ``rate`` requests per second (with short bursts up
+to ``burst``) however many workers are running. Hosts have independent
+buckets, so a busy host never holds up requests to the others.
+
+Responses with status 429 or 5xx and connection errors are retried after a
+jittered exponential backoff (or the server's ``Retry-After``, if longer), as
+long as the host's retry budget allows: retries may add at most
+``retry_ratio`` extra requests on top of first attempts. After
+``breaker_threshold`` consecutive failures a host's circuit opens and its
+requests fail fast with :class:`CircuitOpenError` until ``breaker_reset``
+seconds have passed; then a single trial request decides whether it closes.
+
+Example Usage:
+    scheduler = throttle.configure(rate=2, host_rates={"en.wikipedia.org": 5})
+    response = scheduler.request(session, "GET", url, timeout=15)
+"""
+
+import math
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+import metrics
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second (positive); ``math.inf`` for no limit.
+    burst : float
+        Maximum tokens held, i.e. the largest burst allowed after a quiet spell.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        if not rate > 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping until one is available.
+
+        Returns
+        -------
+        float
+            Seconds spent waiting.
+        """
+        if self.rate == math.inf:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """
+    Stops traffic to a failing host for a while.
+
+    Parameters
+    ----------
+    threshold : int
+        Consecutive failures that open the circuit.
+    reset_after : float
+        Seconds the circuit stays open before a trial request is let through.
+    """
+
+    def __init__(self, threshold: int = 5, reset_after: float = 30):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half-open"``."""
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        """Returns True if a request may be sent now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True  # only one trial request at a time
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent first attempts.
+
+    Parameters
+    ----------
+    ratio : float
+        Retries allowed per first attempt over the last ``window`` seconds.
+    minimum : int
+        Retries always allowed in the window, so that a quiet host can still retry.
+    window : float
+        Seconds of history considered.
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: int = 3, window: float = 60):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._requests = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float):
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_request(self):
+        with self._lock:
+            self._requests.append(time.monotonic())
+
+    def try_spend(self) -> bool:
+        """Uses one retry if the budget has room; returns whether it did."""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            if len(self._retries) >= max(self.minimum, self.ratio * len(self._requests)):
+                return False
+            self._retries.append(now)
+            return True
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30) -> float:
+    """Returns a "full jitter" delay: uniform between 0 and ``min(cap, base * 2**attempt)``."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _retry_after(response) -> float:
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return 0.0
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+
+def host_of(url: str) -> str:
+    """Returns the host name a URL points at."""
+    return urlparse(url).hostname or ""
+
+
+class HostScheduler:
+    """
+    Applies rate limits, retries and circuit breakers per host.
+
+    Parameters
+    ----------
+    rate : float
+        Default requests per second for each host.
+    burst : float
+        Default bucket size for each host.
+    host_rates : dict, optional
+        ``{host: rate}`` overrides of ``rate``; ``math.inf`` turns the limit off.
+    max_attempts : int
+        Attempts per request, including the first.
+    retry_ratio : float
+        Retry budget per host, as a fraction of first attempts.
+    breaker_threshold : int
+        Consecutive failures that open a host's circuit.
+    breaker_reset : float
+        Seconds a circuit stays open.
+    backoff_base, backoff_cap : float
+        Parameters of :func:`backoff_delay`.
+    """
+
+    def __init__(self, rate: float = 2, burst: float = 2, host_rates: dict = None, max_attempts: int = 4,
+                 retry_ratio: float = 0.2, breaker_threshold: int = 5, breaker_reset: float = 30,
+                 backoff_base: float = 0.5, backoff_cap: float = 30):
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        for value in (rate, *self.host_rates.values()):
+            if not value > 0:
+                raise ValueError(f"Request rates must be positive, got {value}")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._breakers = defaultdict(lambda: CircuitBreaker(breaker_threshold, breaker_reset))
+        self._budgets = defaultdict(lambda: RetryBudget(retry_ratio))
+
+    def _state(self, host: str):
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.host_rates.get(host, self.rate), self.burst)
+            return self._buckets[host], self._breakers[host], self._budgets[host]
+
+    def wait_turn(self, url: str):
+        """
+        Blocks until ``url``'s host may receive another request.
+
+        Used for browser navigation, which is rate limited but not retried here.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the host's circuit is open.
+        """
+        host = host_of(url)
+        bucket, breaker, _ = self._state(host)
+        if not breaker.allow():
+            metrics.count("circuit_rejections", host=host)
+            raise CircuitOpenError(f"Circuit for {host} is open after repeated failures")
+        metrics.count("throttled_seconds", bucket.acquire(), host=host)
+
+    def record(self, url: str, ok: bool):
+        """Reports the outcome of a request made after :meth:`wait_turn`."""
+        _, breaker, _ = self._state(host_of(url))
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def request(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request within the host's limits, retrying transient failures.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Session used to send the request.
+        method : str
+            HTTP method, e.g. ``"GET"``.
+        url : str
+            The URL to request.
+        **kwargs
+            Passed on to :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        requests.Response
+            The first non-retryable response, or the last response once
+            attempts or the retry budget run out.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the host's circuit is open.
+        requests.RequestException
+            The last connection error if every attempt failed to connect.
+        """
+        host = host_of(url)
+        _, breaker, budget = self._state(host)
+        budget.record_request()
+        attempt = 0
+        while True:
+            self.wait_turn(url)
+            response, error = None, None
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = exc
+            except BaseException:
+                # Not retried, but still an outcome: a half-open trial must not stay pending
+                breaker.record_failure()
+                raise
+            if error is None and response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+
+            breaker.record_failure()
+            attempt += 1
+            reason = type(error).__name__ if error is not None else response.status_code
+            if attempt >= self.max_attempts or not budget.try_spend():
+                print(f"⚠️ Giving up on '{url}' after {attempt} attempt(s) ({reason}).")
+                if error is not None:
+                    raise error
+                return response
+            delay = max(backoff_delay(attempt - 1, self.backoff_base, self.backoff_cap), _retry_after(response))
+            print(f"⚠️ '{url}' failed ({reason}), retrying in {delay:.1f}s.")
+            metrics.count("retries", host=host)
+            time.sleep(delay)
+
+
+class ThrottledSession:
+    """
+    Wraps a ``requests.Session`` so its ``get`` goes through a :class:`HostScheduler`.
+
+    Parameters
+    ----------
+    session : requests.Session
+        The underlying keep-alive session.
+    scheduler : HostScheduler, optional
+        Defaults to the shared scheduler.
+    """
+
+    def __init__(self, session: requests.Session, scheduler: HostScheduler = None):
+        self.session = session
+        self.scheduler = scheduler
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return (self.scheduler or get_scheduler()).request(self.session, "GET", url, **kwargs)
+
+
+def interleave_by_host(items, url_of) -> list:
+    """
+    Orders work round-robin across hosts.
+
+    Workers taking jobs in this order spread over as many hosts as possible
+    instead of queueing behind one host's rate limit.
+
+    Parameters
+    ----------
+    items : iterable
+        The jobs.
+    url_of : callable
+        Returns the URL of a job.
+    """
+    queues = defaultdict(deque)
+    for item in items:
+        queues[host_of(url_of(item))].append(item)
+    ordered = []
+    while queues:
+        for host in list(queues):
+            ordered.append(queues[host].popleft())
+            if not queues[host]:
+                del queues[host]
+    return ordered
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> HostScheduler:
+    """Returns the shared scheduler, creating it with default limits on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = HostScheduler()
+        return _scheduler
+
+
+def configure(**settings) -> HostScheduler:
+    """
+    Replaces the shared scheduler with one built from ``settings``.
+
+    Accepts the parameters of :class:`HostScheduler`.
+
+    Returns
+    -------
+    HostScheduler
+        The new shared scheduler.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = HostScheduler(**settings)
+        return _scheduler
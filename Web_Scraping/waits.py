@@ -0,0 +1,56 @@
+import time
+
+READY_STATE_JS = """
+return [
+    document.readyState,
+    document.querySelectorAll(arguments[0]).length,
+    document.getElementsByTagName("*").length,
+];
+"""
+
+
+def wait_until_ready(driver, selector: str, timeout: float = 10,
+                     stable_for: float = 0.3, poll: float = 0.1) -> float:
+    """
+    Waits until the page has parsed, ``selector`` matches and the DOM stops growing.
+
+    Each poll is a single script call returning the document ready state, the
+    number of elements matching ``selector`` and the total element count. The
+    page is considered ready once the document is no longer loading, at least
+    one target element exists and the element count has not changed for
+    ``stable_for`` seconds.
+
+    Parameters
+    ----------
+    driver : selenium.webdriver.Chrome
+        A session that has just navigated to the page.
+    selector : str
+        CSS selector for the content the scraper needs (e.g. ``"table"``).
+    timeout : float
+        Maximum seconds to wait before giving up.
+    stable_for : float
+        Seconds the element count must stay unchanged.
+    poll : float
+        Seconds between checks.
+
+    Returns
+    -------
+    float
+        Seconds actually waited. On timeout a warning is printed and the
+        caller extracts whatever the page contains.
+    """
+    start = time.monotonic()
+    last_count = None
+    stable_since = start
+    while True:
+        now = time.monotonic()
+        state, matches, count = driver.execute_script(READY_STATE_JS, selector)
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        if state != "loading" and matches and now - stable_since >= stable_for:
+            return now - start
+        if now - start >= timeout:
+            print(f"⚠️ Page not ready after {timeout}s (waiting for '{selector}'), continuing.")
+            return now - start
+        time.sleep(poll)
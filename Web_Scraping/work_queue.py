@@ -0,0 +1,513 @@
+"""
+Shared, sharded work queue for running scrapers across processes.
+
+Jobs (a registered scraper, the URL to scrape and where to write the result)
+live in a few SQLite files, each job in the shard picked by a hash of its
+scraper and URL, so workers spread their locking over several databases. The databases use
+SQLite's WAL journal, which relies on shared memory between the processes
+using it, so every worker must run on the host that holds the queue
+directory; do not put it on a network filesystem.
+
+A worker takes a job by leasing it: the job is marked as leased to that
+worker until a deadline, under a random lease token. While the scraper runs
+the worker renews the lease with heartbeats; if the worker dies, the lease
+expires and the next worker looking for work puts the job back in the queue
+(or marks it failed once it has used up its attempts).
+
+Results are committed exactly once. The scraper writes to a temporary file
+named after the lease token, and :meth:`WorkQueue.complete` moves that file
+over the real output and marks the job done in one transaction, which only
+succeeds while the token is still the job's current lease. A worker whose
+lease expired and was handed to someone else therefore cannot overwrite a
+newer result or complete a job twice. The file is moved before the
+transaction commits; if the worker dies in between, the job is still leased
+with the new output already in place. Its lease then expires and the job
+runs again, and the rerun writes and moves the whole output anew, so the
+move is idempotent and the result is still committed once.
+
+Example Usage:
+    python work_queue.py enqueue java windows11
+    python work_queue.py work --worker-id worker-a
+    python work_queue.py status
+    python work_queue.py demo --processes 3
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, namedtuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIR = os.path.join(HERE, ".cache", "queue")
+# Committed pages the demo serves when no recorded fixtures are given, per extraction mode
+OFFLINE_DIR = os.path.join(HERE, "tests", "fixtures")
+OFFLINE_PAGES = {"tables": "releases.html", "version_table": "releases.html", "news_list": "news.html"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    output TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    error TEXT,
+    UNIQUE (name, url)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, enqueued_at);
+CREATE TABLE IF NOT EXISTS results (
+    job_id INTEGER PRIMARY KEY REFERENCES jobs (id),
+    lease_token TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    rows INTEGER,
+    seconds REAL NOT NULL,
+    committed_at REAL NOT NULL
+);
+"""
+
+Lease = namedtuple("Lease", ["shard", "job_id", "token", "name", "url", "output", "options", "attempt"])
+
+
+class WorkQueue:
+    """
+    A job queue sharded over SQLite files, with leases and exactly-once commits.
+
+    Parameters
+    ----------
+    directory : str
+        Folder holding the shard databases.
+    shards : int
+        Number of shard databases. Must be the same for every worker.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, shards: int = 4):
+        self.directory = directory
+        self.shards = shards
+        os.makedirs(directory, exist_ok=True)
+        self._dbs = []
+        for i in range(shards):
+            db = sqlite3.connect(os.path.join(directory, f"shard_{i}.sqlite"),
+                                 timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._dbs.append(db)
+        self._lock = threading.Lock()  # heartbeats run on a second thread
+
+    def _shard_of(self, name: str, url: str) -> int:
+        return zlib.crc32(f"{name}|{url}".encode("utf-8")) % self.shards
+
+    def _transaction(self, shard: int):
+        db = self._dbs[shard]
+
+        class Transaction:
+            def __enter__(self_):
+                self._lock.acquire()
+                db.execute("BEGIN IMMEDIATE")
+                return db
+
+            def __exit__(self_, exc_type, exc, tb):
+                try:
+                    db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+                finally:
+                    self._lock.release()
+        return Transaction()
+
+    def enqueue(self, name: str, url: str, output: str, options: dict = None,
+                max_attempts: int = 3, again: bool = False) -> bool:
+        """
+        Adds a job unless the same scraper and URL is already queued.
+
+        Parameters
+        ----------
+        name : str
+            Key of :data:`registry.SCRAPERS`.
+        url : str
+            The page to scrape.
+        output : str
+            Where the result is committed.
+        options : dict, optional
+            Extra keyword arguments for the scraper function, e.g. ``{"backend": "static"}``.
+        max_attempts : int
+            Leases granted before the job is marked failed.
+        again : bool
+            Re-queue the job if it already finished (done or failed).
+
+        Returns
+        -------
+        bool
+            True if the job was added or re-queued.
+        """
+        now = time.time()
+        with self._transaction(self._shard_of(name, url)) as db:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO jobs (name, url, output, options, max_attempts, enqueued_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, url, output, json.dumps(options or {}), max_attempts, now, now))
+            if cursor.rowcount == 0 and again:
+                cursor = db.execute(
+                    "UPDATE jobs SET status = 'queued', attempts = 0, error = NULL, output = ?, options = ?, "
+                    "max_attempts = ?, enqueued_at = ?, updated_at = ? "
+                    "WHERE name = ? AND url = ? AND status IN ('done', 'failed')",
+                    (output, json.dumps(options or {}), max_attempts, now, now, name, url))
+                if cursor.rowcount:
+                    db.execute("DELETE FROM results WHERE job_id = "
+                               "(SELECT id FROM jobs WHERE name = ? AND url = ?)", (name, url))
+            return cursor.rowcount > 0
+
+    def _reclaim(self, db, now: float):
+        # Expired leases go back to the queue, or fail once out of attempts
+        db.execute("UPDATE jobs SET status = 'failed', error = 'lease expired', lease_token = NULL, "
+                   "updated_at = ? WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                   (now, now))
+        db.execute("UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_token = NULL, updated_at = ? "
+                   "WHERE status = 'leased' AND lease_expires < ?", (now, now))
+
+    def lease(self, worker: str, seconds: float = 60):
+        """
+        Leases the oldest queued job, looking at the worker's own shard first.
+
+        Parameters
+        ----------
+        worker : str
+            Identifier of the worker, recorded with the lease.
+        seconds : float
+            Lease length; renew it with :meth:`heartbeat` before it runs out.
+
+        Returns
+        -------
+        Lease or None
+            The leased job, or None if no job is queued.
+        """
+        start = zlib.crc32(worker.encode("utf-8")) % self.shards
+        for i in range(self.shards):
+            shard = (start + i) % self.shards
+            now = time.time()
+            token = uuid.uuid4().hex
+            with self._transaction(shard) as db:
+                self._reclaim(db, now)
+                row = db.execute("SELECT id, name, url, output, options, attempts FROM jobs "
+                                 "WHERE status = 'queued' ORDER BY enqueued_at, id LIMIT 1").fetchone()
+                if row is None:
+                    continue
+                db.execute("UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                           "lease_token = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                           (worker, token, now + seconds, now, row[0]))
+            return Lease(shard, row[0], token, row[1], row[2], row[3], json.loads(row[4]), row[5] + 1)
+        return None
+
+    def heartbeat(self, lease: Lease, seconds: float = 60) -> bool:
+        """
+        Extends a lease.
+
+        Returns
+        -------
+        bool
+            False if the lease was lost (it expired and the job was re-leased
+            or re-queued); the worker should then abandon the job.
+        """
+        now = time.time()
+        with self._transaction(lease.shard) as db:
+            cursor = db.execute("UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                                "WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                                (now + seconds, now, lease.job_id, lease.token))
+            return cursor.rowcount == 1
+
+    def complete(self, lease: Lease, staged_output: str = None, rows: int = None,
+                 worker: str = "", seconds: float = 0.0) -> bool:
+        """
+        Commits a job's result exactly once.
+
+        Parameters
+        ----------
+        lease : Lease
+            The lease the work was done under.
+        staged_output : str, optional
+            Temporary file with the result, moved over ``lease.output`` as
+            part of the commit. Missing if the scraper wrote nothing.
+        rows : int, optional
+            Rows written, recorded with the result.
+        worker : str
+            Worker identifier, recorded with the result.
+        seconds : float
+            Time the job took.
+
+        Returns
+        -------
+        bool
+            True if the result was committed; False if the lease is no longer
+            current, in which case the staged file is discarded.
+        """
+        now = time.time()
+        with self._transaction(lease.shard) as db:
+            cursor = db.execute("UPDATE jobs SET status = 'done', lease_token = NULL, error = NULL, "
+                                "updated_at = ? WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                                (now, lease.job_id, lease.token))
+            committed = cursor.rowcount == 1
+            if committed:
+                db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                           (lease.job_id, lease.token, worker, rows, seconds, now))
+                if staged_output and os.path.exists(staged_output):
+                    # Inside the transaction: if the move fails, the job is not marked done.
+                    # A crash after the move but before COMMIT leaves the job leased; it is
+                    # re-run once the lease expires, and the rerun replaces the output again.
+                    os.replace(staged_output, lease.output)
+        if not committed and staged_output and os.path.exists(staged_output):
+            os.remove(staged_output)
+        return committed
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """
+        Gives a job back after an error: re-queued, or failed once out of attempts.
+
+        Returns
+        -------
+        bool
+            False if the lease was no longer current.
+        """
+        now = time.time()
+        with self._transaction(lease.shard) as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+                "lease_owner = NULL, lease_token = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                (error, now, lease.job_id, lease.token))
+            return cursor.rowcount == 1
+
+    def counts(self) -> Counter:
+        """Returns the number of jobs per status over all shards."""
+        counts = Counter()
+        for db in self._dbs:
+            with self._lock:
+                counts.update(dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")))
+        return counts
+
+    def jobs(self) -> list:
+        """Returns every job with its status and committed result, as dicts."""
+        jobs = []
+        for shard, db in enumerate(self._dbs):
+            with self._lock:
+                cursor = db.execute("SELECT j.id, j.name, j.url, j.status, j.attempts, j.error, r.worker, r.rows "
+                                    "FROM jobs j LEFT JOIN results r ON r.job_id = j.id ORDER BY j.id")
+                columns = [c[0] for c in cursor.description]
+                jobs += [dict(zip(columns, row), shard=shard) for row in cursor]
+        return jobs
+
+    def close(self):
+        """Closes the shard databases."""
+        for db in self._dbs:
+            db.close()
+
+
+def _staged_path(output: str, token: str) -> str:
+    # Keep the extension: the writer picks CSV or Parquet from it
+    stem, ext = os.path.splitext(output)
+    return f"{stem}.{token[:12]}.part{ext}"
+
+
+def run_worker(queue: WorkQueue, worker: str, lease_seconds: float = 60, wait: bool = False,
+               browsers: int = 1) -> Counter:
+    """
+    Leases and runs jobs until the queue is empty (or forever with ``wait``).
+
+    Parameters
+    ----------
+    queue : WorkQueue
+        The shared queue.
+    worker : str
+        Identifier recorded with leases and results.
+    lease_seconds : float
+        Lease length; heartbeats renew it every third of that.
+    wait : bool
+        Keep polling for new jobs instead of returning when none are left.
+    browsers : int
+        Chrome sessions this worker may start.
+
+    Returns
+    -------
+    collections.Counter
+        Jobs ``committed``, ``failed`` and ``lost`` (lease taken over) by this worker.
+    """
+    from driver_pool import DriverPool
+    from registry import SCRAPERS
+
+    outcomes = Counter()
+    with DriverPool(size=browsers) as pool:
+        while True:
+            lease = queue.lease(worker, lease_seconds)
+            if lease is None:
+                counts = queue.counts()
+                if not wait and not counts["queued"] and not counts["leased"]:
+                    return outcomes
+                time.sleep(1)  # others still hold leases that may expire
+                continue
+
+            print(f"[{worker}] {lease.name} {lease.url} (attempt {lease.attempt})")
+            lost = threading.Event()
+            done = threading.Event()
+
+            def beat():
+                while not done.wait(lease_seconds / 3):
+                    if not queue.heartbeat(lease, lease_seconds):
+                        lost.set()
+                        return
+
+            heart = threading.Thread(target=beat, daemon=True)
+            heart.start()
+            staged = _staged_path(lease.output, lease.token)
+            start = time.monotonic()
+            try:
+                with pool.lazy_driver() as driver:
+                    rows = SCRAPERS[lease.name].func(lease.url, staged, driver=driver, **lease.options)
+            except Exception as exc:
+                done.set()
+                queue.fail(lease, f"{type(exc).__name__}: {exc}")
+                print(f"[{worker}] ❌ {lease.name}: {type(exc).__name__}: {exc}")
+                outcomes["failed"] += 1
+                if os.path.exists(staged):
+                    os.remove(staged)
+                continue
+            done.set()
+            heart.join()
+            if not lost.is_set() and queue.complete(lease, staged, rows, worker, time.monotonic() - start):
+                print(f"[{worker}] ✅ {lease.name}: {rows} rows committed")
+                outcomes["committed"] += 1
+            else:
+                print(f"[{worker}] ⚠️ lease on {lease.name} was lost, result discarded")
+                outcomes["lost"] += 1
+                if os.path.exists(staged):
+                    os.remove(staged)
+
+
+def _worker_process(directory: str, shards: int, worker: str, lease_seconds: float, scratch_dir: str = None):
+    if scratch_dir:
+        # Keep the pages fetched here out of the shared HTTP cache and snapshot archive
+        import http_cache
+        import snapshots
+        http_cache.configure(os.path.join(scratch_dir, worker, "http"))
+        snapshots.configure(os.path.join(scratch_dir, worker, "archive"))
+    queue = WorkQueue(directory, shards)
+    try:
+        outcomes = run_worker(queue, worker, lease_seconds)
+    finally:
+        queue.close()
+    print(f"[{worker}] finished: {dict(outcomes)}")
+
+
+def print_jobs(queue: WorkQueue):
+    """Prints every job with its status and the worker that committed it."""
+    print(f"{'Shard':>5}  {'Scraper':<22}{'Status':<8}{'Tries':>5}  {'Worker':<14}{'Rows':>6}  URL")
+    for job in sorted(queue.jobs(), key=lambda j: (j["name"], j["url"])):
+        print(f"{job['shard']:>5}  {job['name']:<22}{job['status']:<8}{job['attempts']:>5}  "
+              f"{job['worker'] or '-':<14}{job['rows'] if job['rows'] is not None else '-':>6}  {job['url']}")
+    print(dict(queue.counts()))
+
+
+def demo(processes: int = 3, directory: str = None, shards: int = 4, fixtures_dir: str = None) -> WorkQueue:
+    """
+    Runs every scraper through several worker processes against local pages.
+
+    By default each scraper gets the committed test page for its extraction
+    mode (:data:`OFFLINE_PAGES`), so the demo needs no network and no prior
+    recording. With ``fixtures_dir`` (e.g. the folder ``benchmark.py record``
+    fills) the scrapers that have a recorded ``<name>.html`` there use it
+    instead. The pages are served locally and each is enqueued a few times
+    under distinct URLs. The workers cache and archive those pages under
+    ``directory``, not in the shared ``.cache`` and ``archive`` folders.
+    """
+    import tempfile
+    from benchmark import fixture_path, serve_fixtures
+    from engine import get_plan
+    from registry import SCRAPERS
+
+    if fixtures_dir:
+        pages = {name: f"{name}.html" for name in SCRAPERS if os.path.exists(fixture_path(name, fixtures_dir))}
+    else:
+        fixtures_dir = OFFLINE_DIR
+        pages = {name: OFFLINE_PAGES[get_plan(name).mode] for name in SCRAPERS}
+    if not pages:
+        print(f"⚠️ No fixtures in {fixtures_dir}; run 'python benchmark.py record' first.")
+        return None
+    directory = directory or tempfile.mkdtemp(prefix="work_queue_demo_")
+    output_dir = os.path.join(directory, "output")
+    os.makedirs(output_dir, exist_ok=True)
+    queue = WorkQueue(os.path.join(directory, "queue"), shards)
+    ctx = multiprocessing.get_context("spawn")
+    with serve_fixtures(fixtures_dir) as base_url:
+        for name, page in pages.items():
+            for copy in range(3):
+                url = f"{base_url}{page}?copy={copy}"
+                output = os.path.join(output_dir, f"{copy}_{SCRAPERS[name].output_csv}")
+                queue.enqueue(name, url, output, {"backend": "static"})
+        workers = [ctx.Process(target=_worker_process,
+                               args=(queue.directory, shards, f"worker-{i}", 10,
+                                     os.path.join(directory, "scratch")))
+                   for i in range(processes)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+    print_jobs(queue)
+    return queue
+
+
+def main(argv=None) -> int:
+    from registry import SCRAPERS
+
+    parser = argparse.ArgumentParser(description="Shared scrape queue with leases.")
+    parser.add_argument("command", choices=["enqueue", "work", "status", "demo"])
+    parser.add_argument("names", nargs="*",
+                        help=f"enqueue: scrapers to queue (default: all of {', '.join(sorted(SCRAPERS))})")
+    parser.add_argument("--queue-dir", default=DEFAULT_DIR, help="folder holding the shard databases")
+    parser.add_argument("--shards", type=int, default=4, help="number of shard databases")
+    parser.add_argument("--output-dir", default=HERE, help="enqueue: folder for the results")
+    parser.add_argument("--again", action="store_true", help="enqueue: re-queue finished jobs")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="work: worker identifier")
+    parser.add_argument("--lease", type=float, default=60, help="work: lease length in seconds")
+    parser.add_argument("--wait", action="store_true", help="work: keep waiting for new jobs")
+    parser.add_argument("--processes", type=int, default=3, help="demo: worker processes")
+    parser.add_argument("--fixtures", help="demo: recorded fixture folder (default: the committed test pages)")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.names) - set(SCRAPERS))
+    if unknown:
+        parser.error(f"unknown scrapers: {', '.join(unknown)}")
+
+    if args.command == "demo":
+        return 0 if demo(args.processes, shards=args.shards, fixtures_dir=args.fixtures) else 1
+
+    queue = WorkQueue(args.queue_dir, args.shards)
+    try:
+        if args.command == "enqueue":
+            for name in args.names or SCRAPERS:
+                scraper = SCRAPERS[name]
+                added = queue.enqueue(name, scraper.url, os.path.join(args.output_dir, scraper.output_csv),
+                                      again=args.again)
+                print(f"{'Queued' if added else 'Already queued'}: {name}")
+        elif args.command == "work":
+            outcomes = run_worker(queue, args.worker_id, args.lease, args.wait)
+            print(f"Worker {args.worker_id} finished: {dict(outcomes)}")
+        else:
+            print_jobs(queue)
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,220 @@
 """
 REST API Interaction Example using the JSONPlaceholder Fake API.
 
-This script demonstrates basic CRUD (Create, Read, Update, Delete) operations 
-using the `requests` library in Python. The API used here is a public 
-testing API — https://jsonplaceholder.typicode.com — which allows 
+This script demonstrates basic CRUD (Create, Read, Update, Delete) operations
+using the `requests` library in Python. The API used here is a public
+testing API — https://jsonplaceholder.typicode.com — which allows
 you to experiment with REST endpoints.
 
+Requests go through :class:`JsonPlaceholderClient`, which keeps one
+keep-alive session with a sized connection pool, so repeated calls reuse
+open TCP/TLS connections instead of setting up a new one each time. Every
+request has connect and read timeouts, and responses come back as
+:class:`User` and :class:`Post` objects.
+
+Classes Included:
+- User, Post: Parsed API records.
+- ApiError: Raised when the API answers with an unexpected status.
+- JsonPlaceholderClient: The pooled client.
+
 Functions Included:
 - get_user(user_id): Fetch details of a specific user.
 - create_post(title, body, user_id): Create a new post for a user.
 - update_post(post_id, new_title): Update an existing post.
 - delete_post(post_id): Delete a post by ID.
 
+The functions use a shared client, print the result as before and also
+return it.
+
 Example Usage:
-    python api_example.py
+    python api.py
+    python api.py --base-url http://127.0.0.1:8000   (with api_stub.py running)
 """
 
+import argparse
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
 import requests
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "https://jsonplaceholder.typicode.com"
+TIMEOUT = (3.05, 10)  # seconds to connect, seconds to wait for the response
+
+
+@dataclass
+class User:
+    """A user record from ``/users``."""
+
+    id: int
+    name: str
+    username: str
+    email: str
+    phone: str = ""
+    website: str = ""
+    address: dict = field(default_factory=dict)
+    company: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "User":
+        return cls(data["id"], data.get("name", ""), data.get("username", ""), data.get("email", ""),
+                   data.get("phone", ""), data.get("website", ""), data.get("address", {}),
+                   data.get("company", {}))
+
+
+@dataclass
+class Post:
+    """A post record from ``/posts``. Partial updates may leave fields unset."""
+
+    id: int
+    title: str = ""
+    body: str = ""
+    user_id: Optional[int] = None
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Post":
+        return cls(data["id"], data.get("title", ""), data.get("body", ""), data.get("userId"))
+
+    def to_json(self) -> dict:
+        return {"id": self.id, "title": self.title, "body": self.body, "userId": self.user_id}
+
+
+class ApiError(Exception):
+    """
+    Raised when the API answers with an unexpected status code.
+
+    ``retry_after`` holds the seconds of a ``Retry-After`` header, if any
+    (given as seconds or as an HTTP date).
+    """
+
+    def __init__(self, method: str, url: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"{method} {url} returned {status}")
+        self.method = method
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    # Either a number of seconds or an HTTP date
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class JsonPlaceholderClient:
+    """
+    A JSONPlaceholder client on one keep-alive session.
+
+    Parameters
+    ----------
+    base_url : str
+        Root URL of the API.
+    pool_size : int
+        Connections kept open per host; also the most requests that can be
+        in flight at once (callers block for a free connection beyond that).
+    timeout : float or tuple
+        Default ``requests`` timeout for every call, ``(connect, read)``.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, pool_size: int = 10, timeout=TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["Accept"] = "application/json"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, expected=(200,), **kwargs) -> requests.Response:
+        """
+        Sends one request and checks its status.
+
+        Raises
+        ------
+        ApiError
+            If the status is not in ``expected``.
+        requests.RequestException
+            On connection errors and timeouts.
+        """
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, url, **kwargs)
+        if response.status_code not in expected:
+            raise ApiError(method, url, response.status_code, _retry_after(response))
+        return response
+
+    def get_user(self, user_id: int) -> User:
+        """Fetches one user."""
+        return User.from_json(self.request("GET", f"/users/{user_id}").json())
+
+    def get_post(self, post_id: int) -> Post:
+        """Fetches one post."""
+        return Post.from_json(self.request("GET", f"/posts/{post_id}").json())
+
+    def create_post(self, title: str, body: str, user_id: int) -> Post:
+        """Creates a post and returns it with its new ID."""
+        data = {"title": title, "body": body, "userId": user_id}
+        return Post.from_json(self.request("POST", "/posts", expected=(201,), json=data).json())
+
+    def update_post(self, post_id: int, new_title: str) -> Post:
+        """Replaces a post's title and returns the post as stored."""
+        data = {"title": new_title}
+        return Post.from_json(self.request("PUT", f"/posts/{post_id}", json=data).json())
+
+    def delete_post(self, post_id: int):
+        """Deletes a post."""
+        self.request("DELETE", f"/posts/{post_id}", expected=(200, 204))
+
+    def close(self):
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> JsonPlaceholderClient:
+    """Returns the shared client used by the module functions."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = JsonPlaceholderClient()
+        return _client
+
+
+def set_client(client: JsonPlaceholderClient):
+    """Makes ``client`` the shared client, e.g. a caching subclass."""
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
+
+
+def configure(base_url: str = BASE_URL, pool_size: int = 10, timeout=TIMEOUT) -> JsonPlaceholderClient:
+    """Replaces the shared client, e.g. to point it at a local stub server."""
+    client = JsonPlaceholderClient(base_url, pool_size, timeout)
+    set_client(client)
+    return client
 
 
 def get_user(user_id):
@@ -32,14 +228,16 @@ def get_user(user_id):
 
     Returns
     -------
-    None
-        Prints user details if successful, or an error message otherwise.
+    User or None
+        The user (also printed), or None after printing an error message.
     """
-    response = requests.get(f"{BASE_URL}/users/{user_id}")
-    if response.status_code == 200:
-        print("✅ User Details:", response.json())
-    else:
+    try:
+        user = get_client().get_user(user_id)
+    except (ApiError, requests.RequestException):
         print("❌ Failed to fetch user")
+        return None
+    print("✅ User Details:", user)
+    return user
 
 
 def create_post(title, body, user_id):
@@ -57,15 +255,16 @@ def create_post(title, body, user_id):
 
     Returns
     -------
-    None
-        Prints confirmation and created post data if successful.
+    Post or None
+        The created post (also printed), or None after printing an error message.
     """
-    data = {"title": title, "body": body, "userId": user_id}
-    response = requests.post(f"{BASE_URL}/posts", json=data)
-    if response.status_code == 201:
-        print("✅ Post Created:", response.json())
-    else:
+    try:
+        post = get_client().create_post(title, body, user_id)
+    except (ApiError, requests.RequestException):
         print("❌ Failed to create post")
+        return None
+    print("✅ Post Created:", post)
+    return post
 
 
 def update_post(post_id, new_title):
@@ -81,15 +280,16 @@ def update_post(post_id, new_title):
 
     Returns
     -------
-    None
-        Prints confirmation and updated post data if successful.
+    Post or None
+        The updated post (also printed), or None after printing an error message.
     """
-    data = {"title": new_title}
-    response = requests.put(f"{BASE_URL}/posts/{post_id}", json=data)
-    if response.status_code == 200:
-        print("✅ Post Updated:", response.json())
-    else:
+    try:
+        post = get_client().update_post(post_id, new_title)
+    except (ApiError, requests.RequestException):
         print("❌ Failed to update post")
+        return None
+    print("✅ Post Updated:", post)
+    return post
 
 
 def delete_post(post_id):
@@ -103,18 +303,24 @@ def delete_post(post_id):
 
     Returns
     -------
-    None
-        Prints a confirmation message if deletion is successful.
+    bool
+        True if the post was deleted; a message is printed either way.
     """
-    response = requests.delete(f"{BASE_URL}/posts/{post_id}")
-    if response.status_code in (200, 204):
-        print("✅ Post Deleted Successfully")
-    else:
+    try:
+        get_client().delete_post(post_id)
+    except (ApiError, requests.RequestException):
         print("❌ Failed to delete post")
+        return False
+    print("✅ Post Deleted Successfully")
+    return True
 
 
 # ------------------- Example Usage -------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSONPlaceholder CRUD example.")
+    parser.add_argument("--base-url", default=BASE_URL, help="API root, e.g. a local api_stub.py")
+    configure(parser.parse_args().base_url)
+
     print("🔹 Fetching user with ID=1")
     get_user(1)
 
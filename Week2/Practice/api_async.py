@@ -0,0 +1,223 @@
+"""
+Concurrent batch calls against the JSONPlaceholder API.
+
+The functions in api.py make one request at a time, so fetching thousands
+of users is bound by round-trip latency. :class:`BatchClient` runs many
+calls at once from asyncio: each call runs the pooled
+:class:`api.JsonPlaceholderClient` on a worker thread (the project has no
+async HTTP library), with an ``asyncio.Semaphore`` capping how many are in
+flight and a connection pool of the same size.
+
+When the server pushes back (``429``, ``5xx`` or a dropped connection) the
+call is retried after a jittered exponential backoff, or the server's
+``Retry-After`` if longer, and every other call waits out the same pause
+before sending, so the whole batch slows down instead of hammering the
+server. Creates are only retried on ``429``/``503``, which mean the request
+was not processed, so a retry cannot create a post twice.
+
+Results come back in input order as :class:`Result` objects, each with
+either a value or the error that ended that item; one failure never stops
+the rest of the batch.
+
+Example Usage:
+    results = asyncio.run(get_users(range(1, 11), concurrency=8))
+    python api_async.py --base-url http://127.0.0.1:8000 --count 2000 --concurrency 1 8 32
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import requests
+
+import api
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+NOT_PROCESSED_STATUSES = frozenset({429, 503})  # safe to retry even for creates
+
+
+@dataclass
+class Result:
+    """Outcome of one item of a batch: ``value`` on success, else ``error``."""
+
+    value: Any = None
+    error: Optional[Exception] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 10) -> float:
+    """Returns a "full jitter" delay: uniform between 0 and ``min(cap, base * 2**attempt)``."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class BatchClient:
+    """
+    Runs JSONPlaceholder calls concurrently with retries and shared backoff.
+
+    Use it with ``async with``.
+
+    Parameters
+    ----------
+    base_url : str
+        Root URL of the API.
+    concurrency : int
+        Calls in flight at once; also the thread and connection pool size.
+    max_attempts : int
+        Attempts per item, including the first.
+    backoff_base, backoff_cap : float
+        Parameters of :func:`backoff_delay`.
+    timeout : float or tuple
+        ``requests`` timeout of each call.
+    """
+
+    def __init__(self, base_url: str = api.BASE_URL, concurrency: int = 10, max_attempts: int = 4,
+                 backoff_base: float = 0.25, backoff_cap: float = 10, timeout=api.TIMEOUT):
+        self.client = api.JsonPlaceholderClient(base_url, pool_size=concurrency, timeout=timeout)
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retries = 0
+        self.pushbacks = 0
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="api")
+        self._semaphore = None
+        self._resume_at = 0.0  # loop time before which nobody sends
+
+    async def _pause(self):
+        delay = self._resume_at - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _push_back(self, delay: float):
+        self.pushbacks += 1
+        self._resume_at = max(self._resume_at, asyncio.get_running_loop().time() + delay)
+
+    async def call(self, func, *args, idempotent: bool = True) -> Result:
+        """
+        Runs one client call with the concurrency limit and retries.
+
+        Parameters
+        ----------
+        func : callable
+            A method of :attr:`client`.
+        *args
+            Its arguments.
+        idempotent : bool
+            False for calls that must not be repeated once the server may
+            have processed them (creates).
+
+        Returns
+        -------
+        Result
+            Never raises for API or connection errors or malformed response
+            bodies; they end up in ``error``.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            attempt += 1
+            async with self._semaphore:
+                await self._pause()
+                try:
+                    value = await loop.run_in_executor(self._executor, func, *args)
+                    return Result(value, None, attempt)
+                except api.ApiError as exc:
+                    error, retry_after = exc, exc.retry_after or 0.0
+                    retryable = exc.status in (RETRY_STATUSES if idempotent else NOT_PROCESSED_STATUSES)
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    error, retry_after, retryable = exc, 0.0, idempotent
+                except (requests.RequestException, KeyError, TypeError, ValueError) as exc:
+                    # Other request errors and malformed bodies are not retried
+                    return Result(None, exc, attempt)
+            if not retryable or attempt >= self.max_attempts:
+                return Result(None, error, attempt)
+            delay = max(backoff_delay(attempt - 1, self.backoff_base, self.backoff_cap), retry_after)
+            self.retries += 1
+            self._push_back(delay)
+            await self._pause()
+
+    async def map(self, func, items, idempotent: bool = True) -> list:
+        """Runs ``func(*item)`` for every item concurrently; results follow input order."""
+        return await asyncio.gather(*(self.call(func, *item, idempotent=idempotent) for item in items))
+
+    async def get_users(self, ids) -> list:
+        """Fetches users; each result's value is an :class:`api.User`."""
+        return await self.map(self.client.get_user, [(user_id,) for user_id in ids])
+
+    async def get_posts(self, ids) -> list:
+        """Fetches posts; each result's value is an :class:`api.Post`."""
+        return await self.map(self.client.get_post, [(post_id,) for post_id in ids])
+
+    async def create_posts(self, items) -> list:
+        """
+        Creates posts from ``(title, body, user_id)`` tuples or dicts with
+        those keys; each result's value is the created :class:`api.Post`.
+        """
+        args = [(item["title"], item["body"], item["user_id"]) if isinstance(item, dict) else tuple(item)
+                for item in items]
+        return await self.map(self.client.create_post, args, idempotent=False)
+
+    async def update_posts(self, items) -> list:
+        """Retitles posts from ``(post_id, new_title)`` pairs."""
+        return await self.map(self.client.update_post, [tuple(item) for item in items])
+
+    async def delete_posts(self, ids) -> list:
+        """Deletes posts; each successful result's value is None."""
+        return await self.map(self.client.delete_post, [(post_id,) for post_id in ids])
+
+    def close(self):
+        """Stops the worker threads and closes the pooled connections."""
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+async def get_users(ids, concurrency: int = 10, base_url: str = api.BASE_URL) -> list:
+    """Fetches many users concurrently; see :meth:`BatchClient.get_users`."""
+    async with BatchClient(base_url, concurrency) as batch:
+        return await batch.get_users(ids)
+
+
+async def create_posts(items, concurrency: int = 10, base_url: str = api.BASE_URL) -> list:
+    """Creates many posts concurrently; see :meth:`BatchClient.create_posts`."""
+    async with BatchClient(base_url, concurrency) as batch:
+        return await batch.create_posts(items)
+
+
+async def _benchmark(base_url: str, count: int, concurrency: int):
+    async with BatchClient(base_url, concurrency) as batch:
+        start = time.perf_counter()
+        results = await batch.get_users([i % 10 + 1 for i in range(count)])
+        seconds = time.perf_counter() - start
+    failed = sum(not r.ok for r in results)
+    print(f"concurrency {concurrency:>4}: {count / seconds:>8.0f} requests/s, {failed} failed, "
+          f"{batch.retries} retries")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure batch throughput against the API.")
+    parser.add_argument("--base-url", default=api.BASE_URL, help="API root, e.g. a local api_stub.py")
+    parser.add_argument("--count", type=int, default=200, help="users to fetch per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="limits to compare")
+    args = parser.parse_args(argv)
+    for concurrency in args.concurrency:
+        asyncio.run(_benchmark(args.base_url, args.count, concurrency))
+
+
+if __name__ == "__main__":
+    main()
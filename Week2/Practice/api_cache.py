@@ -0,0 +1,248 @@
+"""
+Read cache for the JSONPlaceholder client.
+
+:class:`CachingClient` is a :class:`api.JsonPlaceholderClient` whose
+``get_user`` and ``get_post`` answer from a bounded in-memory LRU cache:
+
+- Each entry stays fresh for its resource's TTL (users change rarely, posts
+  more often; see :data:`DEFAULT_TTLS`) and is served without a request.
+- Once stale, an entry is revalidated with ``If-None-Match``; a ``304`` costs
+  no body and renews the TTL, a ``200`` replaces the entry.
+- ``update_post`` and ``delete_post`` drop the post's entry, so a read after
+  a write always goes to the server. A read that was already in flight when
+  the entry was dropped does not store its (possibly stale) reply.
+- ``hits``, ``misses``, ``revalidations`` and ``evictions`` are counted and
+  returned by :meth:`CachingClient.stats`.
+
+With ``disk_path`` the entries are also kept in an SQLite file, so a
+short-lived process finds the records (and their ETags) fetched by earlier
+runs. The file holds at most ``max_disk_entries``; beyond that the entries
+that expire first are deleted. ``install()`` makes a caching client the one behind api.py's
+``get_user``, ``update_post`` and the other module functions.
+
+Example Usage:
+    api_cache.install(disk_path=".cache/api.sqlite")
+    api.get_user(1)
+    python api_cache.py 1 2 1 --base-url http://127.0.0.1:8000 --disk api_cache.sqlite
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import api
+
+DEFAULT_TTLS = {"users": 3600, "posts": 60}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    etag TEXT,
+    body TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires);
+"""
+
+Entry = namedtuple("Entry", ["etag", "body", "expires"])
+
+
+class CachingClient(api.JsonPlaceholderClient):
+    """
+    A JSONPlaceholder client with a TTL/LRU read cache and ETag revalidation.
+
+    Parameters
+    ----------
+    base_url, pool_size, timeout
+        As for :class:`api.JsonPlaceholderClient`.
+    max_entries : int
+        Entries kept in memory; the least recently used one is evicted beyond that.
+    ttls : dict, optional
+        Seconds an entry stays fresh, per collection (``"users"``, ``"posts"``).
+        Defaults to :data:`DEFAULT_TTLS`.
+    default_ttl : float
+        TTL of collections missing from ``ttls``.
+    disk_path : str, optional
+        SQLite file for a persistent second layer.
+    max_disk_entries : int
+        Entries kept in the SQLite file.
+    """
+
+    def __init__(self, base_url: str = api.BASE_URL, pool_size: int = 10, timeout=api.TIMEOUT,
+                 max_entries: int = 1024, ttls: dict = None, default_ttl: float = 60, disk_path: str = None,
+                 max_disk_entries: int = 100_000):
+        super().__init__(base_url, pool_size, timeout)
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_disk_entries = max_disk_entries
+        self.hits = self.misses = self.revalidations = self.evictions = 0
+        self._entries = OrderedDict()
+        self._generations = {}  # path -> times invalidated
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_entries = 0
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _ttl(self, path: str) -> float:
+        return self.ttls.get(path.strip("/").split("/")[0], self.default_ttl)
+
+    def _generation(self, path: str) -> int:
+        with self._lock:
+            return self._generations.get(path, 0)
+
+    def _lookup(self, path: str, generation: int):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT etag, body, expires FROM entries WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        entry = Entry(row[0], json.loads(row[1]), row[2])
+        self._remember(path, entry, generation, persist=False)
+        return entry
+
+    def _remember(self, path: str, entry: Entry, generation: int, persist: bool = True):
+        with self._lock:
+            if self._generations.get(path, 0) != generation:
+                return  # invalidated while the reply was in flight
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            if persist and self._db is not None:
+                if self._db.execute("SELECT 1 FROM entries WHERE path = ?", (path,)).fetchone() is None:
+                    self._disk_entries += 1
+                self._db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                                 (path, entry.etag, json.dumps(entry.body), entry.expires))
+                if self._disk_entries > self.max_disk_entries:
+                    self._db.execute("DELETE FROM entries WHERE path IN "
+                                     "(SELECT path FROM entries ORDER BY expires LIMIT ?)",
+                                     (self._disk_entries - self.max_disk_entries,))
+                    self._disk_entries = self.max_disk_entries
+                self._db.commit()
+
+    def invalidate(self, path: str):
+        """Drops the cached copy of ``path`` (e.g. ``/posts/1``) from both layers."""
+        with self._lock:
+            self._generations[path] = self._generations.get(path, 0) + 1
+            self._entries.pop(path, None)
+            if self._db is not None:
+                self._disk_entries -= self._db.execute("DELETE FROM entries WHERE path = ?", (path,)).rowcount
+                self._db.commit()
+
+    def clear(self):
+        """Drops every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+                self._disk_entries = 0
+
+    def get_json(self, path: str):
+        """
+        Returns the JSON body of ``GET path``, from the cache when possible.
+
+        Raises
+        ------
+        api.ApiError
+            If the server answers with anything but 200 (or 304 for a cached copy).
+        """
+        generation = self._generation(path)
+        entry = self._lookup(path, generation)
+        now = time.time()
+        if entry is not None and entry.expires > now:
+            with self._lock:
+                self.hits += 1
+            return entry.body
+        if entry is not None and entry.etag:
+            response = self.request("GET", path, expected=(200, 304), headers={"If-None-Match": entry.etag})
+        else:
+            response = self.request("GET", path)
+        if response.status_code == 304:
+            with self._lock:
+                self.revalidations += 1
+            self._remember(path, entry._replace(expires=now + self._ttl(path)), generation)
+            return entry.body
+        with self._lock:
+            self.misses += 1
+        body = response.json()
+        self._remember(path, Entry(response.headers.get("ETag"), body, now + self._ttl(path)), generation)
+        return body
+
+    def get_user(self, user_id: int) -> api.User:
+        return api.User.from_json(self.get_json(f"/users/{user_id}"))
+
+    def get_post(self, post_id: int) -> api.Post:
+        return api.Post.from_json(self.get_json(f"/posts/{post_id}"))
+
+    def update_post(self, post_id: int, new_title: str) -> api.Post:
+        try:
+            return super().update_post(post_id, new_title)
+        finally:
+            self.invalidate(f"/posts/{post_id}")
+
+    def delete_post(self, post_id: int):
+        try:
+            super().delete_post(post_id)
+        finally:
+            self.invalidate(f"/posts/{post_id}")
+
+    def stats(self) -> dict:
+        """Returns the cache counters, the entries in memory and the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.revalidations + self.misses
+            return {"hits": self.hits, "revalidations": self.revalidations, "misses": self.misses,
+                    "evictions": self.evictions, "entries": len(self._entries),
+                    "hit_rate": (self.hits + self.revalidations) / lookups if lookups else 0.0}
+
+    def close(self):
+        super().close()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def install(**settings) -> CachingClient:
+    """
+    Puts a :class:`CachingClient` behind api.py's module functions.
+
+    Accepts the parameters of :class:`CachingClient`.
+    """
+    client = CachingClient(**settings)
+    api.set_client(client)
+    return client
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch users through the read cache and show its counters.")
+    parser.add_argument("ids", nargs="+", type=int, help="user IDs to fetch, in order")
+    parser.add_argument("--base-url", default=api.BASE_URL, help="API root, e.g. a local api_stub.py")
+    parser.add_argument("--disk", help="SQLite file that keeps the cache between runs")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTLS["users"], help="seconds a user stays fresh")
+    args = parser.parse_args(argv)
+    client = install(base_url=args.base_url, disk_path=args.disk, ttls={**DEFAULT_TTLS, "users": args.ttl})
+    try:
+        for user_id in args.ids:
+            api.get_user(user_id)
+        print("📊 Cache:", client.stats())
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Local stand-in for the JSONPlaceholder API, for trying out api.py offline.
+
+Serves ``/users`` and ``/posts`` from memory with the same JSON shapes and
+status codes as https://jsonplaceholder.typicode.com (10 users, 100 posts;
+created posts get new IDs, and changes are kept for the life of the server).
+Connections are kept alive (HTTP/1.1), and the server counts requests and
+TCP connections so the effect of connection pooling can be seen. ``GET``
+responses carry an ``ETag`` and answer ``If-None-Match`` with ``304``.
+``--latency`` delays every response, ``--fail-rate`` answers a share of
+requests with ``503`` and ``--max-rate`` answers requests beyond that many
+per second with ``429`` and ``Retry-After``. ``--drop-rate`` processes a
+share of writes but closes the connection instead of answering, like a lost
+response; a write repeated with the same ``Idempotency-Key`` header gets the
+stored reply instead of being applied twice.
+
+Example Usage:
+    python api_stub.py --port 8000
+    python api.py --base-url http://127.0.0.1:8000
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _users() -> dict:
+    return {
+        i: {
+            "id": i,
+            "name": f"User {i}",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "address": {"street": f"{i} Main St", "suite": "", "city": "Springfield", "zipcode": "00000",
+                        "geo": {"lat": "0", "lng": "0"}},
+            "phone": f"555-{i:04d}",
+            "website": f"user{i}.example.com",
+            "company": {"name": f"Company {i}", "catchPhrase": "", "bs": ""},
+        }
+        for i in range(1, 11)
+    }
+
+
+def _posts() -> dict:
+    return {i: {"userId": (i - 1) // 10 + 1, "id": i, "title": f"Post {i}", "body": f"Body of post {i}"}
+            for i in range(1, 101)}
+
+
+class ApiStub(ThreadingHTTPServer):
+    """
+    The stub server with its data, failure settings and statistics.
+
+    Parameters
+    ----------
+    address : tuple
+        ``(host, port)``; port 0 picks a free port.
+    latency : float
+        Seconds added to every response.
+    fail_rate : float
+        Probability of answering with ``503 Service Unavailable``.
+    max_rate : float
+        Requests accepted per wall-clock second before answering ``429``
+        (0 for no limit).
+    drop_rate : float
+        Probability of processing a write and then dropping the connection
+        without a response.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency: float = 0.0, fail_rate: float = 0.0,
+                 max_rate: float = 0, drop_rate: float = 0.0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.max_rate = max_rate
+        self.drop_rate = drop_rate
+        self.replies = {}  # Idempotency-Key -> (status, body)
+        self.per_second = Counter()
+        self.users = _users()
+        self.posts = _posts()
+        self.next_post_id = 101
+        self.requests = Counter()
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def over_limit(self) -> bool:
+        """Counts a request and returns True if it exceeds ``max_rate``."""
+        second = int(time.time())
+        with self.lock:
+            self.per_second[second] += 1
+            return bool(self.max_rate) and self.per_second[second] > self.max_rate
+
+    def handle_api(self, method: str, path: str, payload):
+        """Returns ``(status, body)`` for one request."""
+        parts = path.split("?")[0].strip("/").split("/")
+        collection = {"users": self.users, "posts": self.posts}.get(parts[0])
+        if collection is None or len(parts) > 2:
+            return 404, {}
+        with self.lock:
+            if len(parts) == 1:
+                if method == "GET":
+                    return 200, list(collection.values())
+                if method == "POST" and parts[0] == "posts":
+                    post = {**payload, "id": self.next_post_id}
+                    self.next_post_id += 1
+                    self.posts[post["id"]] = post
+                    return 201, post
+                return 404, {}
+            try:
+                item_id = int(parts[1])
+            except ValueError:
+                return 404, {}
+            if method == "GET":
+                return (200, collection[item_id]) if item_id in collection else (404, {})
+            if method in ("PUT", "PATCH"):
+                # Like JSONPlaceholder, PUT replaces the record with the payload
+                item = {**collection.get(item_id, {}), **payload} if method == "PATCH" else {**payload}
+                item["id"] = item_id
+                collection[item_id] = item
+                return 200, item
+            if method == "DELETE":
+                collection.pop(item_id, None)
+                return 200, {}
+        return 404, {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; do not let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _respond(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        with self.server.lock:
+            self.server.requests[method] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        headers = {}
+        if self.server.over_limit():
+            status, body = 429, {"error": "too many requests"}
+            headers["Retry-After"] = "1"
+        elif random.random() < self.server.fail_rate:
+            status, body = 503, {"error": "unavailable"}
+        else:
+            try:
+                payload = json.loads(raw) if raw else {}
+            except ValueError:
+                payload = None
+            key = self.headers.get("Idempotency-Key") if method != "GET" else None
+            with self.server.lock:
+                reply = self.server.replies.get(key)
+                if reply is not None:
+                    self.server.requests["replayed"] += 1
+            if reply is not None:
+                status, body = reply
+            elif not isinstance(payload, dict):
+                status, body = 400, {"error": "invalid JSON"}
+            else:
+                status, body = self.server.handle_api(method, self.path, payload)
+                if key:
+                    with self.server.lock:
+                        self.server.replies[key] = (status, body)
+                if method != "GET" and random.random() < self.server.drop_rate:
+                    with self.server.lock:
+                        self.server.requests["dropped"] += 1
+                    self.close_connection = True
+                    return
+        data = json.dumps(body).encode("utf-8")
+        if method == "GET" and status == 200:
+            headers["ETag"] = '"' + hashlib.sha1(data).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, data = 304, b""
+                with self.server.lock:
+                    self.server.requests["304"] += 1
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._respond("GET")
+
+    def do_POST(self):
+        self._respond("POST")
+
+    def do_PUT(self):
+        self._respond("PUT")
+
+    def do_PATCH(self):
+        self._respond("PATCH")
+
+    def do_DELETE(self):
+        self._respond("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def running(latency: float = 0.0, fail_rate: float = 0.0, max_rate: float = 0, drop_rate: float = 0.0):
+    """Runs an :class:`ApiStub` on a free port for the duration of the block."""
+    server = ApiStub(latency=latency, fail_rate=fail_rate, max_rate=max_rate, drop_rate=drop_rate)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local JSONPlaceholder stand-in.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="probability of a 503 response")
+    parser.add_argument("--max-rate", type=float, default=0, help="requests per second before answering 429")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="probability of applying a write but dropping its response")
+    args = parser.parse_args(argv)
+    server = ApiStub(("127.0.0.1", args.port), args.latency, args.fail_rate, args.max_rate, args.drop_rate)
+    print(f"Serving on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Requests: {dict(server.requests)}, connections: {server.connections}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Bulk write pipeline for creating, updating and deleting posts.
+
+:class:`WritePipeline` takes a stream of :class:`Mutation` objects (it can
+be a generator; it is read one batch at a time) and applies them through
+one pooled :class:`api.JsonPlaceholderClient`:
+
+- Mutations are read in batches of ``batch_size``, with at most
+  ``max_batches`` batches queued or running, so memory stays bounded
+  however long the stream is.
+- Requests in flight are limited by an AIMD window: it grows by about one
+  for every window's worth of successful requests and halves (at most once a
+  second) when the server pushes back with ``429``, ``503``, ``504`` or a
+  timeout, so the pipeline settles just under what the API can take.
+- Transient failures are retried with jittered exponential backoff (or the
+  server's ``Retry-After``). Updates and deletes are idempotent and always
+  retried. Creates are only retried on ``429``/``503``, which mean the
+  request was not processed, as in :mod:`api_async`, unless the caller says
+  the server honours the ``Idempotency-Key`` header every mutation carries
+  (the same key across retries): then a create whose response was lost, or
+  that failed with another 5xx, is retried too without creating the post
+  twice. JSONPlaceholder ignores the header.
+
+:meth:`WritePipeline.run` returns a :class:`WriteReport` with one
+:class:`Outcome` per mutation, in input order, and the sustained writes per
+second.
+
+Example Usage:
+    with WritePipeline(base_url) as pipeline:
+        report = pipeline.run(Mutation.create(f"Post {i}", "...", 1) for i in range(1000))
+    python api_writes.py --stub --count 2000
+    python api_writes.py --base-url http://127.0.0.1:8000 --idempotent-server   (with api_stub.py running)
+"""
+
+import argparse
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import requests
+
+import api
+from api_async import NOT_PROCESSED_STATUSES, RETRY_STATUSES, backoff_delay
+
+PUSHBACK_STATUSES = frozenset({429, 503, 504})
+
+
+@dataclass
+class Mutation:
+    """One write: ``op`` is ``"create"``, ``"update"`` or ``"delete"``."""
+
+    op: str
+    post_id: Optional[int] = None
+    title: str = ""
+    body: str = ""
+    user_id: Optional[int] = None
+    key: str = field(default_factory=lambda: uuid.uuid4().hex)  # Idempotency-Key, kept across retries
+
+    @classmethod
+    def create(cls, title: str, body: str, user_id: int) -> "Mutation":
+        return cls("create", title=title, body=body, user_id=user_id)
+
+    @classmethod
+    def update(cls, post_id: int, new_title: str) -> "Mutation":
+        return cls("update", post_id=post_id, title=new_title)
+
+    @classmethod
+    def delete(cls, post_id: int) -> "Mutation":
+        return cls("delete", post_id=post_id)
+
+
+@dataclass
+class Outcome:
+    """Result of one mutation: ``value`` (a :class:`api.Post`, or None for deletes) or ``error``."""
+
+    mutation: Mutation
+    value: Any = None
+    error: Optional[Exception] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class WriteReport:
+    """Outcomes in input order plus throughput and backpressure figures."""
+
+    outcomes: list
+    seconds: float
+    retries: int
+    decreases: int
+    peak_window: float
+    final_window: float
+
+    @property
+    def succeeded(self) -> int:
+        return sum(outcome.ok for outcome in self.outcomes)
+
+    @property
+    def failed(self) -> int:
+        return len(self.outcomes) - self.succeeded
+
+    @property
+    def writes_per_second(self) -> float:
+        return self.succeeded / self.seconds if self.seconds else 0.0
+
+
+class AimdWindow:
+    """
+    Concurrency limit with additive increase and multiplicative decrease.
+
+    Parameters
+    ----------
+    initial, minimum, maximum : float
+        Starting, smallest and largest number of requests in flight.
+    cooldown : float
+        Seconds after a decrease during which further pushback is ignored,
+        since requests sent before the decrease report the same overload.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 64, cooldown: float = 1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.decreases = 0
+        self.peak = self.limit
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Blocks until another request may be sent."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, pushback: bool):
+        """Reports a finished request and adjusts the limit."""
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if pushback:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self.decreases += 1
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.peak = max(self.peak, self.limit)
+            self._condition.notify_all()
+
+
+class WritePipeline:
+    """
+    Applies a stream of mutations with bounded batches and AIMD backpressure.
+
+    Use it as a context manager.
+
+    Parameters
+    ----------
+    base_url : str
+        Root URL of the API.
+    batch_size : int
+        Mutations read from the stream at a time.
+    max_batches : int
+        Batches queued or running at once.
+    max_concurrency : int
+        Upper bound of the AIMD window; also the thread and connection pool size.
+    initial_concurrency : int
+        Starting AIMD window.
+    max_attempts : int
+        Attempts per mutation, including the first.
+    backoff_base, backoff_cap : float
+        Parameters of :func:`api_async.backoff_delay`.
+    timeout : float or tuple
+        ``requests`` timeout of each call.
+    idempotent_server : bool
+        True if the server replays the stored reply for a repeated
+        ``Idempotency-Key``; only then are creates retried after a lost
+        response or a 5xx other than ``503``.
+    """
+
+    def __init__(self, base_url: str = api.BASE_URL, batch_size: int = 50, max_batches: int = 2,
+                 max_concurrency: int = 32, initial_concurrency: int = 4, max_attempts: int = 5,
+                 backoff_base: float = 0.1, backoff_cap: float = 5, timeout=api.TIMEOUT,
+                 idempotent_server: bool = False):
+        self.client = api.JsonPlaceholderClient(base_url, pool_size=max_concurrency, timeout=timeout)
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.window = AimdWindow(initial_concurrency, 1, max_concurrency)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.idempotent_server = idempotent_server
+        self.retries = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="writes")
+
+    def _send(self, mutation: Mutation):
+        headers = {"Idempotency-Key": mutation.key}
+        if mutation.op == "create":
+            data = {"title": mutation.title, "body": mutation.body, "userId": mutation.user_id}
+            return api.Post.from_json(
+                self.client.request("POST", "/posts", expected=(201,), json=data, headers=headers).json())
+        if mutation.op == "update":
+            return api.Post.from_json(self.client.request(
+                "PUT", f"/posts/{mutation.post_id}", json={"title": mutation.title}, headers=headers).json())
+        if mutation.op == "delete":
+            self.client.request("DELETE", f"/posts/{mutation.post_id}", expected=(200, 204), headers=headers)
+            return None
+        raise ValueError(f"Unknown mutation '{mutation.op}', expected create, update or delete")
+
+    def apply(self, mutation: Mutation) -> Outcome:
+        """Applies one mutation with retries; errors end up in the outcome."""
+        # A create repeated after the server may have processed it would create a second post
+        repeatable = mutation.op != "create" or self.idempotent_server
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after, pushback = 0.0, False
+            self.window.acquire()
+            try:
+                return Outcome(mutation, self._send(mutation), None, attempt)
+            except api.ApiError as exc:
+                error, retryable = exc, exc.status in (RETRY_STATUSES if repeatable else NOT_PROCESSED_STATUSES)
+                pushback, retry_after = exc.status in PUSHBACK_STATUSES, exc.retry_after or 0.0
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error, retryable, pushback = exc, repeatable, isinstance(exc, requests.Timeout)
+            except (requests.RequestException, KeyError, TypeError, ValueError) as exc:
+                # Other request errors and malformed bodies are not retried
+                return Outcome(mutation, None, exc, attempt)
+            finally:
+                self.window.release(pushback)
+            if not retryable or attempt >= self.max_attempts:
+                return Outcome(mutation, None, error, attempt)
+            with self._lock:
+                self.retries += 1
+            time.sleep(max(backoff_delay(attempt - 1, self.backoff_base, self.backoff_cap), retry_after))
+
+    def run(self, mutations, verbose: bool = False) -> WriteReport:
+        """
+        Applies every mutation of the stream.
+
+        Parameters
+        ----------
+        mutations : iterable of Mutation
+            Read lazily, ``batch_size`` at a time.
+        verbose : bool
+            Print a progress line per finished batch.
+
+        Returns
+        -------
+        WriteReport
+            Outcomes in input order and throughput figures.
+        """
+        start = time.monotonic()
+        stream = iter(mutations)
+        outcomes = []
+        pending = deque()
+
+        def finish_oldest():
+            futures = pending.popleft()
+            wait(futures)
+            outcomes.extend(future.result() for future in futures)
+            if verbose:
+                ok = sum(outcome.ok for outcome in outcomes)
+                print(f"🔹 {len(outcomes)} done, {len(outcomes) - ok} failed, window "
+                      f"{self.window.limit:.1f}, {ok / (time.monotonic() - start):.0f} writes/s")
+
+        while True:
+            batch = list(itertools.islice(stream, self.batch_size))
+            if not batch:
+                break
+            if len(pending) >= self.max_batches:
+                finish_oldest()
+            pending.append([self._executor.submit(self.apply, mutation) for mutation in batch])
+        while pending:
+            finish_oldest()
+        return WriteReport(outcomes, time.monotonic() - start, self.retries, self.window.decreases,
+                           self.window.peak, self.window.limit)
+
+    def close(self):
+        """Stops the worker threads and closes the pooled connections."""
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _sample_mutations(count: int):
+    for i in range(count):
+        kind = i % 4
+        if kind < 2:
+            yield Mutation.create(f"Bulk post {i}", "Created by the write pipeline.", i % 10 + 1)
+        elif kind == 2:
+            yield Mutation.update(i % 100 + 1, f"Retitled {i}")
+        else:
+            yield Mutation.delete(i % 100 + 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Push a stream of sample writes through the pipeline.")
+    parser.add_argument("--base-url", default=api.BASE_URL, help="API root, e.g. a local api_stub.py")
+    parser.add_argument("--stub", action="store_true",
+                        help="run against a local api_stub.py limited to 300 requests/s that drops 2%% of replies")
+    parser.add_argument("--count", type=int, default=500, help="mutations to send")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--idempotent-server", action="store_true",
+                        help="the server honours Idempotency-Key, so creates may be retried after lost responses")
+    args = parser.parse_args(argv)
+
+    def push(base_url, idempotent_server):
+        with WritePipeline(base_url, args.batch_size, max_concurrency=args.max_concurrency,
+                           idempotent_server=idempotent_server) as pipeline:
+            report = pipeline.run(_sample_mutations(args.count), verbose=True)
+        print(f"✅ {report.succeeded} applied, ❌ {report.failed} failed in {report.seconds:.1f}s: "
+              f"{report.writes_per_second:.0f} writes/s, {report.retries} retries, window peaked at "
+              f"{report.peak_window:.1f} and was cut {report.decreases} times")
+        for outcome in report.outcomes:
+            if not outcome.ok:
+                print(f"❌ {outcome.mutation.op} {outcome.mutation.post_id or ''}: {outcome.error}")
+
+    if args.stub:
+        import api_stub
+        with api_stub.running(max_rate=300, drop_rate=0.02) as server:
+            push(server.url, True)  # the stub honours Idempotency-Key
+            print(f"Server saw {dict(server.requests)}")
+    else:
+        push(args.base_url, args.idempotent_server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+import api
+import api_stub
+
+
+@pytest.fixture
+def server():
+    with api_stub.running() as stub:
+        yield stub
+
+
+@pytest.fixture
+def shared_client(server):
+    client = api.configure(server.url)
+    yield client
+    api.set_client(None)
+
+
+def test_results_are_typed(server):
+    with api.JsonPlaceholderClient(server.url) as client:
+        user = client.get_user(1)
+        post = client.create_post("Title", "Body", 1)
+        updated = client.update_post(post.id, "New title")
+        client.delete_post(post.id)
+    assert isinstance(user, api.User) and user.id == 1 and user.username == "user1"
+    assert isinstance(post, api.Post) and post.id == 101 and post.user_id == 1
+    assert isinstance(updated, api.Post) and updated.title == "New title"
+
+
+def test_unexpected_status_raises_api_error(server):
+    with api.JsonPlaceholderClient(server.url) as client:
+        with pytest.raises(api.ApiError) as error:
+            client.get_user(999)
+    assert error.value.status == 404
+    assert error.value.retry_after is None
+
+
+def test_server_errors_carry_status_and_retry_after():
+    with api_stub.running(fail_rate=1.0) as stub, api.JsonPlaceholderClient(stub.url) as client:
+        with pytest.raises(api.ApiError) as error:
+            client.get_user(1)
+    assert error.value.status == 503
+
+    with api_stub.running(max_rate=1) as stub, api.JsonPlaceholderClient(stub.url) as client:
+        with pytest.raises(api.ApiError) as error:
+            for _ in range(5):  # at least two land in the same second
+                client.get_user(1)
+    assert error.value.status == 429
+    assert error.value.retry_after == 1.0
+
+
+def test_retry_after_accepts_an_http_date():
+    response = requests.Response()
+    response.headers["Retry-After"] = formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= api._retry_after(response) <= 30
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert api._retry_after(response) == 0.0
+    response.headers["Retry-After"] = "soon"
+    assert api._retry_after(response) is None
+
+
+def test_connections_are_reused(server):
+    with api.JsonPlaceholderClient(server.url, pool_size=1) as client:
+        for i in range(20):
+            client.get_user(i % 10 + 1)
+    assert server.connections == 1
+
+
+def test_concurrent_calls_stay_within_the_pool(server):
+    with api.JsonPlaceholderClient(server.url, pool_size=4) as client:
+        def fetch():
+            for i in range(10):
+                client.get_post(i + 1)
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert server.requests["GET"] == 80
+    assert server.connections <= 4
+
+
+def test_module_functions_return_none_on_404(shared_client, capsys):
+    assert api.get_user(999) is None
+    assert "Failed to fetch user" in capsys.readouterr().out
+    assert isinstance(api.get_user(1), api.User)
+
+
+def test_module_functions_return_results(shared_client):
+    post = api.create_post("Title", "Body", 1)
+    assert isinstance(post, api.Post)
+    assert api.update_post(post.id, "Renamed").title == "Renamed"
+    assert api.delete_post(post.id) is True
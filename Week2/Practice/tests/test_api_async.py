@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import api
+import api_stub
+from api_async import BatchClient
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _get_users(server, ids, concurrency=8):
+    async with BatchClient(server.url, concurrency, backoff_base=0.01, backoff_cap=0.05) as batch:
+        return await batch.get_users(ids)
+
+
+async def _get_posts(server, ids):
+    async with BatchClient(server.url, 4, backoff_base=0.01, backoff_cap=0.05) as batch:
+        return await batch.get_posts(ids)
+
+
+def test_results_follow_input_order():
+    ids = [7, 3, 10, 1, 5, 2, 9, 4, 8, 6] * 3
+    with api_stub.running(latency=0.01) as server:
+        results = _run(_get_users(server, ids))
+    assert all(result.ok for result in results)
+    assert [result.value.id for result in results] == ids
+
+
+def test_errors_are_reported_per_item():
+    with api_stub.running() as server:
+        results = _run(_get_users(server, [1, 999, 2]))
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, api.ApiError) and results[1].error.status == 404
+    assert results[1].attempts == 1
+
+
+def test_malformed_bodies_do_not_fail_the_batch():
+    with api_stub.running() as server:
+        server.posts[5] = {"title": "no id"}
+        server.posts[6] = ["not", "a", "post"]
+        results = _run(_get_posts(server, [4, 5, 6, 7]))
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert isinstance(results[1].error, KeyError)
+    assert isinstance(results[2].error, TypeError)
+
+
+def test_higher_concurrency_is_faster():
+    ids = list(range(1, 11)) * 2
+    with api_stub.running(latency=0.05) as server:
+        seconds = []
+        for concurrency in (1, 10):
+            start = time.perf_counter()
+            results = _run(_get_users(server, ids, concurrency))
+            seconds.append(time.perf_counter() - start)
+            assert all(result.ok for result in results)
+    assert seconds[0] >= 20 * 0.05
+    assert seconds[1] < seconds[0] / 3
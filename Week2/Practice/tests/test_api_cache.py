@@ -0,0 +1,94 @@
+import sqlite3
+import time
+
+import pytest
+
+import api
+import api_stub
+from api_cache import CachingClient
+
+
+@pytest.fixture
+def server():
+    with api_stub.running() as stub:
+        yield stub
+
+
+def test_fresh_entry_is_served_without_a_request(server):
+    with CachingClient(server.url) as client:
+        assert client.get_user(1).username == "user1"
+        assert client.get_user(1).username == "user1"
+        assert client.stats()["hits"] == 1 and client.stats()["misses"] == 1
+    assert server.requests["GET"] == 1
+
+
+def test_stale_entry_is_revalidated_with_its_etag(server):
+    with CachingClient(server.url, ttls={"users": 0.1}) as client:
+        client.get_user(1)
+        time.sleep(0.15)
+        assert client.get_user(1).id == 1
+        assert client.stats()["revalidations"] == 1
+        assert client.get_user(1).id == 1  # the 304 renewed the TTL
+        assert client.stats()["hits"] == 1
+    assert server.requests["GET"] == 2 and server.requests["304"] == 1
+
+
+def test_writes_invalidate_the_post(server):
+    with CachingClient(server.url) as client:
+        client.get_post(1)
+        client.update_post(1, "New title")
+        assert client.get_post(1).title == "New title"
+        client.delete_post(1)
+        with pytest.raises(api.ApiError) as error:
+            client.get_post(1)
+    assert error.value.status == 404
+
+
+def test_read_in_flight_during_a_write_is_not_stored(server):
+    with CachingClient(server.url) as client:
+        request = client.request
+
+        def request_then_write(method, path, **kwargs):
+            response = request(method, path, **kwargs)
+            if method == "GET":
+                client.request = request
+                client.update_post(1, "New title")  # lands after the old body was read
+            return response
+
+        client.request = request_then_write
+        assert client.get_post(1).title != "New title"
+        assert client.get_post(1).title == "New title"
+        assert client.stats()["misses"] == 2
+
+
+def test_least_recently_used_entry_is_evicted(server):
+    with CachingClient(server.url, max_entries=2) as client:
+        for user_id in (1, 2, 1, 3):
+            client.get_user(user_id)
+        assert client.stats()["evictions"] == 1
+        client.get_user(1)
+        client.get_user(3)
+        assert client.stats()["hits"] == 3
+        client.get_user(2)
+        assert client.stats()["misses"] == 4
+
+
+def test_disk_layer_survives_a_new_instance(server, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with CachingClient(server.url, disk_path=path) as client:
+        client.get_user(1)
+    with CachingClient(server.url, disk_path=path) as client:
+        assert client.get_user(1).username == "user1"
+        assert client.stats()["hits"] == 1
+    assert server.requests["GET"] == 1
+
+
+def test_disk_layer_is_bounded(server, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with CachingClient(server.url, disk_path=path, max_disk_entries=2, ttls={"users": 60, "posts": 30}) as client:
+        client.get_user(1)
+        client.get_post(1)  # expires first
+        client.get_user(2)
+        client.get_user(2)
+    with sqlite3.connect(path) as db:
+        assert sorted(row[0] for row in db.execute("SELECT path FROM entries")) == ["/users/1", "/users/2"]
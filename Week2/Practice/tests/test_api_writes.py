@@ -0,0 +1,61 @@
+import requests
+
+import api
+import api_stub
+from api_writes import Mutation, WritePipeline
+
+
+def _pipeline(server, **options):
+    return WritePipeline(server.url, max_attempts=3, backoff_base=0.01, backoff_cap=0.05, **options)
+
+
+def test_lost_create_is_not_retried_by_default():
+    with api_stub.running(drop_rate=1.0) as server, _pipeline(server) as pipeline:
+        outcome = pipeline.apply(Mutation.create("Title", "Body", 1))
+        assert not outcome.ok and isinstance(outcome.error, requests.ConnectionError)
+        assert outcome.attempts == 1
+        assert len(server.posts) == 101  # applied once, even though the reply was lost
+
+
+def test_lost_create_is_retried_when_the_server_honours_keys():
+    with api_stub.running(drop_rate=1.0) as server, _pipeline(server, idempotent_server=True) as pipeline:
+        outcome = pipeline.apply(Mutation.create("Title", "Body", 1))
+        assert outcome.ok and outcome.attempts == 2
+        assert outcome.value.id == 101
+        assert server.requests["replayed"] == 1
+        assert len(server.posts) == 101
+
+
+def test_lost_update_is_retried():
+    with api_stub.running(drop_rate=1.0) as server, _pipeline(server) as pipeline:
+        outcome = pipeline.apply(Mutation.update(1, "New title"))
+        assert outcome.ok and outcome.attempts == 2
+        assert outcome.value.title == "New title"
+
+
+def test_create_is_retried_when_not_processed():
+    with api_stub.running(fail_rate=1.0) as server, _pipeline(server) as pipeline:
+        outcome = pipeline.apply(Mutation.create("Title", "Body", 1))
+        assert isinstance(outcome.error, api.ApiError) and outcome.error.status == 503
+        assert outcome.attempts == 3
+        assert len(server.posts) == 100
+
+
+def test_run_keeps_input_order():
+    with api_stub.running() as server, _pipeline(server) as pipeline:
+        report = pipeline.run([Mutation.create(f"Post {i}", "Body", 1) for i in range(20)]
+                              + [Mutation.delete(1)])
+    assert report.succeeded == 21
+    assert [outcome.value.title for outcome in report.outcomes[:20]] == [f"Post {i}" for i in range(20)]
+    assert report.outcomes[20].value is None
+    assert len(server.posts) == 119
+
+
+def test_malformed_reply_is_reported_without_aborting_the_run():
+    with api_stub.running() as server, _pipeline(server) as pipeline:
+        original = server.handle_api
+        server.handle_api = lambda method, path, payload: (
+            (200, {"title": "no id"}) if method == "PUT" else original(method, path, payload))
+        report = pipeline.run([Mutation.update(1, "New title"), Mutation.create("Title", "Body", 1)])
+    assert isinstance(report.outcomes[0].error, KeyError) and report.outcomes[0].attempts == 1
+    assert report.outcomes[1].ok